@@ -0,0 +1,130 @@
+// Copyright (c) 2026 CNRS
+//
+
+// Redistribution and use in source and binary forms, with or without
+// modification, are permitted provided that the following conditions are
+// met:
+//
+// 1. Redistributions of source code must retain the above copyright
+//    notice, this list of conditions and the following disclaimer.
+//
+// 2. Redistributions in binary form must reproduce the above copyright
+// notice, this list of conditions and the following disclaimer in the
+// documentation and/or other materials provided with the distribution.
+//
+// THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+// "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+// LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+// A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+// HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+// SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+// LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+// DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+// THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+// (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+// OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH
+// DAMAGE.
+
+#include "graph-fingerprint.hh"
+
+#include <hpp/constraints/differentiable-function.hh>
+#include <hpp/constraints/implicit.hh>
+#include <hpp/core/fwd.hh>
+#include <hpp/manipulation/graph/edge.hh>
+#include <hpp/manipulation/graph/graph.hh>
+#include <hpp/manipulation/graph/state.hh>
+#include <string>
+
+#include "tools.hh"
+
+namespace hpp {
+namespace manipulation {
+namespace impl {
+namespace {
+/// Incremental hash of a sequence of fields
+///
+/// Each field is followed by a separator so that, for instance, the
+/// sequences ("ab", "c") and ("a", "bc") have different hashes.
+class Hasher {
+ public:
+  Hasher() : h_(fnv1a(std::string())) {}
+
+  Hasher& operator<<(const std::string& field) {
+    h_ = fnv1a(field.c_str(), field.size() + 1, h_);
+    return *this;
+  }
+
+  Hasher& operator<<(int64_t field) {
+    return *this << std::to_string((long long)field);
+  }
+
+  Hasher& operator<<(const core::NumericalConstraints_t& constraints) {
+    *this << (int64_t)constraints.size();
+    for (core::NumericalConstraints_t::const_iterator it = constraints.begin();
+         it != constraints.end(); ++it)
+      *this << (*it)->function().name();
+    return *this;
+  }
+
+  uint64_t value() const { return h_ == 0 ? 1 : h_; }
+
+ private:
+  uint64_t h_;
+};
+
+uint64_t hashState(const graph::StatePtr_t& state) {
+  Hasher h;
+  h << "state" << state->name() << (int64_t)state->isWaypoint()
+    << state->numericalConstraints() << state->numericalConstraintsForPath();
+  return h.value();
+}
+
+uint64_t hashEdge(const graph::EdgePtr_t& edge) {
+  Hasher h;
+  graph::WaypointEdgePtr_t we(HPP_DYNAMIC_PTR_CAST(graph::WaypointEdge, edge));
+  graph::LevelSetEdgePtr_t le(HPP_DYNAMIC_PTR_CAST(graph::LevelSetEdge, edge));
+  h << (we ? "WaypointEdge" : (le ? "LevelSetEdge" : "Edge")) << edge->name()
+    << (int64_t)edge->stateFrom()->id() << (int64_t)edge->stateTo()->id()
+    << (int64_t)edge->state()->id()
+    << (int64_t)edge->stateFrom()->getWeight(edge) << (int64_t)edge->isShort()
+    << edge->numericalConstraints();
+  if (we) {
+    h << (int64_t)we->nbWaypoints();
+    for (std::size_t i = 0; i < we->nbWaypoints(); ++i)
+      h << (int64_t)we->waypoint(i)->id();
+  }
+  return h.value();
+}
+}  // namespace
+
+uint64_t graphFingerprint(const graph::GraphPtr_t& graph,
+                          std::vector<uint64_t>* componentHashes) {
+  std::size_t n = graph->nbComponents();
+  if (componentHashes) componentHashes->assign(n, 0);
+  Hasher fingerprint;
+  fingerprint << (int64_t)n;
+  for (std::size_t i = 0; i < n; ++i) {
+    graph::GraphComponentPtr_t component(graph->get(i).lock());
+    uint64_t h = 0;
+    if (i == graph->id()) {
+      Hasher g;
+      g << "graph" << graph->name() << graph->numericalConstraints();
+      h = g.value();
+    } else if (component) {
+      graph::StatePtr_t state(HPP_DYNAMIC_PTR_CAST(graph::State, component));
+      graph::EdgePtr_t edge(HPP_DYNAMIC_PTR_CAST(graph::Edge, component));
+      if (state)
+        h = hashState(state);
+      else if (edge)
+        h = hashEdge(edge);
+      else
+        h = (Hasher() << component->name()).value();
+    }
+    if (componentHashes) (*componentHashes)[i] = h;
+    fingerprint << hashToString(h);
+  }
+  return fingerprint.value();
+}
+}  // namespace impl
+}  // namespace manipulation
+}  // namespace hpp
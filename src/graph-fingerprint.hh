@@ -0,0 +1,58 @@
+// Copyright (c) 2026 CNRS
+//
+
+// Redistribution and use in source and binary forms, with or without
+// modification, are permitted provided that the following conditions are
+// met:
+//
+// 1. Redistributions of source code must retain the above copyright
+//    notice, this list of conditions and the following disclaimer.
+//
+// 2. Redistributions in binary form must reproduce the above copyright
+// notice, this list of conditions and the following disclaimer in the
+// documentation and/or other materials provided with the distribution.
+//
+// THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+// "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+// LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+// A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+// HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+// SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+// LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+// DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+// THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+// (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+// OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH
+// DAMAGE.
+
+#ifndef HPP_MANIPULATION_CORBA_GRAPH_FINGERPRINT_HH
+#define HPP_MANIPULATION_CORBA_GRAPH_FINGERPRINT_HH
+
+#include <cstdint>
+#include <hpp/manipulation/fwd.hh>
+#include <vector>
+
+namespace hpp {
+namespace manipulation {
+namespace impl {
+/// Hash of the content of a constraint graph
+///
+/// The hash of each component covers its name, its type and the names of its
+/// numerical constraints. The hash of an edge also covers the states it
+/// links, the state it lies in, its weight, whether it is short and its
+/// waypoints. The fingerprint of the graph is the hash of the hashes of its
+/// components, in the order of their ids.
+///
+/// The fingerprint does not depend on the addresses of the objects, it is
+/// thus stable across processes that build the same graph. It is never 0,
+/// so that 0 can denote an unknown fingerprint.
+/// \param[out] componentHashes if not NULL, filled with the hash of each
+///             component, indexed by component id. The hash of a removed
+///             component is 0.
+uint64_t graphFingerprint(const graph::GraphPtr_t& graph,
+                          std::vector<uint64_t>* componentHashes = NULL);
+}  // namespace impl
+}  // namespace manipulation
+}  // namespace hpp
+
+#endif  // HPP_MANIPULATION_CORBA_GRAPH_FINGERPRINT_HH
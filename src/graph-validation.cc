@@ -0,0 +1,156 @@
+// Copyright (c) 2026 CNRS
+//
+
+// Redistribution and use in source and binary forms, with or without
+// modification, are permitted provided that the following conditions are
+// met:
+//
+// 1. Redistributions of source code must retain the above copyright
+//    notice, this list of conditions and the following disclaimer.
+//
+// 2. Redistributions in binary form must reproduce the above copyright
+// notice, this list of conditions and the following disclaimer in the
+// documentation and/or other materials provided with the distribution.
+//
+// THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+// "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+// LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+// A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+// HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+// SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+// LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+// DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+// THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+// (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+// OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH
+// DAMAGE.
+
+#include "graph-validation.hh"
+
+#include <chrono>
+#include <hpp/core/problem.hh>
+#include <hpp/manipulation/graph/edge.hh>
+#include <hpp/manipulation/graph/graph.hh>
+#include <hpp/manipulation/graph/state.hh>
+#include <hpp/manipulation/graph/validation.hh>
+#include <hpp/pinocchio/device.hh>
+#include <hpp/util/pointer.hh>
+#include <map>
+#include <memory>
+#include <stdexcept>
+
+#include "tools.hh"
+
+namespace hpp {
+namespace manipulation {
+namespace impl {
+GraphValidationJob::GraphValidationJob(const core::ProblemPtr_t& problem,
+                                       const graph::GraphPtr_t& graph,
+                                       std::size_t nbThreads)
+    : problem_(problem),
+      graph_(graph),
+      nbThreads_(nbThreads),
+      finished_(false),
+      stop_(false) {
+  thread_ = std::thread(&GraphValidationJob::run, this);
+}
+
+GraphValidationJob::~GraphValidationJob() { stop(); }
+
+void GraphValidationJob::stop() {
+  stop_ = true;
+  if (thread_.joinable()) thread_.join();
+}
+
+std::vector<GraphValidationJob::Result> GraphValidationJob::results(
+    double timeout, bool& finished) {
+  std::unique_lock<std::mutex> lock(mutex_);
+  if (timeout > 0)
+    condition_.wait_for(lock, std::chrono::duration<double>(timeout),
+                        [this] { return finished_ || !results_.empty(); });
+  if (!error_.empty()) throw std::runtime_error(error_);
+  std::vector<Result> res(results_.begin(), results_.end());
+  results_.clear();
+  finished = finished_;
+  return res;
+}
+
+void GraphValidationJob::run() {
+  try {
+    std::vector<graph::StatePtr_t> states;
+    std::vector<graph::EdgePtr_t> edges;
+    for (std::size_t i = 0; i < graph_->nbComponents(); ++i) {
+      graph::GraphComponentPtr_t comp(graph_->get(i).lock());
+      graph::StatePtr_t state(HPP_DYNAMIC_PTR_CAST(graph::State, comp));
+      graph::EdgePtr_t edge(HPP_DYNAMIC_PTR_CAST(graph::Edge, comp));
+      if (state) states.push_back(state);
+      if (edge) edges.push_back(edge);
+    }
+    std::size_t nbThreads(numberOfThreads(nbThreads_, states.size()));
+    nbThreads = std::max(nbThreads, numberOfThreads(nbThreads_, edges.size()));
+    const pinocchio::DevicePtr_t& robot(problem_->robot());
+    if (robot->numberDeviceData() < (size_type)nbThreads)
+      robot->numberDeviceData((size_type)nbThreads);
+
+    auto validate = [this](const graph::GraphComponentPtr_t& comp,
+                           const graph::StatePtr_t& state) {
+      if (stop_) return;
+      graph::Validation validation(problem_);
+      Result result;
+      result.component = comp->id();
+      validation.validate(comp);
+      result.error = validation.hasErrors();
+      result.warning = validation.hasWarnings();
+      result.report = validation.str();
+      if (state)
+        result.collisions = validation.getCollisionsForNode(state->name());
+      {
+        std::lock_guard<std::mutex> lock(mutex_);
+        results_.push_back(result);
+      }
+      condition_.notify_all();
+    };
+
+    parallelFor(states.size(), numberOfThreads(nbThreads_, states.size()),
+                [&states, &validate](std::size_t i, std::size_t) {
+                  validate(states[i], states[i]);
+                });
+
+    std::map<graph::StatePtr_t, std::unique_ptr<std::mutex> > stateMutexes;
+    for (std::size_t i = 0; i < edges.size(); ++i) {
+      std::unique_ptr<std::mutex>& from(stateMutexes[edges[i]->stateFrom()]);
+      if (!from) from.reset(new std::mutex);
+      std::unique_ptr<std::mutex>& to(stateMutexes[edges[i]->stateTo()]);
+      if (!to) to.reset(new std::mutex);
+    }
+    auto stateMutex = [&stateMutexes](const graph::StatePtr_t& state) {
+      return stateMutexes.find(state)->second.get();
+    };
+    parallelFor(edges.size(), numberOfThreads(nbThreads_, edges.size()),
+                [&edges, &validate, &stateMutex](std::size_t i, std::size_t) {
+                  std::mutex* from(stateMutex(edges[i]->stateFrom()));
+                  std::mutex* to(stateMutex(edges[i]->stateTo()));
+                  if (from == to) {
+                    std::lock_guard<std::mutex> lock(*from);
+                    validate(edges[i], graph::StatePtr_t());
+                  } else {
+                    std::lock(*from, *to);
+                    std::lock_guard<std::mutex> lockFrom(*from,
+                                                         std::adopt_lock);
+                    std::lock_guard<std::mutex> lockTo(*to, std::adopt_lock);
+                    validate(edges[i], graph::StatePtr_t());
+                  }
+                });
+  } catch (const std::exception& exc) {
+    std::lock_guard<std::mutex> lock(mutex_);
+    error_ = exc.what();
+  }
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    finished_ = true;
+  }
+  condition_.notify_all();
+}
+}  // namespace impl
+}  // namespace manipulation
+}  // namespace hpp
@@ -0,0 +1,102 @@
+// Copyright (c) 2026 CNRS
+//
+
+// Redistribution and use in source and binary forms, with or without
+// modification, are permitted provided that the following conditions are
+// met:
+//
+// 1. Redistributions of source code must retain the above copyright
+//    notice, this list of conditions and the following disclaimer.
+//
+// 2. Redistributions in binary form must reproduce the above copyright
+// notice, this list of conditions and the following disclaimer in the
+// documentation and/or other materials provided with the distribution.
+//
+// THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+// "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+// LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+// A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+// HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+// SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+// LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+// DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+// THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+// (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+// OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH
+// DAMAGE.
+
+#ifndef HPP_MANIPULATION_CORBA_GRAPH_VALIDATION_HH
+#define HPP_MANIPULATION_CORBA_GRAPH_VALIDATION_HH
+
+#include <atomic>
+#include <condition_variable>
+#include <deque>
+#include <hpp/manipulation/fwd.hh>
+#include <mutex>
+#include <string>
+#include <thread>
+#include <vector>
+
+namespace hpp {
+namespace manipulation {
+namespace impl {
+class GraphValidationJob;
+typedef shared_ptr<GraphValidationJob> GraphValidationJobPtr_t;
+
+/// Validation of the states and edges of a constraint graph on a thread pool
+///
+/// Each component is validated by its own graph::Validation instance.
+/// States are validated first, then edges. Edges that share a state are
+/// not validated at the same time, since validating an edge uses the
+/// constraints of its states. The robot is given one data per thread, so
+/// that collision checking is done in independent contexts.
+///
+/// Results are queued as components are validated and can be retrieved
+/// while validation goes on.
+class GraphValidationJob {
+ public:
+  struct Result {
+    std::size_t component;
+    bool error, warning;
+    std::string report;
+    /// pairs of colliding bodies, for states only.
+    std::vector<std::vector<std::string> > collisions;
+  };
+
+  /// Start validating in a background thread
+  /// \param nbThreads number of threads. 0 means one per core.
+  GraphValidationJob(const core::ProblemPtr_t& problem,
+                     const graph::GraphPtr_t& graph, std::size_t nbThreads);
+
+  ~GraphValidationJob();
+
+  /// Get the results that were not retrieved yet
+  /// \param timeout time in seconds to wait for at least one result,
+  /// \retval finished whether all results have been produced.
+  /// \throw std::runtime_error if validation failed.
+  std::vector<Result> results(double timeout, bool& finished);
+
+  /// Skip the components that are not validated yet and wait for the
+  /// background thread.
+  void stop();
+
+ private:
+  void run();
+
+  core::ProblemPtr_t problem_;
+  graph::GraphPtr_t graph_;
+  std::size_t nbThreads_;
+
+  std::mutex mutex_;
+  std::condition_variable condition_;
+  std::deque<Result> results_;
+  bool finished_;
+  std::string error_;
+  std::atomic<bool> stop_;
+  std::thread thread_;
+};
+}  // namespace impl
+}  // namespace manipulation
+}  // namespace hpp
+
+#endif  // HPP_MANIPULATION_CORBA_GRAPH_VALIDATION_HH
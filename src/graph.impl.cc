@@ -40,6 +40,7 @@
 #include <hpp/manipulation/graph/helper.hh>
 #include <hpp/manipulation/graph/state-selector.hh>
 #include <hpp/manipulation/graph/state.hh>
+#include <hpp/manipulation/handle.hh>
 #include <hpp/manipulation/manipulation-planner.hh>
 #include <hpp/manipulation/problem.hh>
 #include <hpp/manipulation/roadmap.hh>
@@ -48,8 +49,11 @@
 #include <hpp/util/exception-factory.hh>
 #include <hpp/util/pointer.hh>
 #include <pinocchio/multibody/model.hpp>
+#include <regex>
 #include <sstream>
 
+#include "graph-fingerprint.hh"
+#include "shared-array.hh"
 #include "tools.hh"
 
 namespace hpp {
@@ -127,6 +131,123 @@ void setRule(const hpp::corbaserver::manipulation::Rule& in,
   out.handles_ = toStringVector(in.handles);
   out.link_ = in.link;
 }
+
+/// Grasp constraints of a gripper and a handle
+///
+/// graph::helper::graphBuilder uses the constraints registered in the
+/// problem solver under these names, and creates the missing ones.
+struct GraspConstraints {
+  GripperPtr_t gripper;
+  HandlePtr_t handle;
+  std::string name, pregraspName;
+  ImplicitPtr_t grasp, complement, hold, pregrasp;
+};
+
+/// Whether a rule may link gripper and handle
+bool mayGrasp(const std::vector<std::vector<std::regex> >& gripperRegexes,
+              const std::vector<std::vector<std::regex> >& handleRegexes,
+              const std::string& gripper, const std::string& handle) {
+  if (gripperRegexes.empty()) return true;
+  for (std::size_t r = 0; r < gripperRegexes.size(); ++r) {
+    const std::vector<std::regex>& gs(gripperRegexes[r]);
+    const std::vector<std::regex>& hs(handleRegexes[r]);
+    for (std::size_t i = 0; i < gs.size() && i < hs.size(); ++i)
+      if (std::regex_match(gripper, gs[i]) && std::regex_match(handle, hs[i]))
+        return true;
+  }
+  return false;
+}
+
+/// Create the grasp and pregrasp constraints used by graphBuilder in
+/// parallel and register them in a deterministic order.
+void createGraspConstraints(const ProblemSolverPtr_t& ps,
+                            const std::vector<std::string>& grippers,
+                            const std::vector<graph::helper::ObjectDef_t>& objs,
+                            const std::vector<graph::helper::Rule>& rules,
+                            std::size_t nbThreads) {
+  DevicePtr_t robot = getRobotOrThrow(ps);
+  std::vector<std::vector<std::regex> > gripperRegexes, handleRegexes;
+  for (std::size_t r = 0; r < rules.size(); ++r) {
+    if (!rules[r].link_) continue;
+    gripperRegexes.push_back(std::vector<std::regex>());
+    handleRegexes.push_back(std::vector<std::regex>());
+    for (std::size_t i = 0; i < rules[r].grippers_.size(); ++i)
+      gripperRegexes.back().push_back(std::regex(rules[r].grippers_[i]));
+    for (std::size_t i = 0; i < rules[r].handles_.size(); ++i)
+      handleRegexes.back().push_back(std::regex(rules[r].handles_[i]));
+  }
+  // Without linking rule, every grasp is forbidden.
+  if (!rules.empty() && gripperRegexes.empty()) return;
+
+  std::vector<GraspConstraints> grasps;
+  for (std::size_t i = 0; i < grippers.size(); ++i) {
+    GripperPtr_t gripper(robot->grippers.get(grippers[i]));
+    for (std::size_t j = 0; j < objs.size(); ++j) {
+      for (std::size_t k = 0; k < objs[j].handles.size(); ++k) {
+        const std::string& h(objs[j].handles[k]);
+        if (!mayGrasp(gripperRegexes, handleRegexes, grippers[i], h)) continue;
+        GraspConstraints gc;
+        gc.gripper = gripper;
+        gc.handle = robot->handles.get(h);
+        gc.name = grippers[i] + " grasps " + h;
+        gc.pregraspName = grippers[i] + " pregrasps " + h;
+        if (gc.gripper && gc.handle && !ps->numericalConstraints.has(gc.name))
+          grasps.push_back(gc);
+      }
+    }
+  }
+
+  parallelFor(
+      grasps.size(), numberOfThreads(nbThreads, grasps.size()),
+      [&grasps](std::size_t i, std::size_t) {
+        GraspConstraints& gc(grasps[i]);
+        gc.grasp = gc.handle->createGrasp(gc.gripper, gc.name);
+        gc.complement = gc.handle->createGraspComplement(
+            gc.gripper, gc.name + "/complement");
+        gc.hold =
+            gc.handle->createGraspAndComplement(gc.gripper, gc.name + "/hold");
+        gc.pregrasp = gc.handle->createPreGrasp(
+            gc.gripper, gc.handle->clearance() + gc.gripper->clearance(),
+            gc.pregraspName);
+      });
+
+  for (std::size_t i = 0; i < grasps.size(); ++i) {
+    const GraspConstraints& gc(grasps[i]);
+    ps->addNumericalConstraint(gc.name, gc.grasp);
+    ps->addNumericalConstraint(gc.name + "/complement", gc.complement);
+    ps->addNumericalConstraint(gc.name + "/hold", gc.hold);
+    if (!ps->numericalConstraints.has(gc.pregraspName))
+      ps->addNumericalConstraint(gc.pregraspName, gc.pregrasp);
+  }
+}
+
+/// Initialize the states and edges of a graph in parallel
+///
+/// Component ids must already be assigned. States and edges build their
+/// constraint sets independently of each other, and are thus initialized in
+/// parallel. Waypoint and level set edges initialize other components and
+/// are left to Graph::initialize, as the graph itself.
+void initializeComponents(const ProblemSolverPtr_t& ps,
+                          const graph::GraphPtr_t& graph,
+                          std::size_t nbThreads) {
+  std::vector<graph::GraphComponentPtr_t> components;
+  for (std::size_t i = 0; i < graph->nbComponents(); ++i) {
+    graph::GraphComponentPtr_t c(graph->get(i).lock());
+    if (!c || HPP_DYNAMIC_PTR_CAST(graph::WaypointEdge, c) ||
+        HPP_DYNAMIC_PTR_CAST(graph::LevelSetEdge, c))
+      continue;
+    if (HPP_DYNAMIC_PTR_CAST(graph::State, c) ||
+        HPP_DYNAMIC_PTR_CAST(graph::Edge, c))
+      components.push_back(c);
+  }
+  DevicePtr_t robot = getRobotOrThrow(ps);
+  std::size_t nbWorkers = numberOfThreads(nbThreads, components.size());
+  if (robot->numberDeviceData() < nbWorkers) robot->numberDeviceData(nbWorkers);
+  parallelFor(components.size(), nbWorkers,
+              [&components](std::size_t i, std::size_t) {
+                components[i]->initialize();
+              });
+}
 }  // namespace
 
 Graph::Graph() : server_(0x0) {}
@@ -342,6 +463,63 @@ void Graph::getGraph(GraphComp_out graph_out, GraphElements_out elmts) {
   }
 }
 
+GraphComponentInfos* Graph::getGraphStructure() {
+  try {
+    graph::GraphPtr_t g = graph();
+    std::vector<graph::GraphComponentPtr_t> components(1, g);
+    for (std::size_t i = 0; i < g->nbComponents(); ++i) {
+      if (i == g->id()) continue;
+      graph::GraphComponentPtr_t component = g->get(i).lock();
+      if (component) components.push_back(component);
+    }
+
+    GraphComponentInfos_var infos = new GraphComponentInfos;
+    infos->length((ULong)components.size());
+    for (std::size_t i = 0; i < components.size(); ++i) {
+      const graph::GraphComponentPtr_t& component(components[i]);
+      GraphComponentInfo& info(infos[(ULong)i]);
+      info.id = (ID)component->id();
+      info.name = component->name().c_str();
+      info.type = "Graph";
+      info.waypoint = false;
+      info.start = info.end = info.state = -1;
+      info.weight = 0;
+      info.isShort = false;
+      info.waypoints.length(0);
+
+      graph::StatePtr_t state(HPP_DYNAMIC_PTR_CAST(graph::State, component));
+      graph::EdgePtr_t edge(HPP_DYNAMIC_PTR_CAST(graph::Edge, component));
+      if (state) {
+        info.type = "State";
+        info.waypoint = state->isWaypoint();
+      } else if (edge) {
+        WaypointEdgePtr_t we(HPP_DYNAMIC_PTR_CAST(WaypointEdge, edge));
+        LevelSetEdgePtr_t le(HPP_DYNAMIC_PTR_CAST(LevelSetEdge, edge));
+        info.type = we ? "WaypointEdge" : (le ? "LevelSetEdge" : "Edge");
+        info.start = (ID)edge->stateFrom()->id();
+        info.end = (ID)edge->stateTo()->id();
+        info.state = (ID)edge->state()->id();
+        info.weight = (Long)edge->stateFrom()->getWeight(edge);
+        info.isShort = edge->isShort();
+        if (we) {
+          info.waypoints.length((ULong)we->nbWaypoints());
+          for (std::size_t j = 0; j < we->nbWaypoints(); ++j)
+            info.waypoints[(ULong)j] = (ID)we->waypoint(j)->stateTo()->id();
+        }
+      }
+
+      const core::NumericalConstraints_t& constraints(
+          component->numericalConstraints());
+      info.constraints.length((ULong)constraints.size());
+      for (std::size_t j = 0; j < constraints.size(); ++j)
+        info.constraints[(ULong)j] = constraints[j]->function().name().c_str();
+    }
+    return infos._retn();
+  } catch (const std::exception& exc) {
+    throw Error(exc.what());
+  }
+}
+
 void Graph::getEdgeStat(ID edgeId, Names_t_out reasons, intSeq_out freqs) {
   try {
     graph::EdgePtr_t edge = getComp<graph::Edge>(edgeId, true);
@@ -586,36 +764,53 @@ void Graph::getNode(const hpp::floatSeq& dofArray, ID_out output) {
   DevicePtr_t robot = getRobotOrThrow(problemSolver());
   try {
     Configuration_t config(floatSeqToConfig(robot, dofArray, true));
-    graph::StatePtr_t state = graph()->getState(config);
-    output = (Long)state->id();
+    output = (Long)getState(config)->id();
   } catch (std::exception& e) {
     throw Error(e.what());
   }
 }
 
+intSeq* Graph::getNodesShared(const hpp::SharedArray& configs) {
+  try {
+    DevicePtr_t robot = getRobotOrThrow(problemSolver());
+    SharedArrayMapping q(configs, configs.rows, robot->configSize(), false);
+    intSeq_var res = new intSeq;
+    res->length((ULong)q.rows());
+    for (std::size_t i = 0; i < q.rows(); ++i)
+      res[(ULong)i] = (CORBA::Long)getState(q.matrix().col(i))->id();
+    return res._retn();
+  } catch (const std::exception& exc) {
+    throw Error(exc.what());
+  }
+}
+
+graph::StatePtr_t Graph::getState(ConfigurationIn_t config) {
+  if (stateIndex_) {
+    graph::GraphPtr_t g(graph());
+    if (stateIndex_->graph() != g) stateIndex_.reset(new StateIndex(g));
+    return stateIndex_->getState(config);
+  }
+  return graph()->getState(config);
+}
+
+void Graph::useStateIndex(CORBA::Boolean enable) {
+  try {
+    if (enable) {
+      if (!stateIndex_) stateIndex_.reset(new StateIndex(graph()));
+    } else {
+      stateIndex_.reset();
+    }
+  } catch (const std::exception& exc) {
+    throw Error(exc.what());
+  }
+}
+
 bool Graph::applyNodeConstraints(hpp::ID id, const hpp::floatSeq& input,
                                  hpp::floatSeq_out output,
                                  double& residualError) {
-  /// First get the constraint.
-  ConstraintSetPtr_t constraint;
   try {
-    graph::GraphComponentPtr_t comp = graph()->get((size_t)id).lock();
-    graph::EdgePtr_t edge = HPP_DYNAMIC_PTR_CAST(graph::Edge, comp);
-    graph::StatePtr_t state = HPP_DYNAMIC_PTR_CAST(graph::State, comp);
-    if (edge) {
-      constraint = graph(false)->targetConstraint(edge);
-      DevicePtr_t robot = getRobotOrThrow(problemSolver());
-      if (core::ConfigProjectorPtr_t cp = constraint->configProjector()) {
-        cp->rightHandSideFromConfig(robot->currentConfiguration());
-      }
-    } else if (state)
-      constraint = graph(false)->configConstraint(state);
-    else {
-      std::stringstream ss;
-      ss << "ID " << id << " is neither an edge nor a state";
-      std::string errmsg = ss.str();
-      throw Error(errmsg.c_str());
-    }
+    /// First get the constraint.
+    ConstraintSetPtr_t constraint(nodeConstraint(id));
     bool success = false;
     DevicePtr_t robot = getRobotOrThrow(problemSolver());
     Configuration_t config = floatSeqToConfig(robot, input, true);
@@ -631,6 +826,56 @@ bool Graph::applyNodeConstraints(hpp::ID id, const hpp::floatSeq& input,
   }
 }
 
+boolSeq* Graph::applyNodeConstraintsShared(hpp::ID id,
+                                           const hpp::SharedArray& input,
+                                           const hpp::SharedArray& output,
+                                           floatSeq_out residualErrors) {
+  try {
+    ConstraintSetPtr_t constraint(nodeConstraint(id));
+    DevicePtr_t robot = getRobotOrThrow(problemSolver());
+    SharedArrayMapping qin(input, input.rows, robot->configSize(), false),
+        qout(output, input.rows, robot->configSize(), true);
+    core::ConfigProjectorPtr_t configProjector(constraint->configProjector());
+    std::size_t n = qin.rows();
+    boolSeq_var res = new boolSeq;
+    floatSeq_var errors = new floatSeq;
+    res->length((ULong)n);
+    errors->length((ULong)n);
+    for (std::size_t i = 0; i < n; ++i) {
+      SharedArrayMapping::MatrixMap_t::ColXpr q(qout.matrix().col(i));
+      q = qin.matrix().col(i);
+      res[(ULong)i] = constraint->apply(q);
+      errors[(ULong)i] = configProjector ? configProjector->residualError() : 0;
+    }
+    residualErrors = errors._retn();
+    return res._retn();
+  } catch (const std::exception& exc) {
+    throw Error(exc.what());
+  }
+}
+
+ConstraintSetPtr_t Graph::nodeConstraint(hpp::ID id) {
+  ConstraintSetPtr_t constraint;
+  graph::GraphComponentPtr_t comp = graph()->get((size_t)id).lock();
+  graph::EdgePtr_t edge = HPP_DYNAMIC_PTR_CAST(graph::Edge, comp);
+  graph::StatePtr_t state = HPP_DYNAMIC_PTR_CAST(graph::State, comp);
+  if (edge) {
+    constraint = graph(false)->targetConstraint(edge);
+    DevicePtr_t robot = getRobotOrThrow(problemSolver());
+    if (core::ConfigProjectorPtr_t cp = constraint->configProjector()) {
+      cp->rightHandSideFromConfig(robot->currentConfiguration());
+    }
+  } else if (state)
+    constraint = graph(false)->configConstraint(state);
+  else {
+    std::stringstream ss;
+    ss << "ID " << id << " is neither an edge nor a state";
+    std::string errmsg = ss.str();
+    throw Error(errmsg.c_str());
+  }
+  return constraint;
+}
+
 bool Graph::applyEdgeLeafConstraints(hpp::ID IDedge, const hpp::floatSeq& qleaf,
                                      const hpp::floatSeq& input,
                                      hpp::floatSeq_out output,
@@ -972,6 +1217,38 @@ Long Graph::autoBuild(const char* graphName, const Names_t& grippers,
   }
 }
 
+Long Graph::autoBuildParallel(const char* graphName, const Names_t& grippers,
+                              const Names_t& objects,
+                              const Namess_t& handlesPerObject,
+                              const Namess_t& shapesPreObject,
+                              const Names_t& envNames, const Rules& rulesList,
+                              ULong nbThreads) {
+  std::vector<graph::helper::Rule> rules(rulesList.length());
+
+  for (ULong i = 0; i < rulesList.length(); ++i) {
+    setRule(rulesList[i], rules[i]);
+  }
+  try {
+    createGraspConstraints(
+        problemSolver(),
+        corbaServer::toStrings<std::vector<std::string> >(grippers),
+        toObjectVector(objects, handlesPerObject, shapesPreObject), rules,
+        nbThreads);
+  } catch (const std::exception& exc) {
+    throw Error(exc.what());
+  }
+  // Component ids are assigned sequentially, as by autoBuild.
+  Long id = autoBuild(graphName, grippers, objects, handlesPerObject,
+                      shapesPreObject, envNames, rulesList);
+  try {
+    initializeComponents(problemSolver(), graph(), nbThreads);
+    problemSolver()->initConstraintGraph();
+  } catch (const std::exception& exc) {
+    throw Error(exc.what());
+  }
+  return id;
+}
+
 void Graph::setWeight(ID edgeId, const Long weight) {
   graph::EdgePtr_t edge = getComp<graph::Edge>(edgeId);
   try {
@@ -990,6 +1267,22 @@ Long Graph::getWeight(ID edgeId) {
   }
 }
 
+char* Graph::getFingerprint(CORBA::Boolean perComponent,
+                            Names_t_out componentHashes) {
+  try {
+    std::vector<uint64_t> hashes;
+    uint64_t fingerprint(
+        graphFingerprint(graph(), perComponent ? &hashes : NULL));
+    std::vector<std::string> names(hashes.size());
+    for (std::size_t i = 0; i < hashes.size(); ++i)
+      names[i] = hashToString(hashes[i]);
+    componentHashes = toNames_t(names.begin(), names.end());
+    return c_str(hashToString(fingerprint));
+  } catch (const std::exception& exc) {
+    throw Error(exc.what());
+  }
+}
+
 char* Graph::getName(ID elmtId) {
   try {
     return corbaServer::c_str(graph()->get(elmtId).lock()->name());
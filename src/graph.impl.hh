@@ -34,11 +34,14 @@
 
 #include "hpp/corbaserver/manipulation/fwd.hh"
 #include "hpp/corbaserver/manipulation/graph-idl.hh"
+#include "state-index.hh"
 
 namespace hpp {
 namespace manipulation {
 namespace impl {
 using CORBA::Long;
+using hpp::corbaserver::manipulation::GraphComponentInfo;
+using hpp::corbaserver::manipulation::GraphComponentInfos;
 using hpp::corbaserver::manipulation::Namess_t;
 using hpp::corbaserver::manipulation::Rules;
 
@@ -73,6 +76,8 @@ class Graph : public virtual POA_hpp::corbaserver::manipulation::Graph {
 
   virtual void getGraph(GraphComp_out graph, GraphElements_out elmts);
 
+  virtual GraphComponentInfos* getGraphStructure();
+
   virtual void getEdgeStat(ID edgeId, Names_t_out reasons, intSeq_out freqs);
 
   virtual Long getFrequencyOfNodeInRoadmap(
@@ -120,10 +125,19 @@ class Graph : public virtual POA_hpp::corbaserver::manipulation::Graph {
 
   virtual void getNode(const hpp::floatSeq& dofArray, ID_out output);
 
+  virtual intSeq* getNodesShared(const hpp::SharedArray& configs);
+
+  virtual void useStateIndex(CORBA::Boolean enable);
+
   virtual bool applyNodeConstraints(hpp::ID id, const hpp::floatSeq& input,
                                     hpp::floatSeq_out output,
                                     double& residualError);
 
+  virtual boolSeq* applyNodeConstraintsShared(hpp::ID id,
+                                              const hpp::SharedArray& input,
+                                              const hpp::SharedArray& output,
+                                              floatSeq_out residualErrors);
+
   virtual bool applyEdgeLeafConstraints(hpp::ID IDedge,
                                         const hpp::floatSeq& qleaf,
                                         const hpp::floatSeq& input,
@@ -178,10 +192,18 @@ class Graph : public virtual POA_hpp::corbaserver::manipulation::Graph {
                          const Namess_t& shapesPreObject,
                          const Names_t& envNames, const Rules& rulesList);
 
+  virtual Long autoBuildParallel(
+      const char* graphName, const Names_t& grippers, const Names_t& objects,
+      const Namess_t& handlesPerObject, const Namess_t& shapesPreObject,
+      const Names_t& envNames, const Rules& rulesList, CORBA::ULong nbThreads);
+
   virtual void setWeight(ID edgeId, const Long weight);
 
   virtual Long getWeight(ID edgeId);
 
+  virtual char* getFingerprint(CORBA::Boolean perComponent,
+                               Names_t_out componentHashes);
+
   virtual char* getName(ID elmtId);
 
   virtual void initialize();
@@ -197,7 +219,13 @@ class Graph : public virtual POA_hpp::corbaserver::manipulation::Graph {
   shared_ptr<T> getComp(ID id, bool throwIfWrongType = true);
   ProblemSolverPtr_t problemSolver();
   graph::GraphPtr_t graph(bool throwIfNull = true);
+  /// State of a configuration, with the state index if enabled
+  graph::StatePtr_t getState(ConfigurationIn_t config);
+  /// Constraints applied by applyNodeConstraints
+  ConstraintSetPtr_t nodeConstraint(hpp::ID id);
   Server* server_;
+  /// Used by getNode if not null
+  shared_ptr<StateIndex> stateIndex_;
 };  // class Graph
 }  // namespace impl
 }  // namespace manipulation
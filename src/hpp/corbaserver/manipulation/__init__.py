@@ -1,12 +1,39 @@
-import hpp_idl.hpp.manipulation_idl  # noqa: F401
-from hpp_idl.hpp.corbaserver.manipulation import Rule  # noqa: F401
-
-from hpp.corbaserver import createContext, loadServerPlugin  # noqa: F401
-
-from .client import Client  # noqa: F401
-from .constraint_graph import ConstraintGraph  # noqa: F401
-from .constraint_graph_factory import ConstraintGraphFactory  # noqa: F401
-from .constraints import Constraints  # noqa: F401
-from .problem_solver import ProblemSolver, newProblem  # noqa: F401
-from .robot import CorbaClient, Robot  # noqa: F401
-from .security_margins import SecurityMargins  # noqa: F401
+import importlib
+
+# Public names are imported on first access (PEP 562), so that importing this
+# package does not load the CORBA stubs nor the client modules. The stubs are
+# loaded when a Client is created.
+_lazyAttributes = {
+    "Rule": ("hpp_idl.hpp.corbaserver.manipulation", "Rule"),
+    "createContext": ("hpp.corbaserver", "createContext"),
+    "loadServerPlugin": ("hpp.corbaserver", "loadServerPlugin"),
+    "AdaptiveEdgeWeights": (".adaptive_edge_weights", "AdaptiveEdgeWeights"),
+    "Client": (".client", "Client"),
+    "ConstraintGraph": (".constraint_graph", "ConstraintGraph"),
+    "ConstraintGraphFactory": (".constraint_graph_factory", "ConstraintGraphFactory"),
+    "Constraints": (".constraints", "Constraints"),
+    "DeviceInfo": (".device_info", "DeviceInfo"),
+    "GraphStructure": (".graph_structure", "GraphStructure"),
+    "ProblemSolver": (".problem_solver", "ProblemSolver"),
+    "newProblem": (".problem_solver", "newProblem"),
+    "CorbaClient": (".robot", "CorbaClient"),
+    "Robot": (".robot", "Robot"),
+    "SecurityMargins": (".security_margins", "SecurityMargins"),
+    "SharedArray": (".shared_memory", "SharedArray"),
+}
+
+__all__ = list(_lazyAttributes)
+
+
+def __getattr__(name):
+    try:
+        module, attribute = _lazyAttributes[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module, __name__), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazyAttributes))
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+#
+# Copyright (c) 2026 CNRS
+#
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH
+# DAMAGE.
+
+import threading
+
+from hpp_idl.hpp import Error
+
+
+class AdaptiveEdgeWeights:
+    """
+    Adapt the weights of the edges of a constraint graph to planner statistics
+
+    \\link hpp::manipulation::ManipulationPlanner ManipulationPlanner\\endlink
+    records, for each edge of the constraint graph, how many times extending
+    the roadmap along this edge succeeded or failed. Method \\link
+    AdaptiveEdgeWeights.update update\\endlink reads these statistics and
+    changes the weights of the edges going out of each state, so that
+    transitions that often succeed are chosen more often than transitions
+    that almost always fail.
+
+    For each edge \\f$e\\f$ with a positive initial weight \\f$w_e\\f$, the
+    success rate is estimated by
+    \\f[ r_e = \\frac{s_e + p}{s_e + f_e + 2p} \\f]
+    where \\f$s_e\\f$ and \\f$f_e\\f$ are the accumulated numbers of successes
+    and failures and \\f$p\\f$ is \\c prior. The new weight is
+    \\f$ scale \\times w_e \\times r_e / \\bar{r} \\f$ where \\f$\\bar{r}\\f$ is
+    the mean rate of the edges going out of the same state, rounded and
+    clamped between \\c minWeight and \\c maxWeight. Edges with a null
+    initial weight, like loop transitions created by the factory, are not
+    modified. Waypoint edges are weighted as a whole, like the other edges.
+
+    Statistics are accumulated across successive planning problems, so that
+    repetitive problems benefit from the previous ones. Each call to
+    ProblemSolver.solve creates a new planner with new statistics: plan with
+    \\link AdaptiveEdgeWeights.solve solve\\endlink so that the statistics of
+    each planner are counted once.
+
+    \\code
+    weights = AdaptiveEdgeWeights(graph)
+    for goal in goals:
+        ps.resetGoalConfigs()
+        ps.addGoalConfig(goal)
+        weights.solve(ps)
+    \\endcode
+    """
+
+    failurePrefix = "[Fail]"
+    """
+    Prefix of the failure reasons returned by getEdgeStat that are counted
+    as failures.
+    """
+
+    def __init__(self, graph, minWeight=1, maxWeight=100, scale=10, prior=1.0):
+        """
+        Constructor
+        \\param graph instance of ConstraintGraph,
+        \\param minWeight, maxWeight bounds of the computed weights,
+        \\param scale weight given to an edge with the mean success rate and
+               an initial weight of 1,
+        \\param prior number of virtual successes and failures added to the
+               statistics of each edge.
+        """
+        if minWeight < 1 or maxWeight < minWeight:
+            raise ValueError("Bounds must satisfy 1 <= minWeight <= maxWeight")
+        self.graph = graph
+        self.minWeight = minWeight
+        self.maxWeight = maxWeight
+        self.scale = scale
+        self.prior = prior
+        # # initial weight of the edges, by edge id
+        self.initialWeights = dict()
+        # # accumulated [successes, failures], by edge id
+        self.counts = dict()
+        self._lastCounts = dict()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def _outgoingEdges(self):
+        _, elmts = self.graph.graph.getGraph()
+        res = dict()
+        for e in elmts.edges:
+            if e.id not in self.initialWeights:
+                self.initialWeights[e.id] = self.graph.graph.getWeight(e.id)
+            if self.initialWeights[e.id] > 0:
+                res.setdefault(e.start, list()).append(e.id)
+        return res
+
+    def _accumulate(self, edgeId):
+        reasons, freqs = self.graph.graph.getEdgeStat(edgeId)
+        success = failure = 0
+        for r, f in zip(reasons, freqs):
+            if r == "Success":
+                success += f
+            elif r.startswith(self.failurePrefix):
+                failure += f
+        last = self._lastCounts.get(edgeId, (0, 0))
+        counts = self.counts.setdefault(edgeId, [0, 0])
+        counts[0] += success - last[0]
+        counts[1] += failure - last[1]
+        self._lastCounts[edgeId] = (success, failure)
+
+    def update(self):
+        """
+        Read the planner statistics and update the edge weights
+        \\return False if no manipulation planner is available yet, True
+                otherwise.
+        """
+        with self._lock:
+            return self._update()
+
+    def _update(self):
+        outgoing = self._outgoingEdges()
+        try:
+            for edges in outgoing.values():
+                for e in edges:
+                    self._accumulate(e)
+        except Error:
+            # The path planner is created by ProblemSolver.solve
+            return False
+        for edges in outgoing.values():
+            if len(edges) < 2:
+                continue
+            rates = dict()
+            for e in edges:
+                s, f = self.counts.get(e, (0, 0))
+                rates[e] = (s + self.prior) / (s + f + 2 * self.prior)
+            mean = sum(rates.values()) / len(rates)
+            for e, r in rates.items():
+                w = round(self.scale * self.initialWeights[e] * r / mean)
+                w = min(max(w, self.minWeight), self.maxWeight)
+                if w != self.graph.graph.getWeight(e):
+                    self.graph.graph.setWeight(e, w)
+        return True
+
+    def solve(self, ps):
+        """
+        Solve the problem and update the edge weights
+
+        The statistics of the previous planner are read before
+        ProblemSolver.solve replaces it by a new planner, whose statistics
+        are then counted from zero.
+        \\param ps instance of ProblemSolver.
+        \\return the value returned by ProblemSolver.solve.
+        """
+        with self._lock:
+            self._update()
+            self._lastCounts = dict()
+        res = ps.solve()
+        self.update()
+        return res
+
+    def reset(self):
+        """
+        Restore the initial weights and forget the statistics
+        """
+        self.stop()
+        with self._lock:
+            for e, w in self.initialWeights.items():
+                if w > 0:
+                    self.graph.graph.setWeight(e, w)
+            self.initialWeights = dict()
+            self.counts = dict()
+            self._lastCounts = dict()
+
+    def start(self, period=1.0):
+        """
+        Call \\link AdaptiveEdgeWeights.update update\\endlink periodically
+        in a background thread
+        \\param period time in seconds between two updates.
+        \\warning the weights are modified while the server is planning.
+                 The server must thus be able to process several requests
+                 concurrently. An update happening after
+                 \\link AdaptiveEdgeWeights.solve solve\\endlink started but
+                 before the server created the new planner counts the last
+                 statistics of the previous planner twice.
+        """
+        if self._thread is not None:
+            raise RuntimeError("Adaptive edge weights are already running")
+        self._stop.clear()
+
+        def _run():
+            while not self._stop.wait(period):
+                self.update()
+
+        self._thread = threading.Thread(target=_run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the thread launched by \\link AdaptiveEdgeWeights.start
+        start\\endlink.
+        """
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
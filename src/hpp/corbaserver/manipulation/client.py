@@ -28,6 +28,7 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH
 # DAMAGE.
 
+import hpp_idl.hpp.manipulation_idl  # noqa: F401
 from hpp_idl.hpp.corbaserver.manipulation import Graph, Problem, Robot
 
 from hpp.corbaserver.client import Client as _Parent
@@ -32,6 +32,7 @@
 from subprocess import Popen
 
 from .constraints import Constraints
+from .graph_structure import GraphStructure
 
 
 class ConstraintGraph:
@@ -491,6 +492,30 @@ class ConstraintGraph:
 
     # # \\}
 
+    def fingerprint(self, perComponent=False):
+        """
+        Get a hash of the content of the graph
+
+        The hash covers the names, the topology, the weights, the short flags
+        and the constraint names of the components. It can be stored with
+        artifacts built with the graph to check later that they still match.
+        \\param perComponent whether to also return the hash of each component,
+        \\return the hash of the graph, as a string, if perComponent is
+                false, otherwise a tuple (hash, componentHashes) where
+                componentHashes maps the names of states and edges to their
+                hashes.
+        \\sa hpp::corbaserver::manipulation::Graph::getFingerprint
+        """
+        fingerprint, hashes = self.graph.getFingerprint(perComponent)
+        if not perComponent:
+            return fingerprint
+        componentHashes = dict()
+        for components in (self.nodes, self.edges):
+            for name, index in components.items():
+                if index < len(hashes):
+                    componentHashes[name] = hashes[index]
+        return fingerprint, componentHashes
+
     def addTextToTeXTranslation(self, text, tex):
         """
         Add entry to the local dictionnary
@@ -548,6 +573,41 @@ class ConstraintGraph:
             viewCmd.append(pdfOut + "." + format)
             Popen(viewCmd)
 
+    def structure(self):
+        """
+        Get the content of the graph in one request
+        \\return a GraphStructure instance.
+        \\sa hpp::corbaserver::manipulation::Graph::getGraphStructure
+        """
+        return GraphStructure(self.graph.getGraphStructure())
+
+    def export(
+        self,
+        out,
+        format="json",
+        states=None,
+        edges=None,
+        depth=0,
+        aggregateWaypoints=False,
+    ):
+        """
+        Write a part of the graph as JSON, CSV or DOT
+
+        Contrary to display, the graph is formatted by the client and written
+        to a stream without temporary file. Selecting the part of interest
+        keeps DOT rendering tractable on large graphs.
+        \\param out a file-like object open in text mode, or a file name,
+        \\param format "json", "csv" or "dot",
+        \\param states regular expression on the names of the states to export,
+        \\param edges regular expression on the names of the edges to export,
+        \\param depth states linked to an exported state by at most depth
+               edges are exported too,
+        \\param aggregateWaypoints whether to export waypoint edges as single
+               edges, without their intermediate states.
+        \\sa GraphStructure.write
+        """
+        self.structure().write(out, format, states, edges, depth, aggregateWaypoints)
+
     def getNodesConnectedByEdge(self, edge):
         """
         Get nodes connected by an edge
@@ -569,6 +629,25 @@ class ConstraintGraph:
         """
         return self.client.graph.applyNodeConstraints(self.nodes[node], input)
 
+    def applyNodeConstraintsShared(self, node, input, output=None):
+        """
+        Apply constraints to configurations stored in shared memory
+
+        \\param node name of the node the constraints of which to apply
+        \\param input SharedArray instance with one configuration per row,
+        \\param output SharedArray instance of the same shape where output
+               configurations are written. If None, input is modified in
+               place.
+        \\retval success for each configuration, whether projection succeeded,
+        \\retval errors for each configuration, norm of the residual error.
+        \\sa hpp::corbaserver::manipulation::Graph::applyNodeConstraintsShared
+        """
+        if output is None:
+            output = input
+        return self.client.graph.applyNodeConstraintsShared(
+            self.nodes[node], input.ref(), output.ref()
+        )
+
     def applyEdgeLeafConstraints(self, edge, qfrom, input):
         """
         Apply edge constaints to a configuration
@@ -621,6 +700,149 @@ class ConstraintGraph:
         """
         return self.client.problem.buildAndProjectPath(self.edges[edge], qb, qe)
 
+    def buildAndProjectPaths(self, edge, qbs, qes, storePaths=True, nbThreads=0):
+        """
+        Build and project paths along an edge for a batch of configurations
+        \\param edge name of the edge to use.
+        \\param qbs list of configurations at the beginning of the paths
+        \\param qes list of configurations at the end of the paths
+        \\param storePaths whether to store the paths in the ProblemSolver
+               path vector. If False, only statistics are returned.
+        \\param nbThreads number of threads used by the server. If 0, the
+               number of cores is used.
+        \\retval success for each pair, whether the path is built and fully
+                projected.
+        \\retval indexNotProj for each pair, index of the built path in the
+                ProblemSolver path vector, or -1,
+        \\retval indexProj for each pair, index of the projected path in the
+                ProblemSolver path vector, or -1,
+        \\retval projectedRatios for each pair, ratio between the lengths of
+                the projected path and of the built path.
+        Paths are processed in parallel by the server. See
+        buildAndProjectPath.
+        """
+        return self.client.problem.buildAndProjectPaths(
+            self.edges[edge], qbs, qes, storePaths, nbThreads
+        )
+
+    def directPaths(self, edge, q1s, q2s, validate=True, nbThreads=0):
+        """
+        Build, project and validate direct paths along an edge for a batch of
+        pairs of configurations
+        \\param edge name of the edge,
+        \\param q1s, q2s lists of initial and final configurations,
+        \\param validate whether to validate the paths,
+        \\param nbThreads number of threads used by the server. If 0, the
+               number of cores is used.
+        \\retval success for each pair, whether a valid path was found,
+        \\retval pathIds for each pair, index of the path in the
+                ProblemSolver path vector, or -1,
+        \\retval statuses for each pair, empty string on success, reason of
+                the failure otherwise.
+        \\sa hpp::corbaserver::manipulation::Problem::directPaths
+        """
+        return self.client.problem.directPaths(
+            self.edges[edge], q1s, q2s, validate, nbThreads
+        )
+
+    def validateConfigurations(self, edge, configs, nbThreads=0):
+        """
+        Validate a batch of configurations with the path validation of an edge
+        \\param edge name of the edge,
+        \\param configs list of configurations,
+        \\param nbThreads number of threads used by the server. If 0, the
+               number of cores is used.
+        \\retval valid for each configuration, whether it is valid,
+        \\retval reports for each configuration, validation report or empty
+                string.
+        \\sa hpp::corbaserver::manipulation::Problem::validateConfigurations
+        """
+        return self.client.problem.validateConfigurations(
+            self.edges[edge], configs, nbThreads
+        )
+
+    def validateConfigurationsShared(self, edge, configs, nbThreads=0):
+        """
+        Validate a batch of configurations stored in shared memory
+        \\param configs SharedArray instance with one configuration per row.
+        \\sa validateConfigurations,
+            hpp::corbaserver::manipulation::Problem::validateConfigurationsShared
+        """
+        return self.client.problem.validateConfigurationsShared(
+            self.edges[edge], configs.ref(), nbThreads
+        )
+
+    def planTransitions(self, queries, timeOut=0, shareRoadmaps=False, nbThreads=0):
+        """
+        Plan paths along edges for a batch of queries
+        \\param queries list of tuples (edge, qInit, qGoals) where edge is the
+               name of an edge and qGoals a list of configurations,
+        \\param timeOut maximal time in seconds to solve each query. If 0,
+               the default time out of the transition planner is used,
+        \\param shareRoadmaps whether consecutive queries along the same edge
+               and in the same leaf reuse the roadmap of the previous query,
+        \\param nbThreads number of threads used by the server. If 0, the
+               number of cores is used.
+        \\retval indexes for each query, index of the path in the
+                ProblemSolver path vector, or -1,
+        \\retval statuses for each query, empty string if a path was found,
+                reason of the failure otherwise.
+        \\sa hpp::corbaserver::manipulation::Problem::planTransitions
+        """
+        from hpp_idl.hpp.corbaserver.manipulation import TransitionQuery
+
+        queries = [
+            TransitionQuery(self.edges[e], list(qInit), [list(q) for q in qGoals])
+            for e, qInit, qGoals in queries
+        ]
+        return self.client.problem.planTransitions(
+            queries, timeOut, shareRoadmaps, nbThreads
+        )
+
+    def validate(self, nbThreads=0, timeout=1.0):
+        """
+        Validate the states and edges of the graph on several threads
+        \\param nbThreads number of threads used by the server. If 0, the
+               number of cores is used.
+        \\param timeout time in seconds to wait for new results at each
+               request to the server.
+        \\return a generator of dictionaries with keys
+          \\li "component": name of the state or edge,
+          \\li "error", "warning": whether validation raised errors or
+              warnings,
+          \\li "report": text of errors and warnings,
+          \\li "collisions": pairs of bodies in collision, for states.
+
+        Results are yielded as soon as components are validated. Validation
+        stops when the generator is closed, for instance when the caller
+        leaves a loop on the first error:
+        \\code
+        for r in graph.validate():
+            if r["error"]:
+                print(r["report"])
+                break
+        \\endcode
+        """
+        names = dict((v, k) for k, v in self.nodes.items())
+        names.update((v, k) for k, v in self.edges.items())
+        self.client.problem.startGraphValidation(nbThreads)
+        try:
+            finished = False
+            while not finished:
+                results, finished = self.client.problem.getGraphValidationResults(
+                    timeout
+                )
+                for r in results:
+                    yield {
+                        "component": names.get(r.component, r.component),
+                        "error": r.error,
+                        "warning": r.warning,
+                        "report": r.report,
+                        "collisions": [list(c) for c in r.collisions],
+                    }
+        finally:
+            self.client.problem.stopGraphValidation()
+
     def getConfigErrorForNode(self, nodeId, config):
         """
         Get error of a config with respect to a node constraint
@@ -647,6 +869,27 @@ class ConstraintGraph:
                 return n
         raise RuntimeError(f"No node with id {nodeId}")
 
+    def getNodesShared(self, configs):
+        """
+        Get the nodes of configurations stored in shared memory
+        \\param configs SharedArray instance with one configuration per row.
+        \\return the list of the names of the nodes, as by getNode.
+        \\sa hpp::corbaserver::manipulation::Graph::getNodesShared
+        """
+        names = {id: n for n, id in self.nodes.items()}
+        return [names[i] for i in self.client.graph.getNodesShared(configs.ref())]
+
+    def useStateIndex(self, enable=True):
+        """
+        Use an index of the states in getNode
+        \\param enable whether to use the index.
+        With the index, each distinct constraint of the states is evaluated
+        once per configuration and only the states whose constraints are all
+        satisfied are tested, in priority order. The result of getNode does
+        not change.
+        """
+        self.client.graph.useStateIndex(enable)
+
     def getConfigErrorForEdge(self, edgeId, config):
         """
         Get error of a config with respect to a edge constraint
@@ -743,14 +986,18 @@ class ConstraintGraph:
         shapesPerObjects,
         envNames,
         rules=[],
+        nbThreads=None,
     ):
         """
         # Build a graph
+        \\param nbThreads if not None, grasp constraints are created, and the
+               graph is initialized, on this number of threads (0 for one per
+               core).
         \\return a Initialized ConstraintGraph object
         \\sa hpp::corbaserver::manipulation::Graph::autoBuild for complete
-            documentation.
+            documentation, hpp::corbaserver::manipulation::Graph::autoBuildParallel
         """
-        robot.client.manipulation.graph.autoBuild(
+        args = (
             name,
             grippers,
             objects,
@@ -759,8 +1006,13 @@ class ConstraintGraph:
             envNames,
             rules,
         )
-        graph = ConstraintGraph(robot, name, makeGraph=False)
-        graph.initialize()
+        if nbThreads is None:
+            robot.client.manipulation.graph.autoBuild(*args)
+            graph = ConstraintGraph(robot, name, makeGraph=False)
+            graph.initialize()
+        else:
+            robot.client.manipulation.graph.autoBuildParallel(*args, nbThreads)
+            graph = ConstraintGraph(robot, name, makeGraph=False)
         return graph
 
     def initialize(self):
@@ -29,6 +29,8 @@
 # DAMAGE.
 
 import abc
+import multiprocessing
+import os
 import re
 import sys
 
@@ -111,6 +113,66 @@ else:
     from abc import ABC
 
 
+class _GraspLattice:
+    """
+    Enumeration of the sets of grasps of a factory
+
+    Instances only store the numbers of grippers and handles and the grasp
+    validation, so that they can be sent to other processes by
+    GraphFactoryAbstract.plan, without the factory and its client.
+    """
+
+    def __init__(self, nGrippers, nHandles, graspIsAllowed):
+        self.nGrippers = nGrippers
+        self.nHandles = nHandles
+        self.graspIsAllowed = graspIsAllowed
+
+    def key(self, grasps):
+        """
+        Same as GraphFactoryAbstract._graspKey
+        """
+        base = self.nHandles + 1
+        key = 0
+        for ih in reversed(grasps):
+            key = key * base + (0 if ih is None else ih + 1)
+        return key
+
+    def __call__(self, first):
+        """
+        Plan the states of a partition and the transitions to these states
+        \\param first handle index held by the first gripper in the states of
+               the partition, or None.
+        \\return the list of recorded states and transitions, as in
+                GraphFactoryAbstract._plan.
+
+        States have the priority given by GraphFactoryAbstract._recurse, that
+        is twice their number of grasps minus one, or 0 for the free state.
+        """
+        plan = list()
+
+        def _visit(grasps, used):
+            if len(grasps) < self.nGrippers:
+                _visit((*grasps, None), used)
+                for ih in range(self.nHandles):
+                    if ih not in used:
+                        _visit((*grasps, ih), used | {ih})
+                return
+            if not self.graspIsAllowed(grasps):
+                return
+            key = self.key(grasps)
+            nGrasps = len(used)
+            plan.append(("state", key, max(2 * nGrasps - 1, 0)))
+            for ig, ih in enumerate(grasps):
+                if ih is None:
+                    continue
+                previous = (*grasps[:ig], None, *grasps[ig + 1 :])
+                if self.graspIsAllowed(previous):
+                    plan.append(("transition", self.key(previous), key, ig))
+
+        _visit((first,), frozenset() if first is None else frozenset((first,)))
+        return plan
+
+
 class GraphFactoryAbstract(ABC):
     """
     An abstract class which is loops over the different (gripper, handle) associations.
@@ -169,7 +231,11 @@ class GraphFactoryAbstract(ABC):
         # # \name Internal variables
         # \{
 
+        # # states indexed by the integer key of their grasps,
+        # see \\ref _graspKey
         self.states = dict()
+        # # transitions created by makeTransition, as triples
+        # (key of stateFrom, key of stateTo, index of gripper)
         self.transitions = set()
         # # the handle names
         self.handles = tuple()  # strings
@@ -185,6 +251,15 @@ class GraphFactoryAbstract(ABC):
         self.objectFromHandle = tuple()  # handle index to object index
         # # See \\ref setObjects
         self.contactsPerObjects = tuple()  # object index to contact names
+        # # See \\ref setReachabilityPruning
+        self.startStates = None
+        # # See \\ref setReachabilityPruning
+        self.targetStates = None
+        # # Number of (kept, generated) states and transitions when pruning is
+        # enabled. See \\ref setReachabilityPruning
+        self.pruningReport = None
+        # # list of operations recorded when planning the graph
+        self._plan = None
         # # \}
 
     # # \name Main API
@@ -249,16 +324,127 @@ class GraphFactoryAbstract(ABC):
         """
         self.graspIsAllowed.append(PossibleGrasps(self.grippers, self.handles, grasps))
 
-    def generate(self):
+    def setReachabilityPruning(self, startStates, targetStates=None):
+        """
+        Only create the states that are reachable from the start states
+        \\param startStates list of states, given by name or by grasps as in
+               \\ref graspIsAllowed,
+        \\param targetStates list of states, given by name or by grasps. If
+               not empty, only the states from which one of these states can
+               be reached are created.
+
+        When set, \\ref generate first enumerates the states and transitions
+        without creating them, removes the states that cannot be reached from
+        the start states or that cannot lead to the target states, and then
+        creates the remaining states and transitions in the order of the
+        enumeration. Since \\ref makeTransition creates transitions in both
+        directions, forward and backward reachability reduce to the connected
+        components of the enumerated graph.
+
+        \\note \\ref transitionIsAllowed is called on the states kept after
+              pruning only. Transitions rejected by it are thus considered
+              when computing reachability.
+        \\note Call with startStates=None to disable pruning.
+        """
+        self.startStates = None if startStates is None else tuple(startStates)
+        self.targetStates = None if targetStates is None else tuple(targetStates)
+
+    def generate(self, nbProcesses=None):
         """
         Go through the combinatorial defined by the grippers and handles
         and create the states and transitions.
+        \\param nbProcesses if not None, the states and transitions are first
+               planned in this number of processes (0 for one per core), see
+               \\ref plan, and then created.
+
+        States and transitions have the same names and priorities whatever
+        the number of processes, but are created in another order when
+        planned in processes.
         """
-        grasps = (None,) * len(self.grippers)
-        self._recurse(self.grippers, self.handles, grasps, 0)
+        if nbProcesses is None or len(self.grippers) == 0:
+            self._generate()
+            return
+        self._replay(self.plan(nbProcesses))
+
+    def plan(self, nbProcesses=0):
+        """
+        Enumerate the states and transitions without creating them
+        \\param nbProcesses number of processes, 0 for one per core.
+        \\return the list of states and transitions, as recorded when
+                \\ref setReachabilityPruning is set: tuples
+                ("state", key, priority) followed by tuples
+                ("transition", key of stateFrom, key of stateTo, index of
+                gripper), where keys are given by \\ref _graspKey.
+
+        Sets of grasps are partitioned by the handle held by the first gripper.
+        Each partition is planned by one process, that records the allowed
+        states of the partition and the transitions to these states. The plans
+        of the partitions are then merged.
+
+        Processes are spawned rather than forked, so that they do not inherit
+        the connection to the server. \\ref graspIsAllowed is thus sent to
+        them and must be picklable, as rules and possible grasps are, and a
+        script calling this method must protect its main code by
+        \\code if __name__ == "__main__": \\endcode
+        """
+        lattice = _GraspLattice(
+            len(self.grippers), len(self.handles), self.graspIsAllowed
+        )
+        partitions = [None, *range(len(self.handles))]
+        nbProcesses = min(nbProcesses or os.cpu_count() or 1, len(partitions))
+        if nbProcesses == 1:
+            plans = [lattice(p) for p in partitions]
+        else:
+            context = multiprocessing.get_context("spawn")
+            with context.Pool(nbProcesses) as pool:
+                plans = pool.map(lattice, partitions, 1)
+        # Transitions may refer to states of previous partitions.
+        states = [op for plan in plans for op in plan if op[0] == "state"]
+        transitions = [op for plan in plans for op in plan if op[0] != "state"]
+        return states + transitions
 
     # # \}
 
+    def _generate(self):
+        grasps = (None,) * len(self.grippers)
+        if self.startStates is None:
+            self._recurse(self.grippers, self.handles, grasps, 0)
+            return
+        # Enumerate states and transitions without creating them. States are
+        # recorded by the key of their grasps.
+        self._plan = list()
+        try:
+            self._recurse(self.grippers, self.handles, grasps, 0)
+            plan = self._plan
+        finally:
+            self._plan = None
+            self.states = dict()
+        self._replay(plan)
+
+    def _replay(self, plan):
+        """
+        Create the states and transitions of a plan
+        \\param plan list of recorded states and transitions, see \\ref plan.
+
+        If \\ref setReachabilityPruning is set, only the reachable states and
+        the transitions between them are created.
+        """
+        live = None if self.startStates is None else self._reachableStates(plan)
+        nStates = nTransitions = 0
+        for op in plan:
+            if op[0] == "state":
+                if live is None or op[1] in live:
+                    self._makeState(self._graspsFromKey(op[1]), op[2])
+                    nStates += 1
+            elif live is None or (op[1] in live and op[2] in live):
+                self._makeTransition(self.states[op[1]], self.states[op[2]], op[3])
+                nTransitions += 1
+        if live is not None:
+            self.pruningReport = {
+                "states": (nStates, sum(op[0] == "state" for op in plan)),
+                "transitions": (nTransitions, sum(op[0] != "state" for op in plan)),
+            }
+
     # # \name Abstract methods of the algorithm
     #  \anchor constraint_graph_factory_algo_callbacks
     # \{
@@ -303,20 +489,99 @@ class GraphFactoryAbstract(ABC):
 
     # # \}
 
+    def _graspKey(self, grasps):
+        """
+        Pack grasps into an integer
+        \\param grasps a handle index or None for each gripper, as in
+               \\ref graspIsAllowed.
+        \\return the number the digits of which, in base len(handles) + 1, are
+                the handle indices plus one, 0 standing for None. The first
+                gripper is the least significant digit.
+        """
+        base = len(self.handles) + 1
+        key = 0
+        for ih in reversed(grasps):
+            key = key * base + (0 if ih is None else ih + 1)
+        return key
+
+    def _graspsFromKey(self, key):
+        """
+        Unpack grasps packed by \\ref _graspKey
+        """
+        base = len(self.handles) + 1
+        grasps = list()
+        for _ in self.grippers:
+            key, ih = divmod(key, base)
+            grasps.append(None if ih == 0 else ih - 1)
+        return tuple(grasps)
+
     def _existState(self, grasps):
-        return grasps in self.states
+        return self._graspKey(grasps) in self.states
 
     def _makeState(self, grasps, priority):
-        if not self._existState(grasps):
-            state = self.makeState(grasps, priority)
-            self.states[grasps] = state
-
-            # Create loop transition
-            self.makeLoopTransition(state)
-        else:
-            state = self.states[grasps]
+        key = self._graspKey(grasps)
+        if key in self.states:
+            return self.states[key]
+        if self._plan is not None:
+            # Only record the state, see generate
+            self._plan.append(("state", key, priority))
+            self.states[key] = key
+            return key
+        state = self.makeState(grasps, priority)
+        self.states[key] = state
+
+        # Create loop transition
+        self.makeLoopTransition(state)
         return state
 
+    def _makeTransition(self, stateFrom, stateTo, ig):
+        if self._plan is not None:
+            # Only record the transition, see generate
+            self._plan.append(("transition", stateFrom, stateTo, ig))
+        elif self.transitionIsAllowed(stateFrom=stateFrom, stateTo=stateTo):
+            self.makeTransition(stateFrom, stateTo, ig)
+
+    def _reachableStates(self, plan):
+        """
+        Compute the states to keep in a plan recorded by \\ref generate
+        \\param plan list of recorded states and transitions,
+        \\return the set of keys of the states that are connected to a start
+                state and, if target states are provided, to a target state.
+        """
+        neighbors = dict()
+        for op in plan:
+            if op[0] == "state":
+                neighbors[op[1]] = list()
+            else:
+                neighbors[op[1]].append(op[2])
+                neighbors[op[2]].append(op[1])
+        # State names are only formatted if states are given by name.
+        names = None
+        if any(
+            isinstance(s, str) for s in (self.startStates + (self.targetStates or ()))
+        ):
+            names = {self._stateName(self._graspsFromKey(k)): k for k in neighbors}
+
+        def _reach(states):
+            reached = set()
+            for s in states:
+                key = names.get(s) if isinstance(s, str) else self._graspKey(s)
+                if key not in neighbors:
+                    raise ValueError(f"State {s} is not generated by the factory")
+                reached.add(key)
+            queue = list(reached)
+            while queue:
+                for n in neighbors[queue.pop()]:
+                    if n not in reached:
+                        reached.add(n)
+                        queue.append(n)
+            return reached
+
+        live = _reach(self.startStates)
+        if self.targetStates:
+            live &= _reach(self.targetStates)
+        return live
+
     def _isObjectGrasped(self, grasps, object):
         for h in self.handlesPerObjects[object]:
             if h in grasps:
@@ -392,19 +657,15 @@ class GraphFactoryAbstract(ABC):
                 ish = self.handles.index(h)
                 # nGrasp <- substitute current handle index at current gripper
                 # position.
-                nGrasps = grasps[:isg] + (ish,) + grasps[isg + 1 :]
+                nGrasps = (*grasps[:isg], ish, *grasps[isg + 1 :])
 
                 nextIsAllowed = self.graspIsAllowed(nGrasps)
                 isNewState = not self._existState(nGrasps)
                 if nextIsAllowed:
                     nnext = self._makeState(nGrasps, depth + 1)
 
-                if (
-                    isAllowed
-                    and nextIsAllowed
-                    and self.transitionIsAllowed(stateFrom=current, stateTo=nnext)
-                ):
-                    self.makeTransition(current, nnext, isg)
+                if isAllowed and nextIsAllowed:
+                    self._makeTransition(current, nnext, isg)
 
                 if isNewState:
                     self._recurse(ngrippers, nhandles, nGrasps, depth + 2)
@@ -732,10 +993,20 @@ class ConstraintGraphFactory(GraphFactoryAbstract):
     """
 
     class StateAndManifold:
-        def __init__(self, factory, grasps, id, name):
+        """
+        State created by \\ref makeState
+
+        The name of the state is formatted from its grasps when accessed,
+        unless given to the constructor.
+        """
+
+        __slots__ = ("_name", "factory", "foliation", "grasps", "id", "manifold")
+
+        def __init__(self, factory, grasps, id, name=None):
+            self.factory = factory
             self.grasps = grasps
             self.id = id
-            self.name = name
+            self._name = name
             self.manifold = Constraints()
             self.foliation = Constraints()
             # Add the grasps
@@ -751,6 +1022,12 @@ class ConstraintGraphFactory(GraphFactoryAbstract):
                         object, "placementComplement"
                     )
 
+        @property
+        def name(self):
+            if self._name is not None:
+                return self._name
+            return self.factory._stateName(self.grasps)
+
     # default distance between object and surface in preplacement configuration
     defaultPreplaceDist = 0.05
     # See methods setPreplacementDistance and getPreplacementDistance
@@ -771,6 +1048,14 @@ class ConstraintGraphFactory(GraphFactoryAbstract):
         # intersec to preplace
         self.preplaceGuide = False
 
+        # whether waypoint states defined by the same constraints are shared
+        # between transitions. See \\ref setShareWaypointStates
+        self.shareWaypointStates = False
+        # # waypoint state names indexed by the key of their constraints
+        self.waypointStates = dict()
+        # # number of waypoint states that were reused instead of created
+        self.nbSharedWaypointStates = 0
+
     # # \name Default functions
     # \{
 
@@ -778,7 +1063,7 @@ class ConstraintGraphFactory(GraphFactoryAbstract):
         # Create state
         name = self._stateName(grasps)
         nid = self.graph.createNode(name, False, priority)
-        state = ConstraintGraphFactory.StateAndManifold(self, grasps, nid, name)
+        state = ConstraintGraphFactory.StateAndManifold(self, grasps, nid)
 
         # Add the constraints
         self.graph.addConstraints(node=name, constraints=state.manifold)
@@ -806,9 +1091,10 @@ class ConstraintGraphFactory(GraphFactoryAbstract):
         st = stateTo
         # grasps = sf.grasps
         # nGrasps = st.grasps
-        names = self._transitionNames(sf, st, ig)
-        if names in self.transitions:
+        transition = (self._graspKey(sf.grasps), self._graspKey(st.grasps), ig)
+        if transition in self.transitions:
             return
+        names = self._transitionNames(sf, st, ig)
 
         # index of newly grasped handle when crossing the transition
         ih = st.grasps[ig]
@@ -862,6 +1148,12 @@ class ConstraintGraphFactory(GraphFactoryAbstract):
             crossedFoliation = True
 
         def _createWaypointState(name, constraints):
+            if self.shareWaypointStates:
+                key = constraints.key()
+                if key in self.waypointStates:
+                    self.nbSharedWaypointStates += 1
+                    return self.waypointStates[key]
+                self.waypointStates[key] = name
             self.graph.createNode(name, True)
             self.graph.addConstraints(node=name, constraints=constraints)
             return name
@@ -1033,7 +1325,7 @@ class ConstraintGraphFactory(GraphFactoryAbstract):
             self.graph.createEdge(sf.name, st.name, names[0])
             self.graph.createEdge(st.name, sf.name, names[1])
 
-        self.transitions.add(names)
+        self.transitions.add(transition)
 
     # # \}
 
@@ -1071,4 +1363,19 @@ class ConstraintGraphFactory(GraphFactoryAbstract):
     def setPreplaceGuide(self, preplaceGuide):
         self.preplaceGuide = preplaceGuide
 
+    def setShareWaypointStates(self, share):
+        """
+        Set whether waypoint states are shared between transitions
+        \\param share if True, the "_pregrasp", "_intersec" and "_preplace"
+               waypoint states are created once per set of constraints and
+               reused by all the transitions that need the same set of
+               constraints.
+
+        This reduces the number of states of the graph, and thus the time
+        spent in ConstraintGraph.initialize. The number of reused waypoint
+        states is stored in \\ref nbSharedWaypointStates.
+        \\note must be called before \\ref generate.
+        """
+        self.shareWaypointStates = share
+
     # # \}
@@ -94,6 +94,18 @@ class Constraints:
                 return False
         return True
 
+    def key(self):
+        """
+        Return a hashable object identifying the set of constraints
+
+        Two instances containing the same constraints have equal keys.
+        """
+        return (
+            frozenset(self._grasps),
+            frozenset(self._pregrasps),
+            frozenset(self._numConstraints),
+        )
+
     @property
     def grasps(self):
         return list(self._grasps)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+#
+# Copyright (c) 2026 CNRS
+#
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH
+# DAMAGE.
+
+
+class DeviceInfo:
+    """
+    Description of the manipulation device fetched in one request
+
+    Instances are built by \\link hpp.corbaserver.manipulation.robot.Robot.deviceInfo
+    Robot.deviceInfo \\endlink from the result of
+    hpp::corbaserver::manipulation::Robot::getDeviceInfo. The methods return
+    the same values as the corresponding methods of Robot and ProblemSolver,
+    without any request to the server.
+
+    Member \\c version is the value of Robot.deviceVersion when the
+    description was fetched.
+    """
+
+    def __init__(self, info, version):
+        self.version = version
+        self.robotNames = list(info.robotNames)
+        self.jointNames = list(info.jointNames)
+        self.parentJoints = list(info.parentJoints)
+        self.childJoints = {j: list() for j in self.jointNames}
+        for j, p in zip(self.jointNames, self.parentJoints):
+            if p >= 0:
+                self.childJoints[self.jointNames[p]].append(j)
+        self.grippers = self._frames(info.grippers)
+        self.handles = self._frames(info.handles)
+        self.robotContacts = self._contacts(info.robotContacts)
+        self.environmentContacts = self._contacts(info.environmentContacts)
+
+    def _frames(self, frames):
+        return {
+            f.name: (self.jointNames[f.joint], list(f.position), f.clearance)
+            for f in frames
+        }
+
+    def _contacts(self, contacts):
+        res = dict()
+        for c in contacts:
+            joints = [self.jointNames[j] for j in c.joints]
+            points = [list(c.points[i : i + 3]) for i in range(0, len(c.points), 3)]
+            res[c.name] = (joints, list(c.indexes), points)
+        return res
+
+    def getChildJoints(self, jointName):
+        """
+        Return the names of the joints below a joint in the kinematic tree
+        """
+        res = list()
+        stack = list(reversed(self.childJoints[jointName]))
+        while stack:
+            j = stack.pop()
+            res.append(j)
+            stack.extend(reversed(self.childJoints[j]))
+        return res
+
+    def getGripperPositionInJoint(self, gripperName):
+        """
+        Return the joint name in which a gripper is and the position relatively
+        to the joint
+        """
+        return tuple(self.grippers[gripperName][:2])
+
+    def getHandlePositionInJoint(self, handleName):
+        """
+        Return the joint name in which a handle is and the position relatively
+        to the joint
+        """
+        return tuple(self.handles[handleName][:2])
+
+    def getRobotContact(self, name):
+        """
+        Return the joint names, cumulative point counts and points of a
+        contact surface of the robot
+        """
+        return self.robotContacts[name]
+
+    def getEnvironmentContact(self, name):
+        """
+        Return the joint names, cumulative point counts and points of a
+        contact surface of the environment
+        """
+        return self.environmentContacts[name]
@@ -0,0 +1,247 @@
+#!/usr/bin/env python
+#
+# Copyright (c) 2026 CNRS
+#
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH
+# DAMAGE.
+
+import csv
+import json
+import re
+
+
+class GraphStructure:
+    """
+    Content of a constraint graph fetched in one request
+
+    Instances are built by \\link
+    hpp.corbaserver.manipulation.constraint_graph.ConstraintGraph.structure
+    ConstraintGraph.structure \\endlink from the result of
+    hpp::corbaserver::manipulation::Graph::getGraphStructure. They select a
+    part of the graph and write it as JSON, CSV or DOT to a stream, record by
+    record, so that large graphs are exported without temporary files and only
+    the part of interest is rendered.
+
+    Members \\c states and \\c edges map component ids to dictionaries with
+    the following keys:
+    \\li states: id, name, waypoint, constraints,
+    \\li edges: id, name, type, from, to, state, weight, short, waypoints,
+        constraints.
+    """
+
+    formats = ("json", "csv", "dot")
+    csvFields = (
+        "kind",
+        "id",
+        "name",
+        "type",
+        "waypoint",
+        "from",
+        "to",
+        "state",
+        "weight",
+        "short",
+        "waypoints",
+        "constraints",
+    )
+
+    def __init__(self, components):
+        self.name = None
+        self.constraints = list()
+        self.states = dict()
+        self.edges = dict()
+        for c in components:
+            if c.type == "Graph":
+                self.name = c.name
+                self.constraints = list(c.constraints)
+            elif c.type == "State":
+                self.states[c.id] = {
+                    "id": c.id,
+                    "name": c.name,
+                    "waypoint": c.waypoint,
+                    "constraints": list(c.constraints),
+                }
+            else:
+                self.edges[c.id] = {
+                    "id": c.id,
+                    "name": c.name,
+                    "type": c.type,
+                    "from": c.start,
+                    "to": c.end,
+                    "state": c.state,
+                    "weight": c.weight,
+                    "short": c.isShort,
+                    "waypoints": list(c.waypoints),
+                    "constraints": list(c.constraints),
+                }
+
+    def select(self, states=None, edges=None, depth=0, aggregateWaypoints=False):
+        """
+        Select a part of the graph
+        \\param states regular expression. States the name of which matches
+               are selected,
+        \\param edges regular expression. Edges the name of which matches are
+               selected, with their initial and final states,
+        \\param depth states linked to a selected state by at most depth
+               edges are selected as well, with these edges,
+        \\param aggregateWaypoints if True, the intermediate states of
+               waypoint edges and the edges that reach them are skipped, so
+               that each waypoint edge appears as one edge.
+        \\return the sorted lists of the ids of the selected states and edges.
+
+        If states and edges are both None, the whole graph is selected. Edges
+        between two selected states are always selected.
+        """
+        if aggregateWaypoints:
+            stateIds = {i for i, s in self.states.items() if not s["waypoint"]}
+            edgeIds = {
+                i
+                for i, e in self.edges.items()
+                if e["from"] in stateIds and e["to"] in stateIds
+            }
+        else:
+            stateIds = set(self.states)
+            edgeIds = set(self.edges)
+        if states is None and edges is None:
+            return sorted(stateIds), sorted(edgeIds)
+
+        selectedStates = set()
+        selectedEdges = set()
+        if states is not None:
+            pattern = re.compile(states)
+            selectedStates.update(
+                i for i in stateIds if pattern.search(self.states[i]["name"])
+            )
+        if edges is not None:
+            pattern = re.compile(edges)
+            for i in edgeIds:
+                e = self.edges[i]
+                if pattern.search(e["name"]):
+                    selectedEdges.add(i)
+                    selectedStates.update((e["from"], e["to"]))
+
+        neighbours = {i: list() for i in stateIds}
+        for i in edgeIds:
+            e = self.edges[i]
+            neighbours[e["from"]].append(i)
+            neighbours[e["to"]].append(i)
+        frontier = set(selectedStates)
+        for _ in range(depth):
+            reached = set()
+            for s in frontier:
+                for i in neighbours[s]:
+                    e = self.edges[i]
+                    reached.update((e["from"], e["to"]))
+            frontier = reached - selectedStates
+            if not frontier:
+                break
+            selectedStates.update(frontier)
+        for i in edgeIds:
+            e = self.edges[i]
+            if e["from"] in selectedStates and e["to"] in selectedStates:
+                selectedEdges.add(i)
+        return sorted(selectedStates), sorted(selectedEdges)
+
+    def write(
+        self,
+        out,
+        format="json",
+        states=None,
+        edges=None,
+        depth=0,
+        aggregateWaypoints=False,
+    ):
+        """
+        Write a part of the graph to a stream
+        \\param out a file-like object open in text mode, or a file name,
+        \\param format "json", "csv" or "dot",
+        \\param states, edges, depth, aggregateWaypoints see select.
+
+        JSON output is an object with keys "name", "constraints", "states"
+        and "edges", the latter two being lists of records. CSV output has
+        one row per state and per edge with columns csvFields, lists being
+        joined with ";". DOT output can be piped to the dot command.
+        """
+        if format not in self.formats:
+            raise ValueError(
+                "Format {} is not supported. Supported formats are {}.".format(
+                    format, ", ".join(self.formats)
+                )
+            )
+        if isinstance(out, str):
+            with open(out, "w", newline="" if format == "csv" else None) as f:
+                return self.write(f, format, states, edges, depth, aggregateWaypoints)
+        stateIds, edgeIds = self.select(states, edges, depth, aggregateWaypoints)
+        getattr(self, "_write_" + format)(out, stateIds, edgeIds)
+
+    def _write_json(self, out, stateIds, edgeIds):
+        out.write('{"name": ' + json.dumps(self.name))
+        out.write(', "constraints": ' + json.dumps(self.constraints))
+        for key, ids, records in (
+            ("states", stateIds, self.states),
+            ("edges", edgeIds, self.edges),
+        ):
+            out.write(', "' + key + '": [')
+            for k, i in enumerate(ids):
+                if k > 0:
+                    out.write(", ")
+                out.write(json.dumps(records[i]))
+            out.write("]")
+        out.write("}\n")
+
+    def _write_csv(self, out, stateIds, edgeIds):
+        writer = csv.DictWriter(out, fieldnames=self.csvFields, restval="")
+        writer.writeheader()
+        for kind, ids, records in (
+            ("state", stateIds, self.states),
+            ("edge", edgeIds, self.edges),
+        ):
+            for i in ids:
+                row = dict(records[i], kind=kind)
+                row["waypoints"] = ";".join(str(w) for w in row.get("waypoints", ()))
+                row["constraints"] = ";".join(row["constraints"])
+                writer.writerow(row)
+
+    def _write_dot(self, out, stateIds, edgeIds):
+        out.write("digraph " + json.dumps(self.name or "") + " {\n")
+        for i in stateIds:
+            s = self.states[i]
+            shape = "point" if s["waypoint"] else "ellipse"
+            out.write(
+                "  {} [label={}, shape={}];\n".format(i, json.dumps(s["name"]), shape)
+            )
+        for i in edgeIds:
+            e = self.edges[i]
+            style = "dashed" if e["type"] == "WaypointEdge" else "solid"
+            out.write(
+                "  {} -> {} [label={}, weight={}, style={}];\n".format(
+                    e["from"],
+                    e["to"],
+                    json.dumps(e["name"]),
+                    max(e["weight"], 0),
+                    style,
+                )
+            )
+        out.write("}\n")
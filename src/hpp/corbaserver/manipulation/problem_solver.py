@@ -28,6 +28,7 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH
 # DAMAGE.
 
+import time
 
 from hpp.corbaserver.problem_solver import ProblemSolver as Parent
 
@@ -54,7 +55,49 @@ class ProblemSolver(Parent):
     considered as public.
     """
 
+    cacheTimeout = 0
+    """
+    Time in seconds during which results of getAvailable are reused without
+    a request to the server. 0 disables the cache.
+    \\sa ProblemSolver.clearCache, ProblemSolver.cachedTypes
+    """
+
+    cachedTypes = frozenset(
+        (
+            "configurationshooter",
+            "configvalidation",
+            "defaultparameter",
+            "distance",
+            "pathoptimizer",
+            "pathplanner",
+            "pathprojector",
+            "pathvalidation",
+            "steeringmethod",
+        )
+    )
+    """
+    Types, in lower case, whose results of getAvailable can be cached.
+    They list the factories registered in the server, which only change
+    when a plugin is loaded. Other types, like numerical constraints,
+    grippers or handles, are always requested to the server.
+    \\sa ProblemSolver.cacheTimeout
+    """
+
+    manipulationTypes = {
+        "getAvailable": frozenset(
+            ("gripper", "handle", "robotcontact", "envcontact", "constraintgraph")
+        ),
+        "getSelected": frozenset(("constraintgraph",)),
+    }
+    """
+    Types, in lower case, handled by the manipulation server for each of
+    getAvailable and getSelected, as listed by
+    hpp::corbaserver::manipulation::Problem::getAvailable("type"). Other
+    types are handled by the basic server.
+    """
+
     def __init__(self, robot):
+        self._cache = dict()
         super().__init__(robot, hppcorbaClient=robot.client.basic)
 
     def selectProblem(self, name):
@@ -65,23 +108,52 @@ class ProblemSolver(Parent):
         \\param name the problem name.
         \\return true if a new problem was created.
         """
+        self._cache = dict()
         return self.client.manipulation.problem.selectProblem(name)
 
+    def _query(self, method, type):
+        """
+        Send method to the server that handles a type of elements
+        \\param method "getAvailable" or "getSelected".
+        \\sa ProblemSolver.manipulationTypes
+        """
+        if type.lower() in self.manipulationTypes[method]:
+            servant = self.client.manipulation.problem
+        else:
+            servant = self.client.basic.problem
+        return getattr(servant, method)(type)
+
+    def clearCache(self):
+        """
+        Forget the results of getAvailable
+
+        Call this method after loading a plugin in the server.
+        """
+        self._cache = dict()
+
     def getAvailable(self, type):
         """
         Return a list of available elements of type type
         \\param type enter "type" to know what types I know of.
                     This is case insensitive.
+
+        The request is sent to the server that knows the type, without
+        trying the other server first.
         """
         if type.lower() == "type":
             res = self.client.basic.problem.getAvailable(
                 type
             ) + self.client.manipulation.problem.getAvailable(type)
             return res
-        try:
-            return self.client.basic.problem.getAvailable(type)
-        except Exception:
-            return self.client.manipulation.problem.getAvailable(type)
+        key = type.lower()
+        if self.cacheTimeout <= 0 or key not in self.cachedTypes:
+            return self._query("getAvailable", type)
+        now = time.monotonic()
+        entry = self._cache.get(key)
+        if entry is None or now - entry[0] > self.cacheTimeout:
+            entry = (now, self._query("getAvailable", type))
+            self._cache[key] = entry
+        return list(entry[1])
 
     def getSelected(self, type):
         """
@@ -90,10 +162,7 @@ class ProblemSolver(Parent):
                     This is case insensitive.
         \\note For most of the types, the list will contain only one element.
         """
-        try:
-            return self.client.basic.problem.getSelected(type)
-        except Exception:
-            return self.client.manipulation.problem.getSelected(type)
+        return self._query("getSelected", type)
 
     # # \\name Contact surfaces
     #
@@ -225,4 +294,162 @@ class ProblemSolver(Parent):
         """
         self.client.manipulation.problem.setTargetState(stateId)
 
+    def samplePath(self, pathId, params=None, step=None):
+        """
+        Sample a path and annotate the samples with the constraint graph
+        \\param pathId index of the path,
+        \\param params list of parameters at which the path is sampled,
+        \\param step distance between two consecutive parameters, used if
+               params is not provided. The end of the path is always sampled.
+        \\return a dictionary of NumPy arrays with keys
+          \\li "params": the N parameters at which the path was sampled,
+          \\li "configs": N x configSize array of configurations,
+          \\li "edges": id of the edge that generated the path at each
+              sample, or -1,
+          \\li "states": id of the state that contains this edge, or -1,
+          \\li "ranges": M x 2 array of the begin and end parameters of the
+              intervals along which the edge does not change,
+          \\li "rangeEdges": id of the edge along each interval, or -1.
+
+        Edge and state ids can be converted to names with
+        ConstraintGraph.edges and ConstraintGraph.nodes.
+        """
+        import numpy as np
+
+        if (params is None) == (step is None):
+            raise ValueError("Exactly one of params and step should be provided")
+        if params is None:
+            params = list()
+        configs, sampledParams, edges, states, ranges, rangeEdges = (
+            self.client.manipulation.problem.samplePath(
+                pathId, [float(p) for p in params], float(step or 0)
+            )
+        )
+        sampledParams = np.array(sampledParams)
+        return {
+            "params": sampledParams,
+            "configs": np.array(configs).reshape(len(sampledParams), -1),
+            "edges": np.array(edges, dtype=int),
+            "states": np.array(states, dtype=int),
+            "ranges": np.array(ranges).reshape(-1, 2),
+            "rangeEdges": np.array(rangeEdges, dtype=int),
+        }
+
+    def postProcessPaths(
+        self,
+        pathIds,
+        optimizers=(),
+        timeParameterization=True,
+        splitAtTransitions=True,
+        nbThreads=0,
+    ):
+        """
+        Optimize and time parameterize paths on several threads
+        \\param pathIds indices of the paths,
+        \\param optimizers names of the path optimizers applied in sequence.
+               On several threads, only "Graph-*" optimizers are accepted,
+        \\param timeParameterization whether to apply the
+               "SimpleTimeParameterization" path optimizer at the end,
+        \\param splitAtTransitions whether paths are split where the edge
+               of the constraint graph changes, so that segments are processed
+               in parallel,
+        \\param nbThreads number of threads used by the server. If 0, the
+               number of cores is used.
+        \\return a dictionary with keys
+          \\li "paths": for each path, index of the processed path, or -1,
+          \\li "segments": list of dictionaries with keys "path" (rank in
+              pathIds), "edge" (edge id or -1), "optimizationTime" and
+              "parameterizationTime" (in seconds).
+        \\sa hpp::corbaserver::manipulation::Problem::postProcessPaths
+        """
+        paths, segmentPaths, segmentEdges, timings = (
+            self.client.manipulation.problem.postProcessPaths(
+                list(pathIds),
+                splitAtTransitions,
+                list(optimizers),
+                timeParameterization,
+                nbThreads,
+            )
+        )
+        segments = list()
+        for i, (path, edge) in enumerate(zip(segmentPaths, segmentEdges)):
+            segments.append(
+                {
+                    "path": path,
+                    "edge": edge,
+                    "optimizationTime": timings[2 * i],
+                    "parameterizationTime": timings[2 * i + 1],
+                }
+            )
+        return {"paths": list(paths), "segments": segments}
+
+    def startRoadmapCheckpoint(self, filename, period=60.0, nbNodes=0):
+        """
+        Log the roadmap to a file while planning
+        \\param filename name of the log file. The file is truncated,
+        \\param period time in seconds between two writings of the log.
+               If not positive, only nbNodes triggers writings,
+        \\param nbNodes number of new nodes that triggers a writing of the
+               log. If 0, only period triggers writings.
+        The current roadmap is replaced by a roadmap containing the same
+        nodes and edges. Resetting the roadmap stops logging.
+        """
+        self.client.manipulation.problem.startRoadmapCheckpoint(
+            filename, period, nbNodes
+        )
+
+    def stopRoadmapCheckpoint(self):
+        """
+        Write pending nodes and edges and stop logging the roadmap
+        """
+        self.client.manipulation.problem.stopRoadmapCheckpoint()
+
+    def loadRoadmapCheckpoint(self, filename):
+        """
+        Load a roadmap from a log written by startRoadmapCheckpoint
+        \\param filename name of the log file.
+        An incomplete record at the end of the log is ignored, so that planning
+        can resume from the log of an interrupted run. An error is raised if
+        the path of a logged edge cannot be rebuilt.
+        """
+        self.client.manipulation.problem.loadRoadmapCheckpoint(filename)
+
+    def getRoadmapArrays(self, states=()):
+        """
+        Get the roadmap as NumPy arrays
+        \\param states ids of constraint graph states. If not empty, only the
+               nodes in these states and the edges between them are returned.
+        \\return a dictionary with keys
+          \\li "configs": N x configSize array of configurations,
+          \\li "edges": M x 2 array of indices of initial and final nodes,
+          \\li "edgeIds": id of the constraint graph edge of each roadmap
+              edge, or -1,
+          \\li "states": id of the constraint graph state of each node, or -1,
+          \\li "connectedComponents": index of the connected component of
+              each node,
+          \\li "initNode": index of the initial node, or -1,
+          \\li "goalNodes": indices of the goal nodes.
+
+        Arrays are read-only views on the buffers received from the server.
+        State ids can be obtained from ConstraintGraph.nodes.
+        \\sa hpp::corbaserver::manipulation::Problem::getRoadmapArrays
+        """
+        import numpy as np
+
+        r = self.client.manipulation.problem.getRoadmapArrays([int(s) for s in states])
+        order = "<" if r.littleEndian else ">"
+
+        def _array(buffer, type, shape=(-1,)):
+            return np.frombuffer(buffer, dtype=order + type).reshape(shape)
+
+        return {
+            "configs": _array(r.configurations, "f8", (r.nbNodes, r.configSize)),
+            "edges": _array(r.edges, "i8", (r.nbEdges, 2)),
+            "edgeIds": _array(r.edgeIds, "i8"),
+            "states": _array(r.stateIds, "i4"),
+            "connectedComponents": _array(r.connectedComponents, "i4"),
+            "initNode": r.initNode,
+            "goalNodes": _array(r.goalNodes, "i8"),
+        }
+
     # # \\}
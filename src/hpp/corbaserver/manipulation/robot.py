@@ -29,6 +29,7 @@
 
 from hpp.corbaserver import Client as BasicClient
 from hpp.corbaserver.manipulation import Client as ManipulationClient
+from hpp.corbaserver.manipulation.device_info import DeviceInfo
 from hpp.corbaserver.robot import Robot as Parent
 from hpp.corbaserver.robot import StaticStabilityConstraintsFactory
 
@@ -51,6 +52,13 @@ class Robot(Parent):
     chains rooted at an anchor joint.
     """
 
+    deviceVersion = 0
+    """
+    Incremented each time the device is modified through this object.
+    \\sa Robot.deviceInfo
+    """
+    _deviceInfo = None
+
     def __init__(
         self,
         compositeName=None,
@@ -161,6 +169,56 @@ class Robot(Parent):
         self.rootJointType[robotName] = rootJointType
         self.rebuildRanks()
 
+    def insertModels(self, models, fromString=False):
+        """
+        Insert several robot models in the device with one request
+
+        \\param models list of tuples
+               (robotName, frameName, rootJointType, urdf, srdf). frameName
+               may be a frame of a model inserted before in the list,
+        \\param fromString whether urdf and srdf are XML strings instead of
+               file names.
+
+        Names, frames and files are checked by the server before inserting
+        any model. If a model fails to load, none of them is inserted. Ranks
+        are rebuilt once at the end. Compared to
+        calling insertRobotModelOnFrame for each model, this saves one
+        request and one rank rebuild per model.
+        """
+        from hpp_idl.hpp.corbaserver.manipulation import RobotModel
+
+        models = [RobotModel(*m) for m in models]
+        if self.load:
+            self.client.manipulation.robot.insertRobotModels(models, fromString)
+        for m in models:
+            self.robotNames.append(m.name)
+            self.rootJointType[m.name] = m.rootJointType
+        self.rebuildRanks()
+
+    def cloneModel(self, robotName, newNames, frameNames=None):
+        """
+        Insert copies of a robot model without parsing its files again
+
+        \\param robotName name of a robot model inserted before,
+        \\param newNames names of the copies,
+        \\param frameNames for each copy, name of the existing frame onto
+               which it is inserted. Defaults to "universe".
+
+        Grippers, handles and contact surfaces of the model are copied and
+        renamed. Collision geometries are shared with the original model.
+        Ranks are rebuilt once at the end.
+        """
+        if frameNames is None:
+            frameNames = ["universe"] * len(newNames)
+        if self.load:
+            self.client.manipulation.robot.cloneRobotModel(
+                robotName, newNames, frameNames
+            )
+        for name in newNames:
+            self.robotNames.append(name)
+            self.rootJointType[name] = self.rootJointType.get(robotName)
+        self.rebuildRanks()
+
     def insertRobotSRDFModel(self, robotName, srdfPath):
         """
         Load a SRDF for the robot. Several SRDF can thus be loaded for the same robot
@@ -171,6 +229,7 @@ class Robot(Parent):
         """
         if self.load:
             self.client.manipulation.robot.insertRobotSRDFModel(robotName, srdfPath)
+            self.invalidateDeviceInfo()
 
     def insertHumanoidModel(self, robotName, rootJointType, urdfName, srdfName):
         """
@@ -228,6 +287,43 @@ class Robot(Parent):
                 urdfName, srdfName, envName
             )
         self.rootJointType[envName] = "Anchor"
+        self.invalidateDeviceInfo()
+
+    def clearModelCache(self):
+        """
+        Remove the environment and robot models from the cache of the server
+
+        The server shares environment models loaded by loadEnvironmentModel,
+        and robot models, between problems, as long as the URDF and SRDF files
+        do not change. Clear the cache to reload models whose meshes changed.
+        """
+        self.client.manipulation.robot.clearModelCache()
+
+    def rebuildRanks(self):
+        super().rebuildRanks()
+        self.invalidateDeviceInfo()
+
+    def deviceInfo(self):
+        """
+        Return the description of the device
+
+        The joint tree, grippers, handles and contact surfaces are fetched
+        with one request and kept until the device is modified through this
+        object. Call invalidateDeviceInfo after modifying the device by other
+        means.
+        \\return a DeviceInfo instance.
+        """
+        if self._deviceInfo is None or self._deviceInfo.version != self.deviceVersion:
+            self._deviceInfo = DeviceInfo(
+                self.client.manipulation.robot.getDeviceInfo(), self.deviceVersion
+            )
+        return self._deviceInfo
+
+    def invalidateDeviceInfo(self):
+        """
+        Fetch the description of the device again at next call of deviceInfo
+        """
+        self.deviceVersion += 1
 
     # # \name Joints
     # \{
@@ -262,9 +358,11 @@ class Robot(Parent):
 
     def setHandlePositionInJoint(self, handleName, position):
         """Set handle position in joint frame"""
-        return self.client.manipulation.robot.setHandlePositionInJoint(
+        res = self.client.manipulation.robot.setHandlePositionInJoint(
             handleName, position
         )
+        self.invalidateDeviceInfo()
+        return res
 
     # # \}
 
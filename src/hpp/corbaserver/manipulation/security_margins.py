@@ -82,13 +82,14 @@ class SecurityMargins:
         self.computePossibleContacts()
 
     def computeJoints(self):
+        self.deviceInfo = self.robot.deviceInfo()
         self.robotToJoints = dict()
         for ro in self.robotsAndObjects:
             le = len(ro)
             self.robotToJoints[ro] = list(
                 filter(
                     lambda n: n[:le] == ro and n[le] in self.separators,
-                    self.robot.jointNames,
+                    self.deviceInfo.jointNames[1:],
                 )
             )
         self.robotToJoints["universe"] = ["universe"]
@@ -98,30 +99,25 @@ class SecurityMargins:
                 self.jointToRobot[j] = ro
 
     def computeGrippers(self):
-        grippers = self.ps.getAvailable("gripper")
+        info = self.deviceInfo
         self.gripperToRobot = dict()
         self.gripperToJoints = dict()
-        for g in grippers:
-            j = self.ps.robot.getGripperPositionInJoint(g)[0]
+        for g in info.grippers:
+            j = info.getGripperPositionInJoint(g)[0]
             self.gripperToRobot[g] = self.jointToRobot[j]
-            self.gripperToJoints[g] = [j, *self.ps.robot.getChildJoints(j)]
+            self.gripperToJoints[g] = [j, *info.getChildJoints(j)]
 
     def computePossibleContacts(self):
-        names = ["universe"]
-        names += self.robot.jointNames
+        info = self.deviceInfo
         # separate joint names
         self.contactSurfaces = dict()
         for k in self.robotToJoints.keys():
             self.contactSurfaces[k] = list()
         # Sort contact surfaces by object
-        surfaces = self.ps.getEnvironmentContactNames()
-        for s in surfaces:
-            contacts = self.ps.getEnvironmentContact(s)
+        for s, contacts in info.environmentContacts.items():
             joint = contacts[0][0]
             self.contactSurfaces[self.jointToRobot[joint]].append(s)
-        surfaces = self.ps.getRobotContactNames()
-        for s in surfaces:
-            contacts = self.ps.getRobotContact(s)
+        for s, contacts in info.robotContacts.items():
             joint = contacts[0][0]
             self.contactSurfaces[self.jointToRobot[joint]].append(s)
         # Compute pair of objects that can be in contact
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+#
+# Copyright (c) 2026 CNRS
+#
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH
+# DAMAGE.
+
+
+# Shared memory segments whose mapping could not be closed by
+# SharedArray.close because views of the array were still referenced.
+_unclosed = list()
+
+
+def _closeUnclosed():
+    """
+    Close the mappings left open by SharedArray.close whose views were
+    released since
+    """
+    for shm in list(_unclosed):
+        try:
+            shm.close()
+        except BufferError:
+            continue
+        _unclosed.remove(shm)
+
+
+class SharedArray:
+    """
+    Array of float64 shared with the server without copy
+
+    The array is stored in a POSIX shared memory segment and exposed as the
+    NumPy array \\c array. Bulk operations of the server such as
+    hpp::corbaserver::manipulation::Graph::getNodesShared take the
+    reference returned by \\ref ref and read or write the array in place.
+    Client and server must run on the same host. The server only maps
+    segments of /dev/shm, which is specific to Linux.
+
+    Configurations are stored one per row.
+    >>> with SharedArray((1000, robot.getConfigSize())) as configs:
+    ...     configs.array[:] = qs
+    ...     states = graph.getNodesShared(configs)
+    """
+
+    def __init__(self, shape):
+        """
+        \\param shape number of rows and number of columns.
+        """
+        from multiprocessing import shared_memory
+
+        import numpy as np
+
+        rows, cols = shape
+        self.shape = (rows, cols)
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=max(rows * cols * 8, 1)
+        )
+        # Name of the segment in /dev/shm
+        self.segment = self._shm.name.lstrip("/")
+        self.array = np.ndarray(self.shape, dtype=np.float64, buffer=self._shm.buf)
+
+    @classmethod
+    def fromArray(cls, array):
+        """
+        Create a shared array with a copy of an array
+        \\param array a 2 dimensional array, or a list of configurations.
+        """
+        import numpy as np
+
+        array = np.asarray(array, dtype=np.float64)
+        res = cls(array.shape)
+        res.array[:] = array
+        return res
+
+    def ref(self):
+        """
+        Reference to the array passed to the server
+        \\return a hpp::SharedArray structure.
+        """
+        from hpp_idl.hpp import SharedArray
+
+        return SharedArray(self.segment, 0, self.shape[0], self.shape[1])
+
+    def close(self):
+        """
+        Release the array and remove the segment
+
+        \\c array is set to None. Views of the array kept by the caller, such
+        as slices, remain readable, but are not shared with the server
+        anymore. While they are referenced, the mapping of the segment cannot
+        be closed: it is closed by a later call to close.
+        """
+        _closeUnclosed()
+        if self.array is None:
+            return
+        self.array = None
+        try:
+            self._shm.close()
+        except BufferError:
+            _unclosed.append(self._shm)
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -28,22 +28,33 @@
 
 #include "problem.impl.hh"
 
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <cstring>
 #include <hpp/constraints/convex-shape-contact.hh>
 #include <hpp/constraints/implicit.hh>
 #include <hpp/corbaserver/conversions.hh>
 #include <hpp/corbaserver/manipulation/server.hh>
 #include <hpp/corbaserver/servant-base.hh>
 #include <hpp/core/config-projector.hh>
+#include <hpp/core/constraint-set.hh>
 #include <hpp/core/distance.hh>
 #include <hpp/core/parser/roadmap.hh>
+#include <hpp/core/path-optimizer.hh>
 #include <hpp/core/path-projector.hh>
+#include <hpp/core/path-validation-report.hh>
+#include <hpp/core/path-validation.hh>
 #include <hpp/core/path-vector.hh>
+#include <hpp/core/steering-method.hh>
 #include <hpp/core/weighed-distance.hh>
 #include <hpp/manipulation/path-planner/transition-planner.hh>
 #include <hpp/manipulation/roadmap.hh>
 #include <hpp/pinocchio/gripper.hh>
 #include <hpp/pinocchio/serialization.hh>
 #include <hpp/util/debug.hh>
+#include <map>
+#include <sstream>
 #ifdef HPP_CONSTRAINTS_USE_QPOASES
 #include <hpp/constraints/qp-static-stability.hh>
 #endif
@@ -64,6 +75,9 @@
 #include "hpp/manipulation_idl/_path_planners.hh"
 #include "hpp/manipulation_idl/device-fwd.hh"
 #include "hpp/pinocchio_idl/robots-fwd.hh"
+#include "roadmap-checkpoint.hh"
+#include "roadmap-io.hh"
+#include "shared-array.hh"
 #include "tools.hh"
 
 namespace hpp {
@@ -76,6 +90,16 @@ using corbaServer::reference_to_object;
 namespace {
 typedef core::ProblemSolver CPs_t;
 
+core::PathVectorPtr_t toPathVector(const core::PathPtr_t& path) {
+  core::PathVectorPtr_t pv = HPP_DYNAMIC_PTR_CAST(core::PathVector, path);
+  if (!pv) {
+    pv = core::PathVector::create(path->outputSize(),
+                                  path->outputDerivativeSize());
+    pv->appendPath(path);
+  }
+  return pv;
+}
+
 Names_t* jointAndShapes(const JointAndShapes_t& js, intSeq_out indexes_out,
                         floatSeqSeq_out points) {
   char** nameList = Names_t::allocbuf((ULong)js.size());
@@ -198,7 +222,7 @@ Names_t* Problem::getSelected(const char* what) {
   return toNames_t(ret.begin(), ret.end());
 }
 
-void Problem::loadRoadmap(const char* filename) {
+ULong Problem::loadRoadmap(const char* filename) {
   try {
     ProblemSolverPtr_t ps(problemSolver());
     DevicePtr_t robot = getRobotOrThrow(ps);
@@ -211,10 +235,97 @@ void Problem::loadRoadmap(const char* filename) {
         hpp::serialization::remove_duplicate::vector_archive>
         archive_type;
     hpp::core::RoadmapPtr_t roadmap;
-    serializeRoadmap<archive_type>(roadmap, std::string(filename),
-                                   make_nvp(robot->name(), robot.get()),
-                                   make_nvp(g->name(), g.get()));
+    std::string fn(filename);
+    std::size_t nbDroppedEdges = 0;
+    if (isColumnarRoadmapFile(fn)) {
+      roadmap = readColumnarRoadmap(fn, robot, g, &nbDroppedEdges);
+    } else {
+      serializeRoadmap<archive_type>(roadmap, fn,
+                                     make_nvp(robot->name(), robot.get()),
+                                     make_nvp(g->name(), g.get()));
+    }
     problemSolver()->roadmap(roadmap);
+    return (ULong)nbDroppedEdges;
+  } catch (const std::exception& exc) {
+    throw hpp::Error(exc.what());
+  }
+}
+
+void Problem::startRoadmapCheckpoint(const char* filename, double period,
+                                     CORBA::ULong nbNodes) {
+  try {
+    ProblemSolverPtr_t ps(problemSolver());
+    DevicePtr_t robot = getRobotOrThrow(ps);
+    if (checkpoint_) checkpoint_->stop();
+    CheckpointRoadmapPtr_t roadmap(CheckpointRoadmap::create(
+        ps->problem()->distance(), robot, graph(), filename, period, nbNodes));
+    if (ps->roadmap()) roadmap->copy(ps->roadmap());
+    ps->roadmap(roadmap);
+    checkpoint_ = roadmap;
+  } catch (const std::exception& exc) {
+    throw hpp::Error(exc.what());
+  }
+}
+
+void Problem::stopRoadmapCheckpoint() {
+  try {
+    if (!checkpoint_) throw std::runtime_error("No roadmap is being logged.");
+    checkpoint_->stop();
+    checkpoint_.reset();
+  } catch (const std::exception& exc) {
+    throw hpp::Error(exc.what());
+  }
+}
+
+void Problem::loadRoadmapCheckpoint(const char* filename) {
+  try {
+    ProblemSolverPtr_t ps(problemSolver());
+    DevicePtr_t robot = getRobotOrThrow(ps);
+    ColumnarRoadmap columns;
+    readRoadmapCheckpoint(filename, columns);
+    ps->roadmap(buildRoadmap(columns, robot, graph()));
+  } catch (const std::exception& exc) {
+    throw hpp::Error(exc.what());
+  }
+}
+
+namespace {
+template <typename T>
+void toOctetSeq(const std::vector<T>& v,
+                hpp::corbaserver::manipulation::OctetSeq& out) {
+  out.length((ULong)(v.size() * sizeof(T)));
+  if (!v.empty()) std::memcpy(out.get_buffer(), v.data(), v.size() * sizeof(T));
+}
+}  // namespace
+
+hpp::corbaserver::manipulation::RoadmapArrays* Problem::getRoadmapArrays(
+    const intSeq& states) {
+  try {
+    core::RoadmapPtr_t roadmap(problemSolver()->roadmap());
+    if (!roadmap) throw std::runtime_error("There is no roadmap.");
+    ColumnarRoadmap columns;
+    columns.fromRoadmap(roadmap);
+    if (states.length() > 0) {
+      std::vector<int32_t> ids(states.length());
+      for (ULong i = 0; i < states.length(); ++i) ids[i] = (int32_t)states[i];
+      columns.keepStates(ids);
+    }
+
+    hpp::corbaserver::manipulation::RoadmapArrays_var res =
+        new hpp::corbaserver::manipulation::RoadmapArrays;
+    const uint16_t one = 1;
+    res->littleEndian = (*reinterpret_cast<const char*>(&one) == 1);
+    res->configSize = (ULong)columns.configSize;
+    res->nbNodes = (ULong)columns.nbNodes();
+    res->nbEdges = (ULong)columns.nbEdges();
+    toOctetSeq(columns.configurations, res->configurations);
+    toOctetSeq(columns.edges, res->edges);
+    toOctetSeq(columns.edgeIds, res->edgeIds);
+    toOctetSeq(columns.stateIds, res->stateIds);
+    toOctetSeq(columns.connectedComponents, res->connectedComponents);
+    toOctetSeq(columns.goalNodes, res->goalNodes);
+    res->initNode = (CORBA::LongLong)columns.initNode;
+    return res._retn();
   } catch (const std::exception& exc) {
     throw hpp::Error(exc.what());
   }
@@ -598,6 +709,603 @@ bool Problem::buildAndProjectPath(hpp::ID IDedge, const hpp::floatSeq& qb,
   }
 }
 
+boolSeq* Problem::buildAndProjectPaths(
+    hpp::ID IDedge, const floatSeqSeq& qbs, const floatSeqSeq& qes,
+    CORBA::Boolean storePaths, CORBA::ULong nbThreads, intSeq_out indexNotProj,
+    intSeq_out indexProj, floatSeq_out projectedRatios) {
+  try {
+    ProblemSolverPtr_t ps(problemSolver());
+    graph::EdgePtr_t edge =
+        HPP_DYNAMIC_PTR_CAST(graph::Edge, graph()->get((size_t)IDedge).lock());
+    if (!edge) HPP_THROW(Error, "ID " << IDedge << " is not an edge");
+    if (qbs.length() != qes.length()) {
+      HPP_THROW(Error, "Got " << qbs.length() << " initial configurations and "
+                              << qes.length() << " final configurations.");
+    }
+    if (!ps->problem()->manipulationSteeringMethod() ||
+        !ps->problem()->manipulationSteeringMethod()->innerSteeringMethod()) {
+      ps->initSteeringMethod();
+    }
+    if (!edge->steeringMethod())
+      throw Error("Could not initialize the steering method.");
+    DevicePtr_t robot = getRobotOrThrow(ps);
+    std::size_t n = qbs.length();
+    std::vector<Configuration_t> q1s(n), q2s(n);
+    for (std::size_t i = 0; i < n; ++i) {
+      q1s[i] = floatSeqToConfig(robot, qbs[(CORBA::ULong)i], true);
+      q2s[i] = floatSeqToConfig(robot, qes[(CORBA::ULong)i], true);
+    }
+
+    // Each thread uses its own steering method, with its own constraints,
+    // and its own path projector. Waypoint edges build paths with their
+    // inner edges and are thus called sequentially.
+    std::size_t nbWorkers = numberOfThreads(nbThreads, n);
+    if (robot->numberDeviceData() < nbWorkers)
+      robot->numberDeviceData(nbWorkers);
+    if (!ps->problem()->pathProjector()) ps->initPathProjector();
+    value_type tolerance;
+    std::string projectorType(ps->pathProjectorType(tolerance));
+    bool sequentialBuild =
+        (bool)HPP_DYNAMIC_PTR_CAST(graph::WaypointEdge, edge);
+    std::vector<core::SteeringMethodPtr_t> steeringMethods(nbWorkers);
+    std::vector<PathProjectorPtr_t> pathProjectors(nbWorkers);
+    for (std::size_t w = 0; w < nbWorkers; ++w) {
+      if (!sequentialBuild) steeringMethods[w] = edge->steeringMethod()->copy();
+      if (ps->problem()->pathProjector()) {
+        pathProjectors[w] =
+            ps->pathProjectors.get(projectorType)(ps->problem(), tolerance);
+      }
+    }
+
+    std::vector<core::PathPtr_t> paths(n), projPaths(n);
+    std::vector<char> success(n, false);
+    std::mutex buildMutex;
+    parallelFor(n, nbWorkers, [&](std::size_t i, std::size_t w) {
+      core::PathPtr_t path;
+      if (sequentialBuild) {
+        std::lock_guard<std::mutex> lock(buildMutex);
+        if (!edge->build(path, q1s[i], q2s[i])) return;
+      } else {
+        // Same as graph::Edge::build with the steering method of the thread
+        core::ConstraintSetPtr_t constraints(steeringMethods[w]->constraints());
+        if (constraints) {
+          if (constraints->configProjector())
+            constraints->configProjector()->rightHandSideFromConfig(q1s[i]);
+          if (!constraints->isSatisfied(q1s[i]) ||
+              !constraints->isSatisfied(q2s[i]))
+            return;
+        }
+        path = (*steeringMethods[w])(q1s[i], q2s[i]);
+        if (!path) return;
+      }
+      paths[i] = path;
+      if (pathProjectors[w]) {
+        success[i] = pathProjectors[w]->apply(path, projPaths[i]);
+      } else {
+        success[i] = true;
+        projPaths[i] = path->copy();
+      }
+    });
+
+    boolSeq_var _success = new boolSeq();
+    intSeq_var _indexNotProj = new intSeq(), _indexProj = new intSeq();
+    floatSeq_var ratios = new floatSeq();
+    _success->length((CORBA::ULong)n);
+    _indexNotProj->length((CORBA::ULong)n);
+    _indexProj->length((CORBA::ULong)n);
+    ratios->length((CORBA::ULong)n);
+    for (std::size_t i = 0; i < n; ++i) {
+      CORBA::ULong k = (CORBA::ULong)i;
+      _success[k] = (bool)success[i];
+      _indexNotProj[k] = -1;
+      _indexProj[k] = -1;
+      ratios[k] = 0;
+      if (!paths[i]) {
+        _success[k] = false;
+        continue;
+      }
+      bool projected =
+          success[i] || (projPaths[i] && projPaths[i]->length() > 0);
+      if (success[i])
+        ratios[k] = 1;
+      else if (projected && paths[i]->length() > 0)
+        ratios[k] = projPaths[i]->length() / paths[i]->length();
+      if (!storePaths) continue;
+      _indexNotProj[k] = (CORBA::Long)ps->paths().size();
+      ps->addPath(toPathVector(paths[i]));
+      if (!projected) continue;
+      _indexProj[k] = (CORBA::Long)ps->paths().size();
+      ps->addPath(toPathVector(projPaths[i]));
+    }
+    indexNotProj = _indexNotProj._retn();
+    indexProj = _indexProj._retn();
+    projectedRatios = ratios._retn();
+    return _success._retn();
+  } catch (const std::exception& exc) {
+    throw hpp::Error(exc.what());
+  }
+}
+
+intSeq* Problem::planTransitions(
+    const hpp::corbaserver::manipulation::TransitionQueries& queries,
+    Double timeOut, CORBA::Boolean shareRoadmaps, ULong nbThreads,
+    Names_t_out statuses) {
+  using pathPlanner::TransitionPlanner;
+  using pathPlanner::TransitionPlannerPtr_t;
+  try {
+    ProblemSolverPtr_t ps(problemSolver());
+    DevicePtr_t robot = getRobotOrThrow(ps);
+    graph::GraphPtr_t g(graph());
+    std::size_t n = queries.length();
+    std::vector<Configuration_t> qInits(n);
+    std::vector<matrix_t> qGoals(n);
+    std::vector<graph::EdgePtr_t> edges(n);
+    // Queries are grouped by edge, in the order of the queries.
+    std::vector<std::vector<std::size_t> > groups;
+    std::map<graph::EdgePtr_t, std::size_t> groupOfEdge;
+    for (std::size_t i = 0; i < n; ++i) {
+      const hpp::corbaserver::manipulation::TransitionQuery& query(
+          queries[(ULong)i]);
+      graph::EdgePtr_t edge =
+          HPP_DYNAMIC_PTR_CAST(graph::Edge, g->get((size_t)query.edge).lock());
+      if (!edge) HPP_THROW(Error, "ID " << query.edge << " is not an edge");
+      edges[i] = edge;
+      qInits[i] = floatSeqToConfig(robot, query.qInit, true);
+      qGoals[i].resize(query.qGoals.length(), robot->configSize());
+      for (ULong j = 0; j < query.qGoals.length(); ++j)
+        qGoals[i].row(j) = floatSeqToConfig(robot, query.qGoals[j], true);
+      std::map<graph::EdgePtr_t, std::size_t>::const_iterator it(
+          groupOfEdge.find(edge));
+      if (it == groupOfEdge.end()) {
+        it = groupOfEdge.insert(std::make_pair(edge, groups.size())).first;
+        groups.push_back(std::vector<std::size_t>());
+      }
+      groups[it->second].push_back(i);
+    }
+    // A task is a list of queries solved in order by one worker. Queries
+    // sharing roadmaps and queries along waypoint edges, that build paths
+    // with the steering methods of their inner edges, are solved in order.
+    // Other queries are solved independently.
+    std::vector<std::vector<std::size_t> > tasks;
+    for (std::size_t k = 0; k < groups.size(); ++k) {
+      if (shareRoadmaps ||
+          HPP_DYNAMIC_PTR_CAST(graph::WaypointEdge, edges[groups[k][0]])) {
+        tasks.push_back(groups[k]);
+      } else {
+        for (std::size_t j = 0; j < groups[k].size(); ++j)
+          tasks.push_back(std::vector<std::size_t>(1, groups[k][j]));
+      }
+    }
+
+    // Each worker has its own transition planner, hence its own inner
+    // problem, in which the steering method of the edge, with its
+    // constraints, and the path projector are replaced by copies, as in
+    // buildAndProjectPaths.
+    std::size_t nbWorkers = numberOfThreads(nbThreads, tasks.size());
+    if (robot->numberDeviceData() < nbWorkers)
+      robot->numberDeviceData(nbWorkers);
+    value_type tolerance;
+    std::string projectorType(ps->pathProjectorType(tolerance));
+    bool projection = (bool)ps->problem()->pathProjector();
+    std::vector<TransitionPlannerPtr_t> planners(nbWorkers);
+    std::vector<PathProjectorPtr_t> pathProjectors(nbWorkers);
+    std::vector<graph::EdgePtr_t> plannerEdges(nbWorkers);
+    for (std::size_t w = 0; w < nbWorkers; ++w) {
+      core::DistancePtr_t dist(core::WeighedDistance::create(robot));
+      planners[w] = TransitionPlanner::createWithRoadmap(
+          ps->problem(), core::Roadmap::create(dist, robot));
+      if (timeOut > 0) {
+        planners[w]->timeOut(timeOut);
+        planners[w]->innerPlanner()->timeOut(timeOut);
+      }
+      if (projection) {
+        pathProjectors[w] =
+            ps->pathProjectors.get(projectorType)(ps->problem(), tolerance);
+      }
+    }
+
+    std::vector<core::PathVectorPtr_t> paths(n);
+    std::vector<std::string> status(n);
+    parallelFor(tasks.size(), nbWorkers, [&](std::size_t k, std::size_t w) {
+      const std::vector<std::size_t>& task(tasks[k]);
+      const TransitionPlannerPtr_t& planner(planners[w]);
+      const graph::EdgePtr_t& edge(edges[task[0]]);
+      if (plannerEdges[w] != edge) {
+        planner->setEdge(edge->id());
+        core::ProblemPtr_t problem(planner->innerProblem());
+        if (!HPP_DYNAMIC_PTR_CAST(graph::WaypointEdge, edge) &&
+            edge->steeringMethod()) {
+          core::SteeringMethodPtr_t sm(edge->steeringMethod()->copy());
+          problem->steeringMethod(sm);
+          problem->constraints(sm->constraints());
+        }
+        if (pathProjectors[w]) problem->pathProjector(pathProjectors[w]);
+        plannerEdges[w] = edge;
+      }
+      core::ConfigProjectorPtr_t projector;
+      if (planner->innerProblem()->constraints())
+        projector = planner->innerProblem()->constraints()->configProjector();
+      vector_t rhs, previousRhs;
+      for (std::size_t j = 0; j < task.size(); ++j) {
+        std::size_t i = task[j];
+        // The roadmap is only valid in the leaf of the previous query.
+        bool reset = !shareRoadmaps || j == 0;
+        if (shareRoadmaps && projector) {
+          projector->rightHandSideFromConfig(qInits[i]);
+          rhs = projector->rightHandSide();
+          if (j > 0 && !rhs.isApprox(previousRhs)) reset = true;
+          previousRhs = rhs;
+        }
+        try {
+          paths[i] = planner->planPath(qInits[i], qGoals[i], reset);
+          if (!paths[i]) status[i] = "No path found.";
+        } catch (const std::exception& exc) {
+          status[i] = exc.what();
+          paths[i].reset();
+        }
+      }
+    });
+
+    intSeq_var indexes = new intSeq();
+    indexes->length((ULong)n);
+    Names_t_var _statuses = new Names_t();
+    _statuses->length((ULong)n);
+    for (std::size_t i = 0; i < n; ++i) {
+      indexes[(ULong)i] = -1;
+      _statuses[(ULong)i] = status[i].c_str();
+      if (!paths[i]) continue;
+      indexes[(ULong)i] = (CORBA::Long)ps->paths().size();
+      ps->addPath(paths[i]);
+    }
+    statuses = _statuses._retn();
+    return indexes._retn();
+  } catch (const std::exception& exc) {
+    throw hpp::Error(exc.what());
+  }
+}
+
+boolSeq* Problem::directPaths(hpp::ID IDedge, const floatSeqSeq& q1s,
+                              const floatSeqSeq& q2s, CORBA::Boolean validate,
+                              ULong nbThreads, intSeq_out pathIds,
+                              Names_t_out statuses) {
+  try {
+    ProblemSolverPtr_t ps(problemSolver());
+    graph::EdgePtr_t edge =
+        HPP_DYNAMIC_PTR_CAST(graph::Edge, graph()->get((size_t)IDedge).lock());
+    if (!edge) HPP_THROW(Error, "ID " << IDedge << " is not an edge");
+    if (q1s.length() != q2s.length()) {
+      HPP_THROW(Error, "Got " << q1s.length() << " initial configurations and "
+                              << q2s.length() << " final configurations.");
+    }
+    if (!ps->problem()->manipulationSteeringMethod() ||
+        !ps->problem()->manipulationSteeringMethod()->innerSteeringMethod()) {
+      ps->initSteeringMethod();
+    }
+    if (!edge->steeringMethod())
+      throw Error("Could not initialize the steering method.");
+    DevicePtr_t robot = getRobotOrThrow(ps);
+    std::size_t n = q1s.length();
+    std::vector<Configuration_t> qs1(n), qs2(n);
+    for (std::size_t i = 0; i < n; ++i) {
+      qs1[i] = floatSeqToConfig(robot, q1s[(ULong)i], true);
+      qs2[i] = floatSeqToConfig(robot, q2s[(ULong)i], true);
+    }
+
+    // As in buildAndProjectPaths, each thread has its own steering method
+    // and path projector. Path validations are thread safe.
+    std::size_t nbWorkers = numberOfThreads(nbThreads, n);
+    if (robot->numberDeviceData() < nbWorkers)
+      robot->numberDeviceData(nbWorkers);
+    if (!ps->problem()->pathProjector()) ps->initPathProjector();
+    value_type tolerance;
+    std::string projectorType(ps->pathProjectorType(tolerance));
+    bool sequentialBuild =
+        (bool)HPP_DYNAMIC_PTR_CAST(graph::WaypointEdge, edge);
+    std::vector<core::SteeringMethodPtr_t> steeringMethods(nbWorkers);
+    std::vector<PathProjectorPtr_t> pathProjectors(nbWorkers);
+    for (std::size_t w = 0; w < nbWorkers; ++w) {
+      if (!sequentialBuild) steeringMethods[w] = edge->steeringMethod()->copy();
+      if (ps->problem()->pathProjector()) {
+        pathProjectors[w] =
+            ps->pathProjectors.get(projectorType)(ps->problem(), tolerance);
+      }
+    }
+    core::PathValidationPtr_t pathValidation(edge->pathValidation());
+
+    std::vector<core::PathPtr_t> paths(n);
+    std::vector<std::string> status(n);
+    std::mutex buildMutex;
+    parallelFor(n, nbWorkers, [&](std::size_t i, std::size_t w) {
+      core::PathPtr_t path;
+      if (sequentialBuild) {
+        std::lock_guard<std::mutex> lock(buildMutex);
+        if (!edge->build(path, qs1[i], qs2[i])) {
+          status[i] = "Failed to build the path.";
+          return;
+        }
+      } else {
+        core::ConstraintSetPtr_t constraints(steeringMethods[w]->constraints());
+        if (constraints) {
+          if (constraints->configProjector())
+            constraints->configProjector()->rightHandSideFromConfig(qs1[i]);
+          if (!constraints->isSatisfied(qs1[i])) {
+            status[i] = "q1 does not satisfy the constraints of the edge.";
+            return;
+          }
+          if (!constraints->isSatisfied(qs2[i])) {
+            status[i] = "q2 does not satisfy the constraints of the edge.";
+            return;
+          }
+        }
+        path = (*steeringMethods[w])(qs1[i], qs2[i]);
+        if (!path) {
+          status[i] = "The steering method failed.";
+          return;
+        }
+      }
+      if (pathProjectors[w]) {
+        core::PathPtr_t projected;
+        if (!pathProjectors[w]->apply(path, projected)) {
+          status[i] = "Failed to project the path.";
+          return;
+        }
+        path = projected;
+      }
+      if (validate && pathValidation) {
+        core::PathPtr_t validPart;
+        core::PathValidationReportPtr_t report;
+        if (!pathValidation->validate(path, false, validPart, report)) {
+          std::ostringstream oss;
+          if (report) oss << *report;
+          status[i] = oss.str();
+          if (status[i].empty()) status[i] = "The path is not valid.";
+          return;
+        }
+      }
+      paths[i] = path;
+    });
+
+    boolSeq_var success = new boolSeq();
+    intSeq_var ids = new intSeq();
+    Names_t_var _statuses = new Names_t();
+    success->length((ULong)n);
+    ids->length((ULong)n);
+    _statuses->length((ULong)n);
+    for (std::size_t i = 0; i < n; ++i) {
+      success[(ULong)i] = (bool)paths[i];
+      ids[(ULong)i] = -1;
+      _statuses[(ULong)i] = status[i].c_str();
+      if (!paths[i]) continue;
+      ids[(ULong)i] = (CORBA::Long)ps->paths().size();
+      ps->addPath(toPathVector(paths[i]));
+    }
+    pathIds = ids._retn();
+    statuses = _statuses._retn();
+    return success._retn();
+  } catch (const std::exception& exc) {
+    throw hpp::Error(exc.what());
+  }
+}
+
+boolSeq* Problem::validateConfigurations(hpp::ID IDedge,
+                                         const floatSeqSeq& configs,
+                                         ULong nbThreads, Names_t_out reports) {
+  try {
+    DevicePtr_t robot = getRobotOrThrow(problemSolver());
+    matrix_t qs(robot->configSize(), configs.length());
+    for (ULong i = 0; i < configs.length(); ++i)
+      qs.col(i) = floatSeqToConfig(robot, configs[i], true);
+    return validateConfigurationMatrix(IDedge, qs, nbThreads, reports);
+  } catch (const std::exception& exc) {
+    throw hpp::Error(exc.what());
+  }
+}
+
+boolSeq* Problem::validateConfigurationsShared(hpp::ID IDedge,
+                                               const hpp::SharedArray& configs,
+                                               ULong nbThreads,
+                                               Names_t_out reports) {
+  try {
+    DevicePtr_t robot = getRobotOrThrow(problemSolver());
+    SharedArrayMapping qs(configs, configs.rows, robot->configSize(), false);
+    return validateConfigurationMatrix(IDedge, qs.matrix(), nbThreads, reports);
+  } catch (const std::exception& exc) {
+    throw hpp::Error(exc.what());
+  }
+}
+
+boolSeq* Problem::validateConfigurationMatrix(
+    hpp::ID IDedge, const Eigen::Ref<const matrix_t>& configs, ULong nbThreads,
+    Names_t_out reports) {
+  try {
+    ProblemSolverPtr_t ps(problemSolver());
+    graph::EdgePtr_t edge =
+        HPP_DYNAMIC_PTR_CAST(graph::Edge, graph()->get((size_t)IDedge).lock());
+    if (!edge) HPP_THROW(Error, "ID " << IDedge << " is not an edge");
+    core::PathValidationPtr_t pathValidation(edge->pathValidation());
+    if (!pathValidation)
+      HPP_THROW(Error, "Edge " << edge->name() << " has no path validation.");
+    DevicePtr_t robot = getRobotOrThrow(ps);
+    std::size_t n = (std::size_t)configs.cols();
+
+    std::size_t nbWorkers = numberOfThreads(nbThreads, n);
+    if (robot->numberDeviceData() < nbWorkers)
+      robot->numberDeviceData(nbWorkers);
+    std::vector<char> valid(n, false);
+    std::vector<std::string> report(n);
+    parallelFor(n, nbWorkers, [&](std::size_t i, std::size_t) {
+      core::ValidationReportPtr_t vr;
+      valid[i] = pathValidation->validate(configs.col(i), vr);
+      if (vr) {
+        std::ostringstream oss;
+        oss << *vr;
+        report[i] = oss.str();
+      }
+    });
+
+    boolSeq_var res = new boolSeq();
+    Names_t_var _reports = new Names_t();
+    res->length((ULong)n);
+    _reports->length((ULong)n);
+    for (std::size_t i = 0; i < n; ++i) {
+      res[(ULong)i] = (bool)valid[i];
+      _reports[(ULong)i] = report[i].c_str();
+    }
+    reports = _reports._retn();
+    return res._retn();
+  } catch (const std::exception& exc) {
+    throw hpp::Error(exc.what());
+  }
+}
+
+intSeq* Problem::postProcessPaths(const intSeq& pathIds,
+                                  CORBA::Boolean splitAtTransitions,
+                                  const Names_t& optimizers,
+                                  CORBA::Boolean timeParameterization,
+                                  ULong nbThreads, intSeq_out segmentPaths,
+                                  intSeq_out segmentEdges,
+                                  floatSeq_out timings) {
+  struct Segment {
+    std::size_t path;
+    graph::EdgePtr_t edge;
+    core::PathVectorPtr_t input, output;
+    value_type optimizationTime, parameterizationTime;
+  };
+  typedef std::chrono::steady_clock clock;
+  try {
+    ProblemSolverPtr_t ps(problemSolver());
+    std::vector<std::string> optimizerTypes(
+        corbaServer::toStrings<std::vector<std::string> >(optimizers));
+    const std::string parameterizationType("SimpleTimeParameterization");
+    for (std::size_t i = 0; i < optimizerTypes.size(); ++i)
+      if (!ps->pathOptimizers.has(optimizerTypes[i]))
+        HPP_THROW(Error, "Unknown path optimizer " << optimizerTypes[i]);
+    if (timeParameterization && !ps->pathOptimizers.has(parameterizationType))
+      HPP_THROW(Error, "Unknown path optimizer " << parameterizationType);
+
+    std::vector<Segment> segments;
+    std::size_t nbPaths = pathIds.length();
+    for (std::size_t i = 0; i < nbPaths; ++i) {
+      CORBA::Long pathId = pathIds[(ULong)i];
+      if (pathId < 0 || (std::size_t)pathId >= ps->paths().size()) {
+        HPP_THROW(Error, "Wrong path id: " << pathId << ", number path: "
+                                           << ps->paths().size() << ".");
+      }
+      core::PathVectorPtr_t path = ps->paths()[pathId];
+      core::PathVectorPtr_t flat = core::PathVector::create(
+          path->outputSize(), path->outputDerivativeSize());
+      path->flatten(flat);
+      // Split where the edge changes. Without splitting, the edge of a
+      // segment is only kept if it is the same along the whole path.
+      for (std::size_t r = 0; r < flat->numberPaths(); ++r) {
+        core::PathPtr_t p = flat->pathAtRank(r);
+        ConstraintSetPtr_t constraint =
+            HPP_DYNAMIC_PTR_CAST(ConstraintSet, p->constraints());
+        graph::EdgePtr_t edge;
+        if (constraint) edge = constraint->edge();
+        if (r == 0 || (splitAtTransitions && edge != segments.back().edge)) {
+          Segment segment;
+          segment.path = i;
+          segment.edge = edge;
+          segment.input = core::PathVector::create(
+              path->outputSize(), path->outputDerivativeSize());
+          segment.optimizationTime = segment.parameterizationTime = 0;
+          segments.push_back(segment);
+        } else if (edge != segments.back().edge) {
+          segments.back().edge.reset();
+        }
+        segments.back().input->appendPath(p);
+      }
+    }
+
+    // Path optimizers build paths with the steering methods of the edges.
+    // Segments along the same edge are thus processed by the same task.
+    std::vector<std::vector<std::size_t> > groups;
+    std::map<graph::EdgePtr_t, std::size_t> groupOfEdge;
+    for (std::size_t s = 0; s < segments.size(); ++s) {
+      std::map<graph::EdgePtr_t, std::size_t>::const_iterator it(
+          groupOfEdge.find(segments[s].edge));
+      if (it == groupOfEdge.end()) {
+        it = groupOfEdge.insert(std::make_pair(segments[s].edge, groups.size()))
+                 .first;
+        groups.push_back(std::vector<std::size_t>());
+      }
+      groups[it->second].push_back(s);
+    }
+
+    DevicePtr_t robot = getRobotOrThrow(ps);
+    std::size_t nbWorkers = numberOfThreads(nbThreads, groups.size());
+    // Other optimizers validate paths with the constraint graph, which
+    // evaluates the constraints of states shared by all the edges.
+    for (std::size_t o = 0; nbWorkers > 1 && o < optimizerTypes.size(); ++o)
+      if (optimizerTypes[o].compare(0, 6, "Graph-") != 0)
+        HPP_THROW(Error, "Path optimizer "
+                             << optimizerTypes[o]
+                             << " cannot run on several threads. Use a Graph-* "
+                                "optimizer or set nbThreads to 1.");
+    if (robot->numberDeviceData() < nbWorkers)
+      robot->numberDeviceData(nbWorkers);
+    parallelFor(groups.size(), nbWorkers, [&](std::size_t k, std::size_t) {
+      for (std::size_t j = 0; j < groups[k].size(); ++j) {
+        Segment& segment(segments[groups[k][j]]);
+        core::PathVectorPtr_t path(segment.input);
+        clock::time_point start(clock::now());
+        for (std::size_t o = 0; o < optimizerTypes.size(); ++o)
+          path = ps->pathOptimizers.get(optimizerTypes[o])(ps->problem())
+                     ->optimize(path);
+        clock::time_point end(clock::now());
+        segment.optimizationTime =
+            std::chrono::duration<value_type>(end - start).count();
+        if (timeParameterization) {
+          path = ps->pathOptimizers.get(parameterizationType)(ps->problem())
+                     ->optimize(path);
+          segment.parameterizationTime =
+              std::chrono::duration<value_type>(clock::now() - end).count();
+        }
+        segment.output = path;
+      }
+    });
+
+    std::vector<core::PathVectorPtr_t> results(nbPaths);
+    for (std::size_t s = 0; s < segments.size(); ++s) {
+      core::PathVectorPtr_t& result(results[segments[s].path]);
+      if (!result) {
+        result = core::PathVector::create(
+            segments[s].output->outputSize(),
+            segments[s].output->outputDerivativeSize());
+      }
+      result->concatenate(segments[s].output);
+    }
+
+    intSeq_var res = new intSeq();
+    res->length((ULong)nbPaths);
+    for (std::size_t i = 0; i < nbPaths; ++i) {
+      res[(ULong)i] = -1;
+      if (!results[i]) continue;
+      res[(ULong)i] = (CORBA::Long)ps->paths().size();
+      ps->addPath(results[i]);
+    }
+    intSeq_var _segmentPaths = new intSeq(), _segmentEdges = new intSeq();
+    floatSeq_var _timings = new floatSeq();
+    _segmentPaths->length((ULong)segments.size());
+    _segmentEdges->length((ULong)segments.size());
+    _timings->length((ULong)(2 * segments.size()));
+    for (std::size_t s = 0; s < segments.size(); ++s) {
+      _segmentPaths[(ULong)s] = (CORBA::Long)segments[s].path;
+      _segmentEdges[(ULong)s] =
+          segments[s].edge ? (CORBA::Long)segments[s].edge->id() : -1;
+      _timings[(ULong)(2 * s)] = segments[s].optimizationTime;
+      _timings[(ULong)(2 * s + 1)] = segments[s].parameterizationTime;
+    }
+    segmentPaths = _segmentPaths._retn();
+    segmentEdges = _segmentEdges._retn();
+    timings = _timings._retn();
+    return res._retn();
+  } catch (const std::exception& exc) {
+    throw hpp::Error(exc.what());
+  }
+}
+
 void Problem::setTargetState(hpp::ID IDstate) {
   try {
     graph::GraphComponentPtr_t comp = graph()->get((size_t)IDstate).lock();
@@ -647,6 +1355,107 @@ ID Problem::edgeAtParam(ULong pathId, Double param, String_out name) {
   }
 }
 
+floatSeq* Problem::samplePath(ULong pathId, const floatSeq& params, Double step,
+                              floatSeq_out sampledParams, intSeq_out edgeIds,
+                              intSeq_out stateIds, floatSeq_out ranges,
+                              intSeq_out rangeEdgeIds) {
+  try {
+    ProblemSolverPtr_t ps(problemSolver());
+    if (pathId >= ps->paths().size()) {
+      HPP_THROW(Error, "Wrong path id: " << pathId << ", number path: "
+                                         << ps->paths().size() << ".");
+    }
+    core::PathVectorPtr_t path = ps->paths()[pathId];
+    core::PathVectorPtr_t flat = core::PathVector::create(
+        path->outputSize(), path->outputDerivativeSize());
+    path->flatten(flat);
+    std::size_t nbPaths = flat->numberPaths();
+    if (nbPaths == 0) HPP_THROW(Error, "Path " << pathId << " is empty.");
+    const core::interval_t& timeRange = flat->timeRange();
+
+    // Edge and state of each elementary path and parameter at which it ends.
+    std::vector<CORBA::Long> rankEdges(nbPaths, -1), rankStates(nbPaths, -1);
+    std::vector<value_type> rankEnds(nbPaths);
+    value_type t = timeRange.first;
+    for (std::size_t r = 0; r < nbPaths; ++r) {
+      core::PathPtr_t p = flat->pathAtRank(r);
+      t += p->length();
+      rankEnds[r] = t;
+      ConstraintSetPtr_t constraint =
+          HPP_DYNAMIC_PTR_CAST(ConstraintSet, p->constraints());
+      if (constraint && constraint->edge()) {
+        rankEdges[r] = (CORBA::Long)constraint->edge()->id();
+        if (constraint->edge()->state())
+          rankStates[r] = (CORBA::Long)constraint->edge()->state()->id();
+      }
+    }
+    rankEnds.back() = timeRange.second;
+
+    // Maximal intervals along which the edge does not change.
+    std::vector<value_type> _ranges;
+    std::vector<CORBA::Long> _rangeEdgeIds;
+    value_type begin = timeRange.first;
+    for (std::size_t r = 0; r < nbPaths; ++r) {
+      if (r + 1 == nbPaths || rankEdges[r + 1] != rankEdges[r]) {
+        _ranges.push_back(begin);
+        _ranges.push_back(rankEnds[r]);
+        _rangeEdgeIds.push_back(rankEdges[r]);
+        begin = rankEnds[r];
+      }
+    }
+
+    std::vector<value_type> _params;
+    if (params.length() > 0) {
+      _params.assign(params.get_buffer(),
+                     params.get_buffer() + params.length());
+    } else {
+      if (step <= 0) HPP_THROW(Error, "Step should be positive.");
+      std::size_t nbSteps =
+          (std::size_t)std::ceil((timeRange.second - timeRange.first) / step);
+      for (std::size_t i = 0; i < nbSteps; ++i)
+        _params.push_back(timeRange.first + (value_type)i * step);
+      _params.push_back(timeRange.second);
+    }
+
+    size_type size = flat->outputSize();
+    floatSeq_var configs = new floatSeq();
+    configs->length((CORBA::ULong)(_params.size() * size));
+    intSeq_var _edgeIds = new intSeq(), _stateIds = new intSeq();
+    _edgeIds->length((CORBA::ULong)_params.size());
+    _stateIds->length((CORBA::ULong)_params.size());
+    for (std::size_t i = 0; i < _params.size(); ++i) {
+      value_type param = _params[i];
+      if (param < timeRange.first || param > timeRange.second) {
+        HPP_THROW(Error, "Parameter " << param << " out of range ["
+                                      << timeRange.first << ", "
+                                      << timeRange.second << "].");
+      }
+      Eigen::Map<vector_t> q(configs->get_buffer() + i * size, size);
+      if (!(*flat)(q, param)) {
+        HPP_THROW(Error, "Failed to apply constraints at param " << param);
+      }
+      std::size_t r =
+          std::min((std::size_t)(std::lower_bound(rankEnds.begin(),
+                                                  rankEnds.end(), param) -
+                                 rankEnds.begin()),
+                   nbPaths - 1);
+      _edgeIds[(CORBA::ULong)i] = rankEdges[r];
+      _stateIds[(CORBA::ULong)i] = rankStates[r];
+    }
+
+    sampledParams = vectorToFloatSeq(
+        Eigen::Map<const vector_t>(_params.data(), _params.size()));
+    edgeIds = _edgeIds._retn();
+    stateIds = _stateIds._retn();
+    ranges = vectorToFloatSeq(
+        Eigen::Map<const vector_t>(_ranges.data(), _ranges.size()));
+    rangeEdgeIds = toIntSeq(_rangeEdgeIds.begin(), _rangeEdgeIds.end());
+    return configs._retn();
+  } catch (const std::exception& exc) {
+    throw hpp::Error(exc.what());
+  }
+}
+
 manipulation_idl::graph_idl::Validation_ptr Problem::createGraphValidation() {
   core::ProblemSolverPtr_t ps = problemSolver();
   graph::ValidationPtr_t validation(new graph::Validation(ps->problem()));
@@ -659,6 +1468,60 @@ manipulation_idl::graph_idl::Validation_ptr Problem::createGraphValidation() {
   return validation_idl._retn();
 }
 
+void Problem::startGraphValidation(ULong nbThreads) {
+  try {
+    graphValidation_.reset();
+    graphValidation_.reset(
+        new GraphValidationJob(problemSolver()->problem(), graph(), nbThreads));
+  } catch (const std::exception& exc) {
+    throw hpp::Error(exc.what());
+  }
+}
+
+hpp::corbaserver::manipulation::ValidationResults*
+Problem::getGraphValidationResults(double timeout,
+                                   CORBA::Boolean_out finished) {
+  using hpp::corbaserver::manipulation::ValidationResults;
+  try {
+    if (!graphValidation_)
+      throw std::runtime_error("No graph validation was started.");
+    bool f;
+    std::vector<GraphValidationJob::Result> results(
+        graphValidation_->results(timeout, f));
+    finished = f;
+    ValidationResults* res = new ValidationResults();
+    res->length((ULong)results.size());
+    for (std::size_t i = 0; i < results.size(); ++i) {
+      const GraphValidationJob::Result& r(results[i]);
+      (*res)[(ULong)i].component = (hpp::ID)r.component;
+      (*res)[(ULong)i].error = r.error;
+      (*res)[(ULong)i].warning = r.warning;
+      (*res)[(ULong)i].report = r.report.c_str();
+      stringSeqSeq& collisions((*res)[(ULong)i].collisions);
+      collisions.length((ULong)r.collisions.size());
+      for (std::size_t j = 0; j < r.collisions.size(); ++j) {
+        collisions[(ULong)j].length((ULong)r.collisions[j].size());
+        for (std::size_t k = 0; k < r.collisions[j].size(); ++k)
+          collisions[(ULong)j][(ULong)k] = r.collisions[j][k].c_str();
+      }
+    }
+    return res;
+  } catch (const std::exception& exc) {
+    throw hpp::Error(exc.what());
+  }
+}
+
+void Problem::stopGraphValidation() {
+  try {
+    if (!graphValidation_)
+      throw std::runtime_error("No graph validation was started.");
+    graphValidation_->stop();
+    graphValidation_.reset();
+  } catch (const std::exception& exc) {
+    throw hpp::Error(exc.what());
+  }
+}
+
 core_idl::Roadmap_ptr Problem::readRoadmap(
     const char* filename, pinocchio_idl::Device_ptr robot,
     manipulation_idl::graph_idl::Graph_ptr graph) {
@@ -672,7 +1535,9 @@ core_idl::Roadmap_ptr Problem::readRoadmap(
     std::string fn(filename);
     bool xml = (fn.size() >= 4 && fn.compare(fn.size() - 4, 4, ".xml") == 0);
     using namespace core::parser;
-    if (xml) {
+    if (isColumnarRoadmapFile(fn)) {
+      roadmap = readColumnarRoadmap(fn, device, _graph);
+    } else if (xml) {
       typedef hpp::serialization::archive_tpl<
           boost::archive::xml_iarchive,
           hpp::serialization::remove_duplicate::vector_archive>
@@ -712,7 +1577,9 @@ void Problem::writeRoadmap(const char* filename, core_idl::Roadmap_ptr _roadmap,
     std::string fn(filename);
     bool xml = (fn.size() >= 4 && fn.compare(fn.size() - 4, 4, ".xml") == 0);
     using namespace core::parser;
-    if (xml) {
+    if (isColumnarRoadmapFile(fn)) {
+      writeColumnarRoadmap(fn, roadmap, _graph);
+    } else if (xml) {
       typedef hpp::serialization::archive_tpl<
           boost::archive::xml_oarchive,
           hpp::serialization::remove_duplicate::vector_archive>
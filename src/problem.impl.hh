@@ -32,9 +32,11 @@
 #include <hpp/corbaserver/manipulation/fwd.hh>
 #include <hpp/manipulation/problem-solver.hh>
 
+#include "graph-validation.hh"
 #include "hpp/corbaserver/manipulation/problem-idl.hh"
 #include "hpp/manipulation_idl/_graph-idl.hh"
 #include "hpp/manipulation_idl/_path_planners-idl.hh"
+#include "roadmap-checkpoint.hh"
 
 namespace hpp {
 namespace manipulation {
@@ -58,7 +60,17 @@ class Problem : public virtual POA_hpp::corbaserver::manipulation::Problem {
 
   virtual Names_t* getSelected(const char* what);
 
-  virtual void loadRoadmap(const char* filename);
+  virtual ULong loadRoadmap(const char* filename);
+
+  virtual void startRoadmapCheckpoint(const char* filename, double period,
+                                      CORBA::ULong nbNodes);
+
+  virtual void stopRoadmapCheckpoint();
+
+  virtual void loadRoadmapCheckpoint(const char* filename);
+
+  virtual hpp::corbaserver::manipulation::RoadmapArrays* getRoadmapArrays(
+      const intSeq& states);
 
   virtual void createGrasp(const char* graspName, const char* gripperName,
                            const char* handleName);
@@ -109,12 +121,59 @@ class Problem : public virtual POA_hpp::corbaserver::manipulation::Problem {
                                    CORBA::Long& indexNotProj,
                                    CORBA::Long& indexProj);
 
+  virtual boolSeq* buildAndProjectPaths(hpp::ID IDedge, const floatSeqSeq& qbs,
+                                        const floatSeqSeq& qes,
+                                        CORBA::Boolean storePaths,
+                                        CORBA::ULong nbThreads,
+                                        intSeq_out indexNotProj,
+                                        intSeq_out indexProj,
+                                        floatSeq_out projectedRatios);
+
+  virtual intSeq* planTransitions(
+      const hpp::corbaserver::manipulation::TransitionQueries& queries,
+      Double timeOut, CORBA::Boolean shareRoadmaps, ULong nbThreads,
+      Names_t_out statuses);
+
+  virtual boolSeq* directPaths(hpp::ID IDedge, const floatSeqSeq& q1s,
+                               const floatSeqSeq& q2s, CORBA::Boolean validate,
+                               ULong nbThreads, intSeq_out pathIds,
+                               Names_t_out statuses);
+
+  virtual boolSeq* validateConfigurations(hpp::ID IDedge,
+                                          const floatSeqSeq& configs,
+                                          ULong nbThreads, Names_t_out reports);
+
+  virtual boolSeq* validateConfigurationsShared(hpp::ID IDedge,
+                                                const hpp::SharedArray& configs,
+                                                ULong nbThreads,
+                                                Names_t_out reports);
+
+  virtual intSeq* postProcessPaths(const intSeq& pathIds,
+                                   CORBA::Boolean splitAtTransitions,
+                                   const Names_t& optimizers,
+                                   CORBA::Boolean timeParameterization,
+                                   ULong nbThreads, intSeq_out segmentPaths,
+                                   intSeq_out segmentEdges,
+                                   floatSeq_out timings);
+
   virtual void setTargetState(hpp::ID IDstate);
 
   virtual ID edgeAtParam(ULong pathId, Double param, String_out name);
 
+  virtual floatSeq* samplePath(ULong pathId, const floatSeq& params,
+                               Double step, floatSeq_out sampledParams,
+                               intSeq_out edgeIds, intSeq_out stateIds,
+                               floatSeq_out ranges, intSeq_out rangeEdgeIds);
+
   hpp::manipulation_idl::graph_idl::Validation_ptr createGraphValidation();
 
+  void startGraphValidation(CORBA::ULong nbThreads);
+
+  hpp::corbaserver::manipulation::ValidationResults* getGraphValidationResults(
+      double timeout, CORBA::Boolean_out finished);
+
+  void stopGraphValidation();
+
   core_idl::Roadmap_ptr readRoadmap(
       const char* filename, pinocchio_idl::Device_ptr robot,
       manipulation_idl::graph_idl::Graph_ptr graph);
@@ -129,7 +188,14 @@ class Problem : public virtual POA_hpp::corbaserver::manipulation::Problem {
  private:
   ProblemSolverPtr_t problemSolver();
   graph::GraphPtr_t graph(bool throwIfNull = true);
+  /// Validate configurations stored column by column
+  /// \sa validateConfigurations
+  boolSeq* validateConfigurationMatrix(
+      hpp::ID IDedge, const Eigen::Ref<const matrix_t>& configs,
+      ULong nbThreads, Names_t_out reports);
   Server* server_;
+  CheckpointRoadmapPtr_t checkpoint_;
+  GraphValidationJobPtr_t graphValidation_;
 };  // class Problem
 }  // namespace impl
 }  // namespace manipulation
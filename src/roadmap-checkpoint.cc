@@ -0,0 +1,300 @@
+// Copyright (c) 2026 CNRS
+//
+
+// Redistribution and use in source and binary forms, with or without
+// modification, are permitted provided that the following conditions are
+// met:
+//
+// 1. Redistributions of source code must retain the above copyright
+//    notice, this list of conditions and the following disclaimer.
+//
+// 2. Redistributions in binary form must reproduce the above copyright
+// notice, this list of conditions and the following disclaimer in the
+// documentation and/or other materials provided with the distribution.
+//
+// THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+// "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+// LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+// A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+// HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+// SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+// LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+// DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+// THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+// (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+// OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH
+// DAMAGE.
+
+#include "roadmap-checkpoint.hh"
+
+#include <chrono>
+#include <cstring>
+#include <hpp/core/edge.hh>
+#include <hpp/core/node.hh>
+#include <hpp/manipulation/graph/edge.hh>
+#include <hpp/manipulation/graph/state.hh>
+#include <hpp/manipulation/roadmap-node.hh>
+#include <hpp/pinocchio/device.hh>
+#include <hpp/util/exception-factory.hh>
+#include <iterator>
+
+#include "graph-fingerprint.hh"
+
+namespace hpp {
+namespace manipulation {
+namespace impl {
+namespace {
+/// Header of roadmap logs.
+///
+/// The header is followed by a sequence of records starting with one
+/// character:
+/// \li 'N' (node): int32 state id, configSize float64,
+/// \li 'E' (edge): int64 index of initial node, int64 index of final node,
+///     int64 id of the constraint graph edge, int64 number n of sub-paths
+///     of the path, n int64 ids of the constraint graph edges of the
+///     sub-paths and (n - 1) x configSize float64 configurations between
+///     the sub-paths (see ColumnarRoadmap),
+/// \li 'C' (clear): the nodes and edges logged so far were removed.
+/// Node indices are counted from the beginning of the log or from the last
+/// 'C' record.
+struct Header {
+  char magic[8];
+  uint32_t version;
+  uint32_t configSize;
+  uint64_t graphFingerprint;
+  uint64_t reserved;
+};
+
+const char magic[8] = "HPPRLOG";
+const uint32_t version = 2;
+
+template <typename T>
+void append(std::vector<char>& buffer, const T& value) {
+  const char* data = reinterpret_cast<const char*>(&value);
+  buffer.insert(buffer.end(), data, data + sizeof(T));
+}
+
+template <typename T>
+bool extract(const std::vector<char>& buffer, std::size_t& pos, T& value) {
+  if (pos + sizeof(T) > buffer.size()) return false;
+  std::memcpy(&value, buffer.data() + pos, sizeof(T));
+  pos += sizeof(T);
+  return true;
+}
+}  // namespace
+
+CheckpointRoadmapPtr_t CheckpointRoadmap::create(
+    const core::DistancePtr_t& distance, const core::DevicePtr_t& robot,
+    const graph::GraphPtr_t& graph, const std::string& filename, double period,
+    std::size_t nbNodes) {
+  CheckpointRoadmap* ptr =
+      new CheckpointRoadmap(distance, robot, graph, filename, period, nbNodes);
+  CheckpointRoadmapPtr_t shPtr(ptr);
+  ptr->init(shPtr);
+  ptr->constraintGraph(graph);
+  return shPtr;
+}
+
+CheckpointRoadmap::CheckpointRoadmap(const core::DistancePtr_t& distance,
+                                     const core::DevicePtr_t& robot,
+                                     const graph::GraphPtr_t& graph,
+                                     const std::string& filename, double period,
+                                     std::size_t nbNodes)
+    : Parent(distance, robot),
+      configSize_(robot->configSize()),
+      period_(period),
+      nbNodes_(nbNodes),
+      nbPendingNodes_(0),
+      stop_(false) {
+  file_.open(filename.c_str(),
+             std::ios::out | std::ios::binary | std::ios::trunc);
+  if (!file_.is_open())
+    HPP_THROW(std::runtime_error, "Failed to open " << filename);
+  Header header;
+  std::memset(&header, 0, sizeof(Header));
+  std::memcpy(header.magic, magic, sizeof(magic));
+  header.version = version;
+  header.configSize = (uint32_t)configSize_;
+  header.graphFingerprint = graph ? graphFingerprint(graph) : 0;
+  file_.write(reinterpret_cast<const char*>(&header), sizeof(Header));
+  file_.flush();
+  thread_ = std::thread(&CheckpointRoadmap::run, this);
+}
+
+CheckpointRoadmap::~CheckpointRoadmap() { stop(); }
+
+void CheckpointRoadmap::copy(const core::RoadmapPtr_t& roadmap) {
+  std::map<core::NodePtr_t, core::NodePtr_t> nodes;
+  for (core::Nodes_t::const_iterator it = roadmap->nodes().begin();
+       it != roadmap->nodes().end(); ++it)
+    nodes[*it] = addNode((*it)->configuration());
+  for (core::Edges_t::const_iterator it = roadmap->edges().begin();
+       it != roadmap->edges().end(); ++it)
+    addEdge(nodes[(*it)->from()], nodes[(*it)->to()], (*it)->path());
+  if (roadmap->initNode()) initNode(roadmap->initNode()->configuration());
+  for (core::NodeVector_t::const_iterator it = roadmap->goalNodes().begin();
+       it != roadmap->goalNodes().end(); ++it)
+    addGoalNode((*it)->configuration());
+}
+
+void CheckpointRoadmap::stop() {
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    if (stop_) return;
+    stop_ = true;
+  }
+  condition_.notify_one();
+  if (thread_.joinable()) thread_.join();
+}
+
+void CheckpointRoadmap::clear() {
+  Parent::clear();
+  nodeIndex_.clear();
+  std::lock_guard<std::mutex> lock(mutex_);
+  if (stop_) return;
+  append(pending_, 'C');
+}
+
+void CheckpointRoadmap::push_node(const core::NodePtr_t& n) {
+  Parent::push_node(n);
+  int64_t index = (int64_t)nodeIndex_.size();
+  nodeIndex_[n] = index;
+
+  RoadmapNodePtr_t node(dynamic_cast<RoadmapNodePtr_t>(n));
+  graph::StatePtr_t state;
+  if (node) state = node->graphState();
+  bool notify = false;
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    if (stop_) return;
+    append(pending_, 'N');
+    append(pending_, (int32_t)(state ? state->id() : -1));
+    const char* q = reinterpret_cast<const char*>(n->configuration().data());
+    pending_.insert(pending_.end(), q, q + configSize_ * sizeof(value_type));
+    ++nbPendingNodes_;
+    notify = (nbNodes_ > 0 && nbPendingNodes_ >= nbNodes_);
+  }
+  if (notify) condition_.notify_one();
+}
+
+void CheckpointRoadmap::impl_addEdge(const core::EdgePtr_t& edge) {
+  Parent::impl_addEdge(edge);
+  std::map<core::NodePtr_t, int64_t>::const_iterator from(
+      nodeIndex_.find(edge->from())),
+      to(nodeIndex_.find(edge->to()));
+  if (from == nodeIndex_.end() || to == nodeIndex_.end()) return;
+  std::vector<int64_t> pieceEdgeIds;
+  std::vector<value_type> waypoints;
+  graph::EdgePtr_t constraintEdge(pathPieces(edge, pieceEdgeIds, waypoints));
+  int64_t edgeId = constraintEdge ? (int64_t)constraintEdge->id() : -1;
+  std::lock_guard<std::mutex> lock(mutex_);
+  if (stop_) return;
+  append(pending_, 'E');
+  append(pending_, from->second);
+  append(pending_, to->second);
+  append(pending_, edgeId);
+  append(pending_, (int64_t)pieceEdgeIds.size());
+  for (std::size_t i = 0; i < pieceEdgeIds.size(); ++i)
+    append(pending_, pieceEdgeIds[i]);
+  const char* q = reinterpret_cast<const char*>(waypoints.data());
+  pending_.insert(pending_.end(), q, q + waypoints.size() * sizeof(value_type));
+}
+
+void CheckpointRoadmap::run() {
+  std::vector<char> buffer;
+  std::unique_lock<std::mutex> lock(mutex_);
+  bool stop = false;
+  while (!stop) {
+    auto ready = [this] {
+      return stop_ || (nbNodes_ > 0 && nbPendingNodes_ >= nbNodes_);
+    };
+    if (period_ > 0)
+      condition_.wait_for(lock, std::chrono::duration<double>(period_), ready);
+    else
+      condition_.wait(lock, ready);
+    stop = stop_;
+    buffer.clear();
+    buffer.swap(pending_);
+    nbPendingNodes_ = 0;
+    lock.unlock();
+    if (!buffer.empty()) {
+      file_.write(buffer.data(), (std::streamsize)buffer.size());
+      file_.flush();
+    }
+    lock.lock();
+  }
+}
+
+void readRoadmapCheckpoint(const std::string& filename,
+                           ColumnarRoadmap& columns) {
+  std::ifstream file(filename.c_str(), std::ios::in | std::ios::binary);
+  if (!file.is_open())
+    HPP_THROW(std::runtime_error, "Failed to open " << filename);
+  std::vector<char> buffer((std::istreambuf_iterator<char>(file)),
+                           std::istreambuf_iterator<char>());
+  std::size_t pos = 0;
+  Header header;
+  if (!extract(buffer, pos, header) ||
+      std::memcmp(header.magic, magic, sizeof(magic)) != 0)
+    HPP_THROW(std::runtime_error, filename << " is not a roadmap log.");
+  if (header.version != version)
+    HPP_THROW(std::runtime_error,
+              filename << " has unsupported version " << header.version << ".");
+
+  columns = ColumnarRoadmap();
+  columns.configSize = header.configSize;
+  columns.graphFingerprint = header.graphFingerprint;
+  std::size_t configBytes = header.configSize * sizeof(value_type);
+  char type;
+  while (extract(buffer, pos, type)) {
+    if (type == 'N') {
+      int32_t stateId;
+      if (!extract(buffer, pos, stateId) || pos + configBytes > buffer.size())
+        break;
+      const value_type* q =
+          reinterpret_cast<const value_type*>(buffer.data() + pos);
+      pos += configBytes;
+      columns.configurations.insert(columns.configurations.end(), q,
+                                    q + header.configSize);
+      columns.stateIds.push_back(stateId);
+      columns.connectedComponents.push_back(-1);
+    } else if (type == 'E') {
+      int64_t from, to, edgeId, nbPieces;
+      if (!extract(buffer, pos, from) || !extract(buffer, pos, to) ||
+          !extract(buffer, pos, edgeId) || !extract(buffer, pos, nbPieces))
+        break;
+      if (nbPieces < 1)
+        HPP_THROW(std::runtime_error,
+                  filename << " is corrupted at byte " << pos - 8 << ".");
+      std::size_t pieceBytes = (std::size_t)nbPieces * sizeof(int64_t);
+      if (pos + pieceBytes + (std::size_t)(nbPieces - 1) * configBytes >
+          buffer.size())
+        break;
+      const int64_t* ids =
+          reinterpret_cast<const int64_t*>(buffer.data() + pos);
+      pos += pieceBytes;
+      const value_type* q =
+          reinterpret_cast<const value_type*>(buffer.data() + pos);
+      pos += (std::size_t)(nbPieces - 1) * configBytes;
+      columns.edges.push_back(from);
+      columns.edges.push_back(to);
+      columns.edgeIds.push_back(edgeId);
+      columns.pieceEdgeIds.insert(columns.pieceEdgeIds.end(), ids,
+                                  ids + nbPieces);
+      columns.waypoints.insert(columns.waypoints.end(), q,
+                               q + (nbPieces - 1) * header.configSize);
+      columns.pathOffsets.push_back((int64_t)columns.pieceEdgeIds.size());
+    } else if (type == 'C') {
+      size_type configSize = columns.configSize;
+      columns = ColumnarRoadmap();
+      columns.configSize = configSize;
+      columns.graphFingerprint = header.graphFingerprint;
+    } else {
+      HPP_THROW(std::runtime_error,
+                filename << " is corrupted at byte " << pos - 1 << ".");
+    }
+  }
+}
+}  // namespace impl
+}  // namespace manipulation
+}  // namespace hpp
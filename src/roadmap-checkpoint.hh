@@ -0,0 +1,124 @@
+// Copyright (c) 2026 CNRS
+//
+
+// Redistribution and use in source and binary forms, with or without
+// modification, are permitted provided that the following conditions are
+// met:
+//
+// 1. Redistributions of source code must retain the above copyright
+//    notice, this list of conditions and the following disclaimer.
+//
+// 2. Redistributions in binary form must reproduce the above copyright
+// notice, this list of conditions and the following disclaimer in the
+// documentation and/or other materials provided with the distribution.
+//
+// THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+// "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+// LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+// A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+// HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+// SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+// LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+// DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+// THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+// (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+// OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH
+// DAMAGE.
+
+#ifndef HPP_MANIPULATION_CORBA_ROADMAP_CHECKPOINT_HH
+#define HPP_MANIPULATION_CORBA_ROADMAP_CHECKPOINT_HH
+
+#include <condition_variable>
+#include <fstream>
+#include <hpp/manipulation/roadmap.hh>
+#include <map>
+#include <mutex>
+#include <string>
+#include <thread>
+#include <vector>
+
+#include "roadmap-io.hh"
+
+namespace hpp {
+namespace manipulation {
+namespace impl {
+class CheckpointRoadmap;
+typedef shared_ptr<CheckpointRoadmap> CheckpointRoadmapPtr_t;
+
+/// Roadmap that appends new nodes and edges to a log file
+///
+/// Nodes and edges are serialized by the thread that adds them to the
+/// roadmap and written to the log file by a background thread, every
+/// \c period seconds or as soon as \c nbNodes nodes are pending, so that
+/// planning is never blocked by disk access.
+///
+/// The log can be read by readRoadmapCheckpoint.
+class CheckpointRoadmap : public Roadmap {
+ public:
+  typedef Roadmap Parent;
+
+  /// Create a roadmap and truncate the log file
+  /// \param graph the constraint graph, whose fingerprint is written in the
+  ///        log,
+  /// \param period time in seconds between two writings. If not positive,
+  ///        writings are only triggered by the number of pending nodes,
+  /// \param nbNodes number of pending nodes that triggers a writing. If 0,
+  ///        writings are only triggered by the period.
+  static CheckpointRoadmapPtr_t create(const core::DistancePtr_t& distance,
+                                       const core::DevicePtr_t& robot,
+                                       const graph::GraphPtr_t& graph,
+                                       const std::string& filename,
+                                       double period, std::size_t nbNodes);
+
+  virtual ~CheckpointRoadmap();
+
+  /// Add the nodes and edges of another roadmap
+  ///
+  /// Paths are shared between both roadmaps.
+  void copy(const core::RoadmapPtr_t& roadmap);
+
+  /// Write pending nodes and edges and stop logging
+  void stop();
+
+  virtual void clear();
+
+ protected:
+  CheckpointRoadmap(const core::DistancePtr_t& distance,
+                    const core::DevicePtr_t& robot,
+                    const graph::GraphPtr_t& graph, const std::string& filename,
+                    double period, std::size_t nbNodes);
+
+  virtual void push_node(const core::NodePtr_t& n);
+
+  virtual void impl_addEdge(const core::EdgePtr_t& edge);
+
+ private:
+  void run();
+
+  size_type configSize_;
+  double period_;
+  std::size_t nbNodes_;
+  /// Index of the nodes in the log, accessed by the planning thread only.
+  std::map<core::NodePtr_t, int64_t> nodeIndex_;
+
+  std::mutex mutex_;
+  std::condition_variable condition_;
+  std::vector<char> pending_;
+  std::size_t nbPendingNodes_;
+  bool stop_;
+  std::ofstream file_;
+  std::thread thread_;
+};
+
+/// Read a roadmap log written by CheckpointRoadmap
+///
+/// An incomplete record at the end of the log, for instance if the server
+/// stopped while writing, is ignored. The fingerprint of the constraint
+/// graph written in the log is stored in columns.graphFingerprint.
+void readRoadmapCheckpoint(const std::string& filename,
+                           ColumnarRoadmap& columns);
+}  // namespace impl
+}  // namespace manipulation
+}  // namespace hpp
+
+#endif  // HPP_MANIPULATION_CORBA_ROADMAP_CHECKPOINT_HH
@@ -0,0 +1,573 @@
+// Copyright (c) 2026 CNRS
+//
+
+// Redistribution and use in source and binary forms, with or without
+// modification, are permitted provided that the following conditions are
+// met:
+//
+// 1. Redistributions of source code must retain the above copyright
+//    notice, this list of conditions and the following disclaimer.
+//
+// 2. Redistributions in binary form must reproduce the above copyright
+// notice, this list of conditions and the following disclaimer in the
+// documentation and/or other materials provided with the distribution.
+//
+// THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+// "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+// LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+// A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+// HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+// SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+// LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+// DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+// THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+// (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+// OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH
+// DAMAGE.
+
+#include "roadmap-io.hh"
+
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+#include <algorithm>
+#include <cstring>
+#include <fstream>
+#include <hpp/core/connected-component.hh>
+#include <hpp/core/edge.hh>
+#include <hpp/core/node.hh>
+#include <hpp/core/path-vector.hh>
+#include <hpp/core/path.hh>
+#include <hpp/core/weighed-distance.hh>
+#include <hpp/manipulation/constraint-set.hh>
+#include <hpp/manipulation/graph/edge.hh>
+#include <hpp/manipulation/graph/graph.hh>
+#include <hpp/manipulation/graph/state.hh>
+#include <hpp/manipulation/roadmap-node.hh>
+#include <hpp/manipulation/roadmap.hh>
+#include <hpp/pinocchio/device.hh>
+#include <hpp/util/exception-factory.hh>
+#include <map>
+
+#include "graph-fingerprint.hh"
+#include "tools.hh"
+
+namespace hpp {
+namespace manipulation {
+namespace impl {
+namespace {
+/// Header of columnar roadmap files.
+///
+/// The header is followed by the following arrays, in this order:
+/// \li configurations: nbNodes x configSize float64,
+/// \li edges: nbEdges x 2 int64,
+/// \li edgeIds: nbEdges int64,
+/// \li pathOffsets: nbEdges + 1 int64,
+/// \li pieceEdgeIds: nbPieces int64,
+/// \li waypoints: (nbPieces - nbEdges) x configSize float64,
+/// \li goalNodes: nbGoalNodes int64,
+/// \li stateIds: nbNodes int32.
+/// All values are stored in the byte order of the machine that wrote the
+/// file. graphFingerprint is 0 in files written without constraint graph.
+struct Header {
+  char magic[8];
+  uint32_t version;
+  uint32_t configSize;
+  uint64_t nbNodes;
+  uint64_t nbEdges;
+  int64_t initNode;
+  uint64_t nbGoalNodes;
+  uint64_t graphFingerprint;
+  uint64_t nbPieces;
+};
+
+const char magic[8] = "HPPRMAP";
+const uint32_t version = 2;
+
+template <typename T>
+void writeArray(std::ofstream& file, const std::vector<T>& v) {
+  if (!v.empty())
+    file.write(reinterpret_cast<const char*>(v.data()),
+               (std::streamsize)(v.size() * sizeof(T)));
+}
+
+/// Read only memory mapping of a file.
+class MappedFile {
+ public:
+  MappedFile(const std::string& filename) : data_(NULL), size_(0) {
+    int fd = ::open(filename.c_str(), O_RDONLY);
+    if (fd < 0) HPP_THROW(std::runtime_error, "Failed to open " << filename);
+    struct stat st;
+    if (::fstat(fd, &st) != 0) {
+      ::close(fd);
+      HPP_THROW(std::runtime_error, "Failed to read size of " << filename);
+    }
+    size_ = (std::size_t)st.st_size;
+    if (size_ > 0) {
+      void* data = ::mmap(NULL, size_, PROT_READ, MAP_PRIVATE, fd, 0);
+      if (data == MAP_FAILED) {
+        ::close(fd);
+        HPP_THROW(std::runtime_error, "Failed to map " << filename);
+      }
+      ::madvise(data, size_, MADV_SEQUENTIAL);
+      data_ = static_cast<const char*>(data);
+    }
+    ::close(fd);
+  }
+
+  ~MappedFile() {
+    if (data_ != NULL) ::munmap(const_cast<char*>(data_), size_);
+  }
+
+  const char* data() const { return data_; }
+  std::size_t size() const { return size_; }
+
+ private:
+  MappedFile(const MappedFile&);
+  MappedFile& operator=(const MappedFile&);
+
+  const char* data_;
+  std::size_t size_;
+};
+
+/// Non owning view on the arrays of a columnar roadmap.
+struct View {
+  size_type configSize;
+  std::size_t nbNodes, nbEdges, nbGoalNodes, nbPieces;
+  const value_type* configurations;
+  const int64_t* edges;
+  const int64_t* edgeIds;
+  const int64_t* pathOffsets;
+  const int64_t* pieceEdgeIds;
+  const value_type* waypoints;
+  const int32_t* stateIds;
+  int64_t initNode;
+  const int64_t* goalNodes;
+  uint64_t graphFingerprint;
+};
+
+void checkNodeIndex(int64_t index, std::size_t nbNodes, const char* what) {
+  if (index < 0 || (uint64_t)index >= nbNodes)
+    HPP_THROW(std::runtime_error, what << " " << index
+                                       << " is not a valid node index ("
+                                       << nbNodes << " nodes).");
+}
+
+/// Component of the constraint graph of given id and type, or NULL.
+template <typename T>
+shared_ptr<T> component(const graph::GraphPtr_t& graph, int64_t id) {
+  if (!graph || id < 0 || (std::size_t)id >= graph->nbComponents())
+    return shared_ptr<T>();
+  return HPP_DYNAMIC_PTR_CAST(T, graph->get((std::size_t)id).lock());
+}
+
+core::PathVectorPtr_t flatten(const core::PathPtr_t& path) {
+  core::PathVectorPtr_t flat(core::PathVector::create(
+      path->outputSize(), path->outputDerivativeSize()));
+  core::PathVectorPtr_t pv(HPP_DYNAMIC_PTR_CAST(core::PathVector, path));
+  if (pv)
+    pv->flatten(flat);
+  else
+    flat->appendPath(path);
+  return flat;
+}
+
+graph::EdgePtr_t constraintGraphEdge(const core::PathPtr_t& path) {
+  ConstraintSetPtr_t constraints(
+      HPP_DYNAMIC_PTR_CAST(ConstraintSet, path->constraints()));
+  if (!constraints) return graph::EdgePtr_t();
+  return constraints->edge();
+}
+
+/// Constraint graph edge of a roadmap edge, given its flattened path.
+graph::EdgePtr_t graphEdge(const core::EdgePtr_t& edge,
+                           const core::PathVectorPtr_t& flat) {
+  if (flat->numberPaths() == 0) return graph::EdgePtr_t();
+  graph::EdgePtr_t result(constraintGraphEdge(flat->pathAtRank(0)));
+  if (!result) return result;
+
+  // Go up to the waypoint edge whose first waypoint is result, until the
+  // final state of the roadmap edge is reached.
+  RoadmapNodePtr_t to(dynamic_cast<RoadmapNodePtr_t>(edge->to()));
+  graph::StatePtr_t stateTo;
+  if (to) stateTo = to->graphState();
+  while (result->stateTo() != stateTo) {
+    graph::EdgePtr_t parent;
+    graph::Edges_t neighbors(result->stateFrom()->neighborEdges());
+    for (graph::Edges_t::const_iterator it = neighbors.begin();
+         it != neighbors.end() && !parent; ++it) {
+      graph::WaypointEdgePtr_t we(
+          HPP_DYNAMIC_PTR_CAST(graph::WaypointEdge, *it));
+      if (we && we->waypoint(0) == result) parent = we;
+    }
+    if (!parent) break;
+    result = parent;
+  }
+  return result;
+}
+
+/// Rebuild the path of edge i from its sub-paths
+/// \return the path, or NULL if a sub-path was not built by an edge of the
+///         constraint graph.
+/// \throw std::runtime_error if a sub-path cannot be rebuilt.
+core::PathPtr_t buildPath(const View& v, std::size_t i,
+                          const pinocchio::DevicePtr_t& robot,
+                          const graph::GraphPtr_t& graph,
+                          ConfigurationIn_t from, ConfigurationIn_t to) {
+  std::size_t begin((std::size_t)v.pathOffsets[i]),
+      end((std::size_t)v.pathOffsets[i + 1]);
+  core::PathVectorPtr_t path(
+      core::PathVector::create(robot->configSize(), robot->numberDof()));
+  Configuration_t q0(from), q1;
+  for (std::size_t j = begin; j < end; ++j) {
+    graph::EdgePtr_t edge(component<graph::Edge>(graph, v.pieceEdgeIds[j]));
+    if (!edge) return core::PathPtr_t();
+    // The waypoints of edge i start at index pathOffsets[i] - i.
+    if (j + 1 < end)
+      q1 = Eigen::Map<const vector_t>(v.waypoints + (j - i) * v.configSize,
+                                      v.configSize);
+    else
+      q1 = to;
+    core::PathPtr_t piece;
+    if (!edge->build(piece, q0, q1) || !piece)
+      HPP_THROW(std::runtime_error, "Failed to rebuild sub-path "
+                                        << j - begin << " of roadmap edge " << i
+                                        << " along " << edge->name() << ".");
+    path->appendPath(piece);
+    q0 = q1;
+  }
+  return path;
+}
+
+core::RoadmapPtr_t build(const View& v, const pinocchio::DevicePtr_t& robot,
+                         const graph::GraphPtr_t& graph,
+                         std::size_t* nbDroppedEdges) {
+  if (v.nbNodes > 0 && v.configSize != robot->configSize())
+    HPP_THROW(std::invalid_argument,
+              "Roadmap configuration size ("
+                  << v.configSize << ") does not match robot configuration "
+                  << "size (" << robot->configSize() << ").");
+  if (v.graphFingerprint != 0 && graph) {
+    uint64_t fingerprint(graphFingerprint(graph));
+    if (fingerprint != v.graphFingerprint)
+      HPP_THROW(std::runtime_error,
+                "Roadmap was built with another constraint graph (fingerprint "
+                    << hashToString(v.graphFingerprint) << " instead of "
+                    << hashToString(fingerprint) << ").");
+  }
+  if (v.initNode >= 0) checkNodeIndex(v.initNode, v.nbNodes, "Initial node");
+  for (std::size_t i = 0; i < v.nbGoalNodes; ++i)
+    checkNodeIndex(v.goalNodes[i], v.nbNodes, "Goal node");
+  for (std::size_t i = 0; i < 2 * v.nbEdges; ++i)
+    checkNodeIndex(v.edges[i], v.nbNodes, "Edge end");
+  if (v.pathOffsets[0] != 0 || v.pathOffsets[v.nbEdges] != (int64_t)v.nbPieces)
+    HPP_THROW(std::runtime_error, "Roadmap path offsets are corrupted.");
+  for (std::size_t i = 0; i < v.nbEdges; ++i)
+    if (v.pathOffsets[i + 1] <= v.pathOffsets[i])
+      HPP_THROW(std::runtime_error, "Roadmap edge " << i << " has no path.");
+
+  core::DistancePtr_t distance(core::WeighedDistance::create(robot));
+  RoadmapPtr_t roadmap(Roadmap::create(distance, robot));
+  roadmap->constraintGraph(graph);
+
+  std::vector<core::NodePtr_t> nodes(v.nbNodes);
+  for (std::size_t i = 0; i < v.nbNodes; ++i) {
+    Configuration_t q(Eigen::Map<const vector_t>(
+        v.configurations + i * v.configSize, v.configSize));
+    nodes[i] = roadmap->addNode(q);
+    graph::StatePtr_t state(component<graph::State>(graph, v.stateIds[i]));
+    RoadmapNodePtr_t node(dynamic_cast<RoadmapNodePtr_t>(nodes[i]));
+    if (state && node) node->graphState(state);
+  }
+  if (v.initNode >= 0)
+    roadmap->initNode(nodes[(std::size_t)v.initNode]->configuration());
+  for (std::size_t i = 0; i < v.nbGoalNodes; ++i)
+    roadmap->addGoalNode(nodes[(std::size_t)v.goalNodes[i]]->configuration());
+
+  std::size_t nbDropped = 0;
+  for (std::size_t i = 0; i < v.nbEdges; ++i) {
+    core::NodePtr_t from(nodes[(std::size_t)v.edges[2 * i]]),
+        to(nodes[(std::size_t)v.edges[2 * i + 1]]);
+    // Edges are usually stored in both directions, one after the other.
+    bool reverse =
+        (i + 1 < v.nbEdges && v.edges[2 * i + 2] == v.edges[2 * i + 1] &&
+         v.edges[2 * i + 3] == v.edges[2 * i] &&
+         v.edgeIds[i + 1] == v.edgeIds[i]);
+    core::PathPtr_t path(buildPath(v, i, robot, graph, from->configuration(),
+                                   to->configuration()));
+    if (!path) {
+      if (nbDroppedEdges == NULL)
+        HPP_THROW(std::runtime_error,
+                  "The path of roadmap edge "
+                      << i << " was not built by an edge of the constraint "
+                      << "graph and cannot be rebuilt.");
+      nbDropped += (reverse ? 2 : 1);
+    } else if (reverse) {
+      roadmap->addEdges(from, to, path);
+    } else {
+      roadmap->addEdge(from, to, path);
+    }
+    if (reverse) ++i;
+  }
+  if (nbDroppedEdges != NULL) *nbDroppedEdges = nbDropped;
+  return roadmap;
+}
+}  // namespace
+
+graph::EdgePtr_t graphEdge(const core::EdgePtr_t& edge) {
+  return graphEdge(edge, flatten(edge->path()));
+}
+
+graph::EdgePtr_t pathPieces(const core::EdgePtr_t& edge,
+                            std::vector<int64_t>& pieceEdgeIds,
+                            std::vector<value_type>& waypoints) {
+  core::PathVectorPtr_t flat(flatten(edge->path()));
+  if (flat->numberPaths() == 0) {
+    pieceEdgeIds.push_back(-1);
+    return graph::EdgePtr_t();
+  }
+  for (std::size_t r = 0; r < flat->numberPaths(); ++r) {
+    core::PathPtr_t piece(flat->pathAtRank(r));
+    graph::EdgePtr_t e(constraintGraphEdge(piece));
+    pieceEdgeIds.push_back(e ? (int64_t)e->id() : -1);
+    if (r + 1 < flat->numberPaths()) {
+      Configuration_t q(piece->end());
+      waypoints.insert(waypoints.end(), q.data(), q.data() + q.size());
+    }
+  }
+  return graphEdge(edge, flat);
+}
+
+void ColumnarRoadmap::addEdge(int64_t from, int64_t to,
+                              const core::EdgePtr_t& edge) {
+  edges.push_back(from);
+  edges.push_back(to);
+  graph::EdgePtr_t e(pathPieces(edge, pieceEdgeIds, waypoints));
+  edgeIds.push_back(e ? (int64_t)e->id() : -1);
+  pathOffsets.push_back((int64_t)pieceEdgeIds.size());
+}
+
+void ColumnarRoadmap::fromRoadmap(const core::RoadmapPtr_t& roadmap) {
+  const core::Nodes_t& nodes(roadmap->nodes());
+  const core::Edges_t& edgeList(roadmap->edges());
+  configSize = nodes.empty() ? 0 : nodes.front()->configuration().size();
+
+  std::map<core::NodePtr_t, int64_t> nodeIndex;
+  std::map<core::ConnectedComponentPtr_t, int32_t> ccIndex;
+  configurations.resize(nodes.size() * (std::size_t)configSize);
+  stateIds.resize(nodes.size());
+  connectedComponents.resize(nodes.size());
+  std::size_t i = 0;
+  for (core::Nodes_t::const_iterator it = nodes.begin(); it != nodes.end();
+       ++it, ++i) {
+    nodeIndex[*it] = (int64_t)i;
+    Eigen::Map<vector_t>(configurations.data() + i * configSize, configSize) =
+        (*it)->configuration();
+    RoadmapNodePtr_t node(dynamic_cast<RoadmapNodePtr_t>(*it));
+    graph::StatePtr_t state;
+    if (node) state = node->graphState();
+    stateIds[i] = state ? (int32_t)state->id() : -1;
+    core::ConnectedComponentPtr_t cc((*it)->connectedComponent());
+    if (ccIndex.count(cc) == 0) {
+      int32_t index = (int32_t)ccIndex.size();
+      ccIndex[cc] = index;
+    }
+    connectedComponents[i] = ccIndex[cc];
+  }
+
+  edges.clear();
+  edgeIds.clear();
+  pathOffsets.assign(1, 0);
+  pieceEdgeIds.clear();
+  waypoints.clear();
+  for (core::Edges_t::const_iterator it = edgeList.begin();
+       it != edgeList.end(); ++it)
+    addEdge(nodeIndex[(*it)->from()], nodeIndex[(*it)->to()], *it);
+
+  initNode = roadmap->initNode() ? nodeIndex[roadmap->initNode()] : -1;
+  goalNodes.clear();
+  for (core::NodeVector_t::const_iterator it = roadmap->goalNodes().begin();
+       it != roadmap->goalNodes().end(); ++it)
+    goalNodes.push_back(nodeIndex[*it]);
+}
+
+void ColumnarRoadmap::keepStates(const std::vector<int32_t>& states) {
+  std::vector<int64_t> index(nbNodes(), -1);
+  std::size_t n = 0;
+  for (std::size_t i = 0; i < index.size(); ++i) {
+    if (std::find(states.begin(), states.end(), stateIds[i]) == states.end())
+      continue;
+    index[i] = (int64_t)n;
+    if (n != i) {
+      std::copy(configurations.begin() + i * configSize,
+                configurations.begin() + (i + 1) * configSize,
+                configurations.begin() + n * configSize);
+      stateIds[n] = stateIds[i];
+      connectedComponents[n] = connectedComponents[i];
+    }
+    ++n;
+  }
+  configurations.resize(n * configSize);
+  stateIds.resize(n);
+  connectedComponents.resize(n);
+
+  std::size_t m = 0, nbPieces = 0, nbWaypoints = 0;
+  for (std::size_t i = 0; i < nbEdges(); ++i) {
+    int64_t from(index[(std::size_t)edges[2 * i]]),
+        to(index[(std::size_t)edges[2 * i + 1]]);
+    if (from < 0 || to < 0) continue;
+    edges[2 * m] = from;
+    edges[2 * m + 1] = to;
+    edgeIds[m] = edgeIds[i];
+    std::size_t begin((std::size_t)pathOffsets[i]),
+        end((std::size_t)pathOffsets[i + 1]);
+    std::copy(pieceEdgeIds.begin() + begin, pieceEdgeIds.begin() + end,
+              pieceEdgeIds.begin() + nbPieces);
+    std::copy(waypoints.begin() + (begin - i) * configSize,
+              waypoints.begin() + (end - i - 1) * configSize,
+              waypoints.begin() + nbWaypoints * configSize);
+    nbPieces += end - begin;
+    nbWaypoints += end - begin - 1;
+    pathOffsets[m + 1] = (int64_t)nbPieces;
+    ++m;
+  }
+  edges.resize(2 * m);
+  edgeIds.resize(m);
+  pathOffsets.resize(m + 1);
+  pieceEdgeIds.resize(nbPieces);
+  waypoints.resize(nbWaypoints * configSize);
+
+  if (initNode >= 0) initNode = index[(std::size_t)initNode];
+  std::vector<int64_t> goals;
+  for (std::size_t i = 0; i < goalNodes.size(); ++i)
+    if (index[(std::size_t)goalNodes[i]] >= 0)
+      goals.push_back(index[(std::size_t)goalNodes[i]]);
+  goalNodes.swap(goals);
+}
+
+bool isColumnarRoadmapFile(const std::string& filename) {
+  return filename.size() >= 5 &&
+         filename.compare(filename.size() - 5, 5, ".rmap") == 0;
+}
+
+void writeColumnarRoadmap(const std::string& filename,
+                          const core::RoadmapPtr_t& roadmap,
+                          const graph::GraphPtr_t& graph) {
+  ColumnarRoadmap columns;
+  columns.fromRoadmap(roadmap);
+  if (graph) columns.graphFingerprint = graphFingerprint(graph);
+
+  Header header;
+  std::memset(&header, 0, sizeof(Header));
+  std::memcpy(header.magic, magic, sizeof(magic));
+  header.version = version;
+  header.configSize = (uint32_t)columns.configSize;
+  header.nbNodes = columns.nbNodes();
+  header.nbEdges = columns.nbEdges();
+  header.initNode = columns.initNode;
+  header.nbGoalNodes = columns.goalNodes.size();
+  header.graphFingerprint = columns.graphFingerprint;
+  header.nbPieces = columns.pieceEdgeIds.size();
+
+  std::ofstream file(filename.c_str(),
+                     std::ios::out | std::ios::binary | std::ios::trunc);
+  if (!file.is_open())
+    HPP_THROW(std::runtime_error, "Failed to open " << filename);
+  file.write(reinterpret_cast<const char*>(&header), sizeof(Header));
+  writeArray(file, columns.configurations);
+  writeArray(file, columns.edges);
+  writeArray(file, columns.edgeIds);
+  writeArray(file, columns.pathOffsets);
+  writeArray(file, columns.pieceEdgeIds);
+  writeArray(file, columns.waypoints);
+  writeArray(file, columns.goalNodes);
+  writeArray(file, columns.stateIds);
+  if (!file.good())
+    HPP_THROW(std::runtime_error, "Failed to write " << filename);
+}
+
+core::RoadmapPtr_t readColumnarRoadmap(const std::string& filename,
+                                       const pinocchio::DevicePtr_t& robot,
+                                       const graph::GraphPtr_t& graph,
+                                       std::size_t* nbDroppedEdges) {
+  MappedFile file(filename);
+  if (file.size() < sizeof(Header))
+    HPP_THROW(std::runtime_error, filename << " is not a roadmap file.");
+  Header header;
+  std::memcpy(&header, file.data(), sizeof(Header));
+  if (std::memcmp(header.magic, magic, sizeof(magic)) != 0)
+    HPP_THROW(std::runtime_error, filename << " is not a roadmap file.");
+  if (header.version != version)
+    HPP_THROW(std::runtime_error,
+              filename << " has unsupported version " << header.version << ".");
+  if (header.nbPieces < header.nbEdges)
+    HPP_THROW(std::runtime_error, filename << " is corrupted.");
+
+  View v;
+  v.configSize = header.configSize;
+  v.nbNodes = header.nbNodes;
+  v.nbEdges = header.nbEdges;
+  v.nbGoalNodes = header.nbGoalNodes;
+  v.nbPieces = header.nbPieces;
+  v.initNode = header.initNode;
+  v.graphFingerprint = header.graphFingerprint;
+  std::size_t nbWaypoints = v.nbPieces - v.nbEdges;
+  std::size_t expected =
+      sizeof(Header) +
+      (v.nbNodes + nbWaypoints) * v.configSize * sizeof(value_type) +
+      (4 * v.nbEdges + 1 + v.nbPieces + v.nbGoalNodes) * sizeof(int64_t) +
+      v.nbNodes * sizeof(int32_t);
+  if (file.size() != expected)
+    HPP_THROW(std::runtime_error, filename << " is truncated or corrupted.");
+  const char* data = file.data() + sizeof(Header);
+  v.configurations = reinterpret_cast<const value_type*>(data);
+  data += v.nbNodes * v.configSize * sizeof(value_type);
+  v.edges = reinterpret_cast<const int64_t*>(data);
+  data += 2 * v.nbEdges * sizeof(int64_t);
+  v.edgeIds = reinterpret_cast<const int64_t*>(data);
+  data += v.nbEdges * sizeof(int64_t);
+  v.pathOffsets = reinterpret_cast<const int64_t*>(data);
+  data += (v.nbEdges + 1) * sizeof(int64_t);
+  v.pieceEdgeIds = reinterpret_cast<const int64_t*>(data);
+  data += v.nbPieces * sizeof(int64_t);
+  v.waypoints = reinterpret_cast<const value_type*>(data);
+  data += nbWaypoints * v.configSize * sizeof(value_type);
+  v.goalNodes = reinterpret_cast<const int64_t*>(data);
+  data += v.nbGoalNodes * sizeof(int64_t);
+  v.stateIds = reinterpret_cast<const int32_t*>(data);
+  return build(v, robot, graph, nbDroppedEdges);
+}
+
+core::RoadmapPtr_t buildRoadmap(const ColumnarRoadmap& columns,
+                                const pinocchio::DevicePtr_t& robot,
+                                const graph::GraphPtr_t& graph,
+                                std::size_t* nbDroppedEdges) {
+  if (columns.pathOffsets.size() != columns.nbEdges() + 1)
+    HPP_THROW(std::runtime_error, "Roadmap path offsets are corrupted.");
+  View v;
+  v.configSize = columns.configSize;
+  v.nbNodes = columns.nbNodes();
+  v.nbEdges = columns.nbEdges();
+  v.nbGoalNodes = columns.goalNodes.size();
+  v.nbPieces = columns.pieceEdgeIds.size();
+  v.configurations = columns.configurations.data();
+  v.edges = columns.edges.data();
+  v.edgeIds = columns.edgeIds.data();
+  v.pathOffsets = columns.pathOffsets.data();
+  v.pieceEdgeIds = columns.pieceEdgeIds.data();
+  v.waypoints = columns.waypoints.data();
+  v.stateIds = columns.stateIds.data();
+  v.initNode = columns.initNode;
+  v.goalNodes = columns.goalNodes.data();
+  v.graphFingerprint = columns.graphFingerprint;
+  if (v.nbPieces < v.nbEdges ||
+      columns.waypoints.size() !=
+          (v.nbPieces - v.nbEdges) * (std::size_t)v.configSize)
+    HPP_THROW(std::runtime_error, "Roadmap waypoints are corrupted.");
+  return build(v, robot, graph, nbDroppedEdges);
+}
+}  // namespace impl
+}  // namespace manipulation
+}  // namespace hpp
@@ -0,0 +1,157 @@
+// Copyright (c) 2026 CNRS
+//
+
+// Redistribution and use in source and binary forms, with or without
+// modification, are permitted provided that the following conditions are
+// met:
+//
+// 1. Redistributions of source code must retain the above copyright
+//    notice, this list of conditions and the following disclaimer.
+//
+// 2. Redistributions in binary form must reproduce the above copyright
+// notice, this list of conditions and the following disclaimer in the
+// documentation and/or other materials provided with the distribution.
+//
+// THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+// "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+// LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+// A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+// HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+// SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+// LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+// DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+// THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+// (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+// OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH
+// DAMAGE.
+
+#ifndef HPP_MANIPULATION_CORBA_ROADMAP_IO_HH
+#define HPP_MANIPULATION_CORBA_ROADMAP_IO_HH
+
+#include <cstdint>
+#include <hpp/core/fwd.hh>
+#include <hpp/manipulation/fwd.hh>
+#include <string>
+#include <vector>
+
+namespace hpp {
+namespace manipulation {
+namespace impl {
+/// Roadmap stored as flat arrays
+///
+/// This is the in-memory counterpart of the columnar roadmap file format:
+/// \li configurations are stored in one contiguous array, node after node,
+/// \li edges are stored as pairs of node indices, together with the index
+///     of the constraint graph edge that created the path, or -1,
+/// \li the index of the constraint graph state of each node, or -1, and the
+///     index of its connected component are stored as int arrays,
+/// \li the path of each edge is stored as the list of its sub-paths, once
+///     flattened: for each sub-path, the id of the constraint graph edge
+///     that built it and its final configuration, except for the last one.
+///
+/// When the roadmap is built, each sub-path is rebuilt by the steering
+/// method of its constraint graph edge between its stored end
+/// configurations. Sub-paths are thus the projected and validated ones, and
+/// no projection nor validation is needed. The fingerprint of the
+/// constraint graph is stored to detect roadmaps built with another graph.
+/// Connected components are not stored in files: they are recomputed from
+/// the edges.
+struct ColumnarRoadmap {
+  size_type configSize;
+  std::vector<value_type> configurations;
+  std::vector<int64_t> edges;
+  std::vector<int64_t> edgeIds;
+  std::vector<int32_t> stateIds;
+  std::vector<int32_t> connectedComponents;
+  /// Sub-paths of edge i are pathOffsets[i] to pathOffsets[i+1] - 1.
+  std::vector<int64_t> pathOffsets;
+  /// Id of the constraint graph edge of each sub-path, or -1.
+  std::vector<int64_t> pieceEdgeIds;
+  /// Final configuration of each sub-path but the last one of each edge.
+  /// Those of edge i start at index pathOffsets[i] - i.
+  std::vector<value_type> waypoints;
+  int64_t initNode;
+  std::vector<int64_t> goalNodes;
+  /// Fingerprint of the constraint graph, 0 if unknown.
+  /// \sa graphFingerprint
+  uint64_t graphFingerprint;
+
+  ColumnarRoadmap()
+      : configSize(0), pathOffsets(1, 0), initNode(-1), graphFingerprint(0) {}
+
+  std::size_t nbNodes() const { return stateIds.size(); }
+  std::size_t nbEdges() const { return edgeIds.size(); }
+
+  /// Append an edge between nodes of given indices
+  void addEdge(int64_t from, int64_t to, const core::EdgePtr_t& edge);
+
+  /// Fill the arrays with the content of a roadmap
+  void fromRoadmap(const core::RoadmapPtr_t& roadmap);
+
+  /// Remove the nodes that are not in the given constraint graph states
+  ///
+  /// Edges from or to removed nodes are removed and the remaining nodes are
+  /// renumbered, keeping their order. initNode is set to -1 if removed.
+  void keepStates(const std::vector<int32_t>& states);
+};
+
+/// Constraint graph edge along which a roadmap edge was built
+///
+/// The path of the edge is flattened and the constraint graph edge is read
+/// from the constraints of the first sub-path. Paths built by a waypoint edge
+/// start with a path along its first waypoint: in this case, the waypoint
+/// edge itself is returned.
+/// \return the constraint graph edge, or NULL if the path was not built by
+///         a constraint graph edge.
+graph::EdgePtr_t graphEdge(const core::EdgePtr_t& edge);
+
+/// Sub-paths of the path of a roadmap edge
+///
+/// The path is flattened. For each sub-path, the id of the constraint graph
+/// edge that built it, or -1, is appended to pieceEdgeIds and its final
+/// configuration, except for the last sub-path, is appended to waypoints.
+/// \return graphEdge(edge)
+graph::EdgePtr_t pathPieces(const core::EdgePtr_t& edge,
+                            std::vector<int64_t>& pieceEdgeIds,
+                            std::vector<value_type>& waypoints);
+
+/// Whether a file name designates a roadmap in columnar format
+///
+/// Columnar roadmap file names end with ".rmap".
+bool isColumnarRoadmapFile(const std::string& filename);
+
+/// Write a roadmap in columnar format
+/// \param graph the constraint graph with which the roadmap was built. If
+///        not NULL, its fingerprint is stored in the file.
+void writeColumnarRoadmap(const std::string& filename,
+                          const core::RoadmapPtr_t& roadmap,
+                          const graph::GraphPtr_t& graph = graph::GraphPtr_t());
+
+/// Read a roadmap in columnar format
+///
+/// The file is mapped in memory and the roadmap is built directly from the
+/// mapped arrays.
+/// \param robot the robot for which the roadmap was built,
+/// \param graph the constraint graph with which the roadmap was built,
+/// \param nbDroppedEdges if not NULL, edges with a sub-path that was not
+///        built by a constraint graph edge are not inserted and their number
+///        is stored here. Otherwise, such edges raise an exception.
+/// \throw std::runtime_error if the file stores the fingerprint of another
+///        constraint graph, if the file is corrupted or if a sub-path cannot
+///        be rebuilt by its constraint graph edge.
+core::RoadmapPtr_t readColumnarRoadmap(const std::string& filename,
+                                       const pinocchio::DevicePtr_t& robot,
+                                       const graph::GraphPtr_t& graph,
+                                       std::size_t* nbDroppedEdges = NULL);
+
+/// Build a roadmap from flat arrays
+/// \sa readColumnarRoadmap
+core::RoadmapPtr_t buildRoadmap(const ColumnarRoadmap& columns,
+                                const pinocchio::DevicePtr_t& robot,
+                                const graph::GraphPtr_t& graph,
+                                std::size_t* nbDroppedEdges = NULL);
+}  // namespace impl
+}  // namespace manipulation
+}  // namespace hpp
+
+#endif  // HPP_MANIPULATION_CORBA_ROADMAP_IO_HH
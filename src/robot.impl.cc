@@ -28,6 +28,10 @@
 
 #include "robot.impl.hh"
 
+#include <algorithm>
+#include <cstdlib>
+#include <fstream>
+#include <functional>
 #include <hpp/corbaserver/manipulation/server.hh>
 #include <hpp/manipulation/device.hh>
 #include <hpp/manipulation/handle.hh>
@@ -39,7 +43,14 @@
 #include <hpp/pinocchio/urdf/util.hh>
 #include <hpp/util/debug.hh>
 #include <hpp/util/exception-factory.hh>
+#include <iterator>
+#include <map>
+#include <mutex>
+#include <pinocchio/algorithm/model.hpp>
+#include <pinocchio/multibody/geometry.hpp>
 #include <pinocchio/multibody/model.hpp>
+#include <sstream>
+#include <vector>
 
 #include "tools.hh"
 
@@ -115,6 +126,498 @@ void copy(const Container<Object>& from, Container<Object>& to,
     to.add(obj->name(), obj);
   }
 }
+
+/// Insert a copy of a robot model under a new name
+///
+/// Joints, frames and geometry objects of robot model src are copied with
+/// names prefixed by dst instead of src. Collision geometries are shared
+/// with the original model. The root of the copy is placed on frame
+/// frameName, as if the model had been inserted on this frame.
+/// Collision pairs of the original are reproduced, and collision pairs are
+/// added between the copy and the original. Grippers, handles and contact
+/// surfaces are copied.
+/// \note Pinocchio data are not recreated.
+void cloneModel(const DevicePtr_t& robot, const std::string& src,
+                const std::string& dst, const std::string& frameName) {
+  pinocchio::Model& model = robot->model();
+  pinocchio::GeomModel& geomModel = robot->geomModel();
+  const FrameIndices_t frames(robot->robotFrames(src));
+  if (frames.empty())
+    HPP_THROW(std::invalid_argument, "No robot named " << src << ".");
+  if (robot->robotFrames(dst).size() > 0)
+    HPP_THROW(std::invalid_argument,
+              "A robot named " << dst << " already exists");
+  if (!model.existFrame(frameName))
+    HPP_THROW(std::invalid_argument, "No frame named " << frameName << ".");
+  const std::string prefix(src + "/");
+  auto renamed = [&prefix, &dst](const std::string& name) {
+    if (name.compare(0, prefix.size(), prefix) == 0)
+      return dst + "/" + name.substr(prefix.size());
+    return dst + "/" + name;
+  };
+
+  // Elements attached to the parent joint of the original model are attached
+  // to the parent joint of frameName in the copy, and their position is
+  // multiplied on the left by M.
+  const ::pinocchio::Frame& root(model.frames[frames[0]]);
+  pinocchio::JointIndex sourceParent;
+  Transform3s rootPlacement;
+  if (root.type == ::pinocchio::JOINT) {
+    sourceParent = model.parents[root.parent];
+    rootPlacement = model.jointPlacements[root.parent];
+  } else {
+    sourceParent = root.parent;
+    rootPlacement = root.placement;
+  }
+  const FrameIndex targetFrame = model.getFrameId(frameName);
+  const pinocchio::JointIndex targetJoint = model.frames[targetFrame].parent;
+  const Transform3s M(model.frames[targetFrame].placement *
+                      rootPlacement.inverse());
+  auto place = [&M, sourceParent](pinocchio::JointIndex joint,
+                                  const Transform3s& position) {
+    return joint == sourceParent ? Transform3s(M * position) : position;
+  };
+
+  std::map<pinocchio::JointIndex, pinocchio::JointIndex> joints;
+  joints[sourceParent] = targetJoint;
+  auto copyOf = [&joints, &src](pinocchio::JointIndex joint) {
+    std::map<pinocchio::JointIndex, pinocchio::JointIndex>::const_iterator it(
+        joints.find(joint));
+    if (it == joints.end())
+      HPP_THROW(std::logic_error,
+                "Robot " << src << " is not a kinematic subtree: joint "
+                         << joint << " is not part of it.");
+    return it->second;
+  };
+  auto jointPtr = [&robot, &model](pinocchio::JointIndex joint) {
+    if (joint == 0) return JointPtr_t();
+    return robot->getJointByName(model.names[joint]);
+  };
+
+  // Joints, in increasing order so that parents are copied first.
+  const pinocchio::JointIndex nbJoints = (pinocchio::JointIndex)model.njoints;
+  for (pinocchio::JointIndex j = 1; j < nbJoints; ++j) {
+    if (model.names[j].compare(0, prefix.size(), prefix) != 0) continue;
+    const ::pinocchio::JointModel joint(model.joints[j]);
+    const std::string name(renamed(model.names[j]));
+    if (model.existJointName(name))
+      HPP_THROW(std::invalid_argument,
+                "A joint named " << name << " already exists.");
+    const int iq = joint.idx_q(), nq = joint.nq(), iv = joint.idx_v(),
+              nv = joint.nv();
+    const vector_t effort(model.effortLimit.segment(iv, nv)),
+        velocity(model.velocityLimit.segment(iv, nv)),
+        lower(model.lowerPositionLimit.segment(iq, nq)),
+        upper(model.upperPositionLimit.segment(iq, nq));
+    const ::pinocchio::Inertia inertia(model.inertias[j]);
+    pinocchio::JointIndex k =
+        model.addJoint(copyOf(model.parents[j]), joint,
+                       place(model.parents[j], model.jointPlacements[j]), name,
+                       effort, velocity, lower, upper);
+    model.appendBodyToJoint(k, inertia, Transform3s::Identity());
+    joints[j] = k;
+  }
+
+  // Frames
+  std::map<FrameIndex, FrameIndex> frameCopies;
+  for (FrameIndices_t::const_iterator it = frames.begin(); it != frames.end();
+       ++it) {
+    const ::pinocchio::Frame frame(model.frames[*it]);
+    const std::string name(renamed(frame.name));
+    if (model.existFrame(name))
+      HPP_THROW(std::invalid_argument,
+                "A frame named " << name << " already exists.");
+    std::map<FrameIndex, FrameIndex>::const_iterator previous(
+        frameCopies.find(frame.previousFrame));
+    frameCopies[*it] = model.addFrame(::pinocchio::Frame(
+        name, copyOf(frame.parent),
+        previous == frameCopies.end() ? targetFrame : previous->second,
+        place(frame.parent, frame.placement), frame.type));
+  }
+
+  // Geometry objects share their geometry with the original.
+  std::map<pinocchio::GeomIndex, pinocchio::GeomIndex> geoms;
+  const pinocchio::GeomIndex nbGeoms = geomModel.ngeoms;
+  for (pinocchio::GeomIndex g = 0; g < nbGeoms; ++g) {
+    std::map<FrameIndex, FrameIndex>::const_iterator frame(
+        frameCopies.find(geomModel.geometryObjects[g].parentFrame));
+    if (frame == frameCopies.end()) continue;
+    ::pinocchio::GeometryObject object(geomModel.geometryObjects[g]);
+    object.name = renamed(object.name);
+    object.placement = place(object.parentJoint, object.placement);
+    object.parentJoint = copyOf(object.parentJoint);
+    object.parentFrame = frame->second;
+    geoms[g] = geomModel.addGeometryObject(object);
+  }
+
+  // Collision pairs
+  const std::size_t nbPairs = geomModel.collisionPairs.size();
+  for (std::size_t i = 0; i < nbPairs; ++i) {
+    const ::pinocchio::CollisionPair pair(geomModel.collisionPairs[i]);
+    std::map<pinocchio::GeomIndex, pinocchio::GeomIndex>::const_iterator first(
+        geoms.find(pair.first)),
+        second(geoms.find(pair.second));
+    if (first == geoms.end() && second == geoms.end()) continue;
+    ::pinocchio::CollisionPair copy(
+        first == geoms.end() ? pair.first : first->second,
+        second == geoms.end() ? pair.second : second->second);
+    if (!geomModel.existCollisionPair(copy)) geomModel.addCollisionPair(copy);
+  }
+  for (std::map<pinocchio::GeomIndex, pinocchio::GeomIndex>::const_iterator g1 =
+           geoms.begin();
+       g1 != geoms.end(); ++g1) {
+    for (std::map<pinocchio::GeomIndex, pinocchio::GeomIndex>::const_iterator
+             g2 = geoms.begin();
+         g2 != geoms.end(); ++g2) {
+      if (geomModel.geometryObjects[g1->second].parentJoint ==
+          geomModel.geometryObjects[g2->first].parentJoint)
+        continue;
+      ::pinocchio::CollisionPair pair(g1->second, g2->first);
+      if (!geomModel.existCollisionPair(pair)) geomModel.addCollisionPair(pair);
+    }
+  }
+
+  // Grippers
+  std::vector<GripperPtr_t> grippers;
+  for (Container<GripperPtr_t>::Map_t::const_iterator it =
+           robot->grippers.map.begin();
+       it != robot->grippers.map.end(); ++it) {
+    if (it->first.compare(0, prefix.size(), prefix) != 0) continue;
+    GripperPtr_t gripper(Gripper::create(renamed(it->first), robot));
+    gripper->clearance(it->second->clearance());
+    grippers.push_back(gripper);
+  }
+  for (std::size_t i = 0; i < grippers.size(); ++i)
+    robot->grippers.add(grippers[i]->name(), grippers[i]);
+
+  // Handles
+  std::vector<HandlePtr_t> handles;
+  for (Container<HandlePtr_t>::Map_t::const_iterator it =
+           robot->handles.map.begin();
+       it != robot->handles.map.end(); ++it) {
+    if (it->first.compare(0, prefix.size(), prefix) != 0) continue;
+    const HandlePtr_t& in(it->second);
+    pinocchio::JointIndex joint(in->joint() ? in->joint()->index() : 0);
+    HandlePtr_t handle(Handle::create(renamed(it->first),
+                                      place(joint, in->localPosition()), robot,
+                                      jointPtr(copyOf(joint))));
+    handle->clearance(in->clearance());
+    handle->mask(in->mask());
+    handle->maskComp(in->maskComp());
+    handles.push_back(handle);
+  }
+  for (std::size_t i = 0; i < handles.size(); ++i)
+    robot->handles.add(handles[i]->name(), handles[i]);
+
+  // Contact surfaces
+  std::vector<std::pair<std::string, JointAndShapes_t> > contacts;
+  for (Container<JointAndShapes_t>::Map_t::const_iterator it =
+           robot->jointAndShapes.map.begin();
+       it != robot->jointAndShapes.map.end(); ++it) {
+    if (it->first.compare(0, prefix.size(), prefix) != 0) continue;
+    JointAndShapes_t shapes;
+    for (JointAndShapes_t::const_iterator itS = it->second.begin();
+         itS != it->second.end(); ++itS) {
+      pinocchio::JointIndex joint(itS->first ? itS->first->index() : 0);
+      Shape_t shape(itS->second);
+      if (joint == sourceParent) {
+        for (std::size_t i = 0; i < shape.size(); ++i)
+          shape[i] = M.act(shape[i]);
+      }
+      shapes.push_back(JointAndShape_t(jointPtr(copyOf(joint)), shape));
+    }
+    contacts.push_back(std::make_pair(renamed(it->first), shapes));
+  }
+  for (std::size_t i = 0; i < contacts.size(); ++i)
+    robot->jointAndShapes.add(contacts[i].first, contacts[i].second);
+}
+
+/// Copy of the models, grippers, handles and contact surfaces of a device
+///
+/// Used to restore a device after a failed insertion of several models.
+struct DeviceSnapshot {
+  pinocchio::Model model;
+  pinocchio::GeomModel geomModel;
+  Container<GripperPtr_t> grippers;
+  Container<HandlePtr_t> handles;
+  Container<JointAndShapes_t> jointAndShapes;
+
+  explicit DeviceSnapshot(const DevicePtr_t& robot)
+      : model(robot->model()),
+        geomModel(robot->geomModel()),
+        grippers(robot->grippers),
+        handles(robot->handles),
+        jointAndShapes(robot->jointAndShapes) {}
+
+  /// Restore the device and recreate its pinocchio data
+  void restore(const DevicePtr_t& robot) const {
+    robot->model() = model;
+    robot->geomModel() = geomModel;
+    robot->grippers = grippers;
+    robot->handles = handles;
+    robot->jointAndShapes = jointAndShapes;
+    robot->createData();
+    robot->createGeomData();
+  }
+};
+
+/// Resolve package:// and file:// URIs
+/// \return the path of the file, or an empty string if the package is not
+///         found in ROS_PACKAGE_PATH or AMENT_PREFIX_PATH.
+std::string resolvePath(const std::string& path) {
+  const std::string package("package://"), file("file://");
+  if (path.compare(0, file.size(), file) == 0) return path.substr(file.size());
+  if (path.compare(0, package.size(), package) != 0) return path;
+  std::string relative(path.substr(package.size()));
+  const char* variables[2] = {"ROS_PACKAGE_PATH", "AMENT_PREFIX_PATH"};
+  const char* subdirs[2] = {"/", "/share/"};
+  for (std::size_t i = 0; i < 2; ++i) {
+    const char* value = std::getenv(variables[i]);
+    if (!value) continue;
+    std::istringstream dirs(value);
+    std::string dir;
+    while (std::getline(dirs, dir, ':')) {
+      if (dir.empty()) continue;
+      std::string candidate(dir + subdirs[i] + relative);
+      if (std::ifstream(candidate.c_str()).good()) return candidate;
+    }
+  }
+  return std::string();
+}
+
+/// FNV-1a hash of a string, in hexadecimal
+std::string hash(const std::string& content) {
+  return hashToString(fnv1a(content));
+}
+
+/// Models shared by all the problems and servers of the process
+///
+/// Parsing a model and loading its meshes may take seconds. Environment and
+/// robot devices are not modified once loaded and are thus shared by the
+/// problems that load the same model. Models are identified by the prefix,
+/// the paths and a hash of the content of the URDF and SRDF files. Meshes
+/// are not hashed: call Robot::clearModelCache if they change.
+///
+/// The mutex only protects the map: models are parsed, and appended to the
+/// devices of the problems, without holding it.
+struct ModelCache {
+  std::mutex mutex;
+  std::map<std::string, DevicePtr_t> models;
+
+  /// Key of a model loaded from files
+  /// \return an empty string if a file cannot be read.
+  std::string fileKey(const std::string& prefix, const std::string& urdfName,
+                      const std::string& srdfName) {
+    std::string key("file:" + prefix);
+    const std::string* names[2] = {&urdfName, &srdfName};
+    for (std::size_t i = 0; i < 2; ++i) {
+      std::string content;
+      if (!names[i]->empty()) {
+        std::string path(resolvePath(*names[i]));
+        std::ifstream f(path.c_str(), std::ios::in | std::ios::binary);
+        if (path.empty() || !f.is_open()) return std::string();
+        content.assign(std::istreambuf_iterator<char>(f),
+                       std::istreambuf_iterator<char>());
+        key += '\0' + path;
+      }
+      key += '\0' + hash(content);
+    }
+    return key;
+  }
+
+  /// Key of a model loaded from strings
+  std::string stringKey(const std::string& prefix,
+                        const std::string& urdfString,
+                        const std::string& srdfString) {
+    return "string:" + prefix + '\0' + hash(urdfString) + '\0' +
+           hash(srdfString);
+  }
+
+  DevicePtr_t find(const std::string& key) {
+    std::lock_guard<std::mutex> lock(mutex);
+    std::map<std::string, DevicePtr_t>::const_iterator it(models.find(key));
+    if (key.empty() || it == models.end()) return DevicePtr_t();
+    return it->second;
+  }
+
+  /// Insert a model
+  /// \return the model stored with this key, that is the model inserted by
+  ///         another thread in the meantime, if any.
+  DevicePtr_t insert(const std::string& key, const DevicePtr_t& model) {
+    if (key.empty()) return model;
+    std::lock_guard<std::mutex> lock(mutex);
+    return models.insert(std::make_pair(key, model)).first->second;
+  }
+
+  void clear() {
+    std::lock_guard<std::mutex> lock(mutex);
+    models.clear();
+  }
+};
+
+ModelCache& modelCache() {
+  static ModelCache cache;
+  return cache;
+}
+
+/// Get a model from the cache, or load it in a new device and cache it
+/// \param name name of the new device,
+/// \param key key of the model, see ModelCache::fileKey and
+///        ModelCache::stringKey,
+/// \param load function that loads the model in the new device.
+DevicePtr_t cachedModel(const std::string& name, const std::string& key,
+                        const std::function<void(const DevicePtr_t&)>& load) {
+  ModelCache& cache(modelCache());
+  DevicePtr_t object(cache.find(key));
+  if (object) return object;
+  object = Device::create(name);
+  load(object);
+  return cache.insert(key, object);
+}
+
+/// Key prefix of robot models, that cannot collide with the prefix of an
+/// environment since CORBA strings do not contain null characters.
+std::string robotKey(const char* kind, const std::string& robotName,
+                     const std::string& rootJointType) {
+  return std::string(kind) + '\0' + robotName + '\0' + rootJointType;
+}
+
+/// Append a robot model loaded in another device
+///
+/// Joints, frames and geometry objects of object are appended to robot, the
+/// root of object being placed on frame, as pinocchio::urdf::loadModel does.
+/// Collision geometries are shared with object. Grippers, handles and
+/// contact surfaces are copied. Elements attached to the universe in object
+/// are attached to the parent joint of frame.
+void appendModel(const DevicePtr_t& robot, const DevicePtr_t& object,
+                 FrameIndex frame) {
+  const Transform3s M(robot->model().frames[frame].placement);
+  const pinocchio::JointIndex parent(robot->model().frames[frame].parent);
+  pinocchio::Model model;
+  pinocchio::GeomModel geomModel;
+  ::pinocchio::appendModel(robot->model(), object->model(), robot->geomModel(),
+                           object->geomModel(), frame, Transform3s::Identity(),
+                           model, geomModel);
+  robot->model() = model;
+  robot->geomModel() = geomModel;
+  robot->createData();
+  robot->createGeomData();
+
+  auto jointPtr = [&robot, parent](const JointPtr_t& joint) {
+    if (joint) return robot->getJointByName(joint->name());
+    if (parent == 0) return JointPtr_t();
+    return robot->getJointByName(robot->model().names[parent]);
+  };
+  auto place = [&M](const JointPtr_t& joint, const Transform3s& position) {
+    return joint ? position : Transform3s(M * position);
+  };
+
+  for (Container<GripperPtr_t>::Map_t::const_iterator it =
+           object->grippers.map.begin();
+       it != object->grippers.map.end(); ++it) {
+    GripperPtr_t gripper(Gripper::create(it->first, robot));
+    gripper->clearance(it->second->clearance());
+    robot->grippers.add(it->first, gripper);
+  }
+  for (Container<HandlePtr_t>::Map_t::const_iterator it =
+           object->handles.map.begin();
+       it != object->handles.map.end(); ++it) {
+    const HandlePtr_t& in(it->second);
+    HandlePtr_t handle(Handle::create(it->first,
+                                      place(in->joint(), in->localPosition()),
+                                      robot, jointPtr(in->joint())));
+    handle->clearance(in->clearance());
+    handle->mask(in->mask());
+    handle->maskComp(in->maskComp());
+    robot->handles.add(it->first, handle);
+  }
+  for (Container<JointAndShapes_t>::Map_t::const_iterator it =
+           object->jointAndShapes.map.begin();
+       it != object->jointAndShapes.map.end(); ++it) {
+    JointAndShapes_t shapes;
+    for (JointAndShapes_t::const_iterator itS = it->second.begin();
+         itS != it->second.end(); ++itS) {
+      Shape_t shape(itS->second);
+      if (!itS->first) {
+        for (std::size_t i = 0; i < shape.size(); ++i)
+          shape[i] = M.act(shape[i]);
+      }
+      shapes.push_back(JointAndShape_t(jointPtr(itS->first), shape));
+    }
+    robot->jointAndShapes.add(it->first, shapes);
+  }
+}
+
+/// Add obstacles, contact surfaces, handles and grippers of an environment
+void addEnvironment(const ProblemSolverPtr_t& ps, const DevicePtr_t& robot,
+                    const DevicePtr_t& object, const std::string& p) {
+  // Detach objects from joints
+  ps->addObstacle(object, true, true);
+
+  // Add contact shapes.
+  typedef core::Container<JointAndShapes_t>::Map_t ShapeMap;
+  const ShapeMap& m = object->jointAndShapes.map;
+  for (ShapeMap::const_iterator it = m.begin(); it != m.end(); it++) {
+    JointAndShapes_t shapes;
+    for (JointAndShapes_t::const_iterator itT = it->second.begin();
+         itT != it->second.end(); ++itT) {
+      Transform3s M(Transform3s::Identity());
+      if (itT->first) M = itT->first->currentTransformation();
+      Shape_t newShape(itT->second.size());
+      for (std::size_t i = 0; i < newShape.size(); ++i)
+        newShape[i] = M.act(itT->second[i]);
+      shapes.push_back(JointAndShape_t(JointPtr_t(), newShape));
+    }
+    ps->jointAndShapes.add(p + it->first, shapes);
+  }
+
+  copy(object->handles, robot->handles, robot, p);
+  copy(object->grippers, robot->grippers, robot, p);
+  ps->resetProblem();
+}
+
+CORBA::Long jointIndex(const JointPtr_t& joint) {
+  return joint ? (CORBA::Long)joint->index() : 0;
+}
+
+template <typename Element_t>
+void toFrameInfos(const core::Container<Element_t>& from, FrameInfos& to) {
+  to.length((ULong)from.map.size());
+  ULong i = 0;
+  for (typename core::Container<Element_t>::Map_t::const_iterator it =
+           from.map.begin();
+       it != from.map.end(); ++it, ++i) {
+    to[i].name = it->first.c_str();
+    to[i].joint = jointIndex(it->second->joint());
+    to[i].clearance = it->second->clearance();
+  }
+}
+
+void toContactInfos(const core::Container<JointAndShapes_t>& from,
+                    ContactInfos& to) {
+  to.length((ULong)from.map.size());
+  ULong i = 0;
+  for (core::Container<JointAndShapes_t>::Map_t::const_iterator it =
+           from.map.begin();
+       it != from.map.end(); ++it, ++i) {
+    const JointAndShapes_t& js(it->second);
+    ContactInfo& info(to[i]);
+    info.name = it->first.c_str();
+    info.joints.length((ULong)js.size());
+    info.indexes.length((ULong)js.size());
+    std::size_t nbPts = 0;
+    for (std::size_t j = 0; j < js.size(); ++j) {
+      info.joints[(ULong)j] = jointIndex(js[j].first);
+      nbPts += js[j].second.size();
+      info.indexes[(ULong)j] = (CORBA::Long)nbPts;
+    }
+    info.points.length((ULong)(3 * nbPts));
+    ULong k = 0;
+    for (std::size_t j = 0; j < js.size(); ++j)
+      for (std::size_t l = 0; l < js[j].second.size(); ++l)
+        for (int m = 0; m < 3; ++m) info.points[k++] = js[j].second[l][m];
+  }
+}
 }  // namespace
 
 Robot::Robot() : server_(0x0) {}
@@ -140,11 +643,17 @@ void Robot::insertRobotModelOnFrame(const char* robotName,
     if (!robot->model().existFrame(frameName))
       HPP_THROW(std::invalid_argument, "No frame named " << frameName << ".");
     pinocchio::FrameIndex frame = robot->model().getFrameId(frameName);
-    pinocchio::urdf::loadModel(robot, frame, robotName, rootJointType, urdfName,
-                               srdfName);
-    if (!std::string(srdfName).empty()) {
-      srdf::loadModelFromFile(robot, robotName, srdfName);
-    }
+    std::string key(modelCache().fileKey(
+        robotKey("robot", robotName, rootJointType), urdfName, srdfName));
+    DevicePtr_t object(
+        cachedModel(robotName, key, [&](const DevicePtr_t& device) {
+          pinocchio::urdf::loadModel(device, 0, robotName, rootJointType,
+                                     urdfName, srdfName);
+          if (!std::string(srdfName).empty()) {
+            srdf::loadModelFromFile(device, robotName, srdfName);
+          }
+        }));
+    appendModel(robot, object, frame);
     problemSolver()->resetProblem();
   } catch (const std::exception& exc) {
     throw Error(exc.what());
@@ -172,10 +681,102 @@ void Robot::insertRobotModelOnFrameFromString(const char* robotName,
     if (!robot->model().existFrame(frameName))
       HPP_THROW(std::invalid_argument, "No frame named " << frameName << ".");
     pinocchio::FrameIndex frame = robot->model().getFrameId(frameName);
+    std::string key(modelCache().stringKey(
+        robotKey("robot", robotName, rootJointType), urdfString, srdfString));
+    DevicePtr_t object(
+        cachedModel(robotName, key, [&](const DevicePtr_t& device) {
+          pinocchio::urdf::loadModelFromString(
+              device, 0, robotName, rootJointType, urdfString, srdfString);
+          srdf::loadModelFromXML(device, robotName, srdfString);
+        }));
+    appendModel(robot, object, frame);
+    problemSolver()->resetProblem();
+  } catch (const std::exception& exc) {
+    throw Error(exc.what());
+  }
+}
 
-    pinocchio::urdf::loadModelFromString(robot, frame, robotName, rootJointType,
-                                         urdfString, srdfString);
-    srdf::loadModelFromXML(robot, robotName, srdfString);
+void Robot::insertRobotModels(const RobotModels& models,
+                              CORBA::Boolean fromString) {
+  try {
+    DevicePtr_t robot = getOrCreateRobot(problemSolver());
+    std::vector<std::string> names, frames;
+    for (CORBA::ULong i = 0; i < models.length(); ++i) {
+      std::string name(models[i].name), frame(models[i].frame);
+      if (frame.empty()) frame = "universe";
+      if (robot->robotFrames(name).size() > 0 ||
+          std::find(names.begin(), names.end(), name) != names.end())
+        HPP_THROW(std::invalid_argument,
+                  "A robot named " << name << " already exists");
+      // The frame may belong to a model inserted before.
+      bool frameExists = robot->model().existFrame(frame);
+      for (std::size_t j = 0; j < names.size() && !frameExists; ++j)
+        frameExists =
+            (frame.compare(0, names[j].size() + 1, names[j] + "/") == 0);
+      if (!frameExists)
+        HPP_THROW(std::invalid_argument, "No frame named " << frame << ".");
+      if (!fromString) {
+        std::string files[2] = {std::string(models[i].urdf),
+                                std::string(models[i].srdf)};
+        for (std::size_t j = 0; j < 2; ++j) {
+          if (j == 1 && files[j].empty()) continue;
+          std::string path(resolvePath(files[j]));
+          if (path.empty() || !std::ifstream(path.c_str()).good())
+            HPP_THROW(std::invalid_argument, "Cannot read " << files[j] << ".");
+        }
+      }
+      names.push_back(name);
+      frames.push_back(frame);
+    }
+
+    // If a model fails to load, the models inserted before are removed.
+    DeviceSnapshot snapshot(robot);
+    try {
+      for (CORBA::ULong i = 0; i < models.length(); ++i) {
+        const RobotModel& m(models[i]);
+        if (!robot->model().existFrame(frames[i]))
+          HPP_THROW(std::invalid_argument,
+                    "No frame named " << frames[i] << ".");
+        pinocchio::FrameIndex frame = robot->model().getFrameId(frames[i]);
+        if (fromString) {
+          pinocchio::urdf::loadModelFromString(
+              robot, frame, names[i], std::string(m.rootJointType),
+              std::string(m.urdf), std::string(m.srdf));
+          srdf::loadModelFromXML(robot, names[i], std::string(m.srdf));
+        } else {
+          pinocchio::urdf::loadModel(robot, frame, names[i],
+                                     std::string(m.rootJointType),
+                                     std::string(m.urdf), std::string(m.srdf));
+          if (!std::string(m.srdf).empty())
+            srdf::loadModelFromFile(robot, names[i], std::string(m.srdf));
+        }
+      }
+    } catch (const std::exception&) {
+      snapshot.restore(robot);
+      throw;
+    }
+    problemSolver()->resetProblem();
+  } catch (const std::exception& exc) {
+    throw Error(exc.what());
+  }
+}
+
+void Robot::cloneRobotModel(const char* robotName, const Names_t& newNames,
+                            const Names_t& frameNames) {
+  try {
+    DevicePtr_t robot = getRobotOrThrow(problemSolver());
+    if (newNames.length() != frameNames.length()) {
+      HPP_THROW(std::invalid_argument,
+                "Got " << newNames.length() << " names and "
+                       << frameNames.length() << " frames.");
+    }
+    for (CORBA::ULong i = 0; i < newNames.length(); ++i) {
+      cloneModel(robot, robotName, std::string(newNames[i]),
+                 std::string(frameNames[i]));
+    }
+    // Recreate pinocchio data after modifying model
+    robot->createData();
+    robot->createGeomData();
     problemSolver()->resetProblem();
   } catch (const std::exception& exc) {
     throw Error(exc.what());
@@ -213,10 +814,16 @@ void Robot::insertHumanoidModel(const char* robotName,
     if (robot->robotFrames(robotName).size() > 0)
       HPP_THROW(std::invalid_argument,
                 "A robot named " << robotName << " already exists");
-    pinocchio::urdf::loadModel(robot, 0, robotName, rootJointType, urdfName,
-                               srdfName);
+    std::string key(modelCache().fileKey(
+        robotKey("humanoid", robotName, rootJointType), urdfName, srdfName));
+    DevicePtr_t object(
+        cachedModel(robotName, key, [&](const DevicePtr_t& device) {
+          pinocchio::urdf::loadModel(device, 0, robotName, rootJointType,
+                                     urdfName, srdfName);
+          srdf::loadModelFromFile(device, robotName, srdfName);
+        }));
+    appendModel(robot, object, 0);
     pinocchio::urdf::setupHumanoidRobot(robot, robotName);
-    srdf::loadModelFromFile(robot, robotName, srdfName);
     problemSolver()->resetProblem();
   } catch (const std::exception& exc) {
     throw Error(exc.what());
@@ -232,10 +839,16 @@ void Robot::insertHumanoidModelFromString(const char* robotName,
     if (robot->robotFrames(robotName).size() > 0)
       HPP_THROW(std::invalid_argument,
                 "A robot named " << robotName << " already exists");
-    pinocchio::urdf::loadModelFromString(robot, 0, robotName, rootJointType,
-                                         urdfString, srdfString);
+    std::string key(modelCache().stringKey(
+        robotKey("humanoid", robotName, rootJointType), urdfString, srdfString));
+    DevicePtr_t object(
+        cachedModel(robotName, key, [&](const DevicePtr_t& device) {
+          pinocchio::urdf::loadModelFromString(
+              device, 0, robotName, rootJointType, urdfString, srdfString);
+          srdf::loadModelFromXML(device, robotName, srdfString);
+        }));
+    appendModel(robot, object, 0);
     pinocchio::urdf::setupHumanoidRobot(robot, robotName);
-    srdf::loadModelFromXML(robot, robotName, srdfString);
     problemSolver()->resetProblem();
   } catch (const std::exception& exc) {
     throw Error(exc.what());
@@ -248,35 +861,14 @@ void Robot::loadEnvironmentModel(const char* urdfName, const char* srdfName,
     DevicePtr_t robot = getRobotOrThrow(problemSolver());
 
     std::string p(prefix);
-    DevicePtr_t object = Device::create(p);
-    pinocchio::urdf::loadModel(object, 0, "", "anchor", urdfName, "");
-    srdf::loadModelFromFile(object, "", srdfName);
-    object->computeForwardKinematics(pinocchio::JOINT_POSITION);
-    object->updateGeometryPlacements();
-
-    // Detach objects from joints
-    problemSolver()->addObstacle(object, true, true);
-
-    // Add contact shapes.
-    typedef core::Container<JointAndShapes_t>::Map_t ShapeMap;
-    const ShapeMap& m = object->jointAndShapes.map;
-    for (ShapeMap::const_iterator it = m.begin(); it != m.end(); it++) {
-      JointAndShapes_t shapes;
-      for (JointAndShapes_t::const_iterator itT = it->second.begin();
-           itT != it->second.end(); ++itT) {
-        Transform3s M(Transform3s::Identity());
-        if (itT->first) M = itT->first->currentTransformation();
-        Shape_t newShape(itT->second.size());
-        for (std::size_t i = 0; i < newShape.size(); ++i)
-          newShape[i] = M.act(itT->second[i]);
-        shapes.push_back(JointAndShape_t(JointPtr_t(), newShape));
-      }
-      problemSolver()->jointAndShapes.add(p + it->first, shapes);
-    }
-
-    copy(object->handles, robot->handles, robot, p);
-    copy(object->grippers, robot->grippers, robot, p);
-    problemSolver()->resetProblem();
+    std::string key(modelCache().fileKey(p, urdfName, srdfName));
+    DevicePtr_t object(cachedModel(p, key, [&](const DevicePtr_t& device) {
+      pinocchio::urdf::loadModel(device, 0, "", "anchor", urdfName, "");
+      srdf::loadModelFromFile(device, "", srdfName);
+      device->computeForwardKinematics(pinocchio::JOINT_POSITION);
+      device->updateGeometryPlacements();
+    }));
+    addEnvironment(problemSolver(), robot, object, p);
   } catch (const std::exception& exc) {
     throw hpp::Error(exc.what());
   }
@@ -289,37 +881,24 @@ void Robot::loadEnvironmentModelFromString(const char* urdfString,
     DevicePtr_t robot = getRobotOrThrow(problemSolver());
 
     std::string p(prefix);
-    DevicePtr_t object = Device::create(p);
-    // TODO replace "" by p and remove `p +` in what follows
-    pinocchio::urdf::loadModelFromString(object, 0, "", "anchor", urdfString,
-                                         srdfString);
-    srdf::loadModelFromXML(object, "", srdfString);
-    object->computeForwardKinematics(hpp::pinocchio::JOINT_POSITION);
-    object->updateGeometryPlacements();
-
-    // Detach objects from joints
-    problemSolver()->addObstacle(object, true, true);
-
-    // Add contact shapes.
-    typedef core::Container<JointAndShapes_t>::Map_t ShapeMap;
-    const ShapeMap& m = object->jointAndShapes.map;
-    for (ShapeMap::const_iterator it = m.begin(); it != m.end(); it++) {
-      JointAndShapes_t shapes;
-      for (JointAndShapes_t::const_iterator itT = it->second.begin();
-           itT != it->second.end(); ++itT) {
-        Transform3s M(Transform3s::Identity());
-        if (itT->first) M = itT->first->currentTransformation();
-        Shape_t newShape(itT->second.size());
-        for (std::size_t i = 0; i < newShape.size(); ++i)
-          newShape[i] = M.act(itT->second[i]);
-        shapes.push_back(JointAndShape_t(JointPtr_t(), newShape));
-      }
-      problemSolver()->jointAndShapes.add(p + it->first, shapes);
-    }
+    std::string key(modelCache().stringKey(p, urdfString, srdfString));
+    DevicePtr_t object(cachedModel(p, key, [&](const DevicePtr_t& device) {
+      // TODO replace "" by p and remove `p +` in what follows
+      pinocchio::urdf::loadModelFromString(device, 0, "", "anchor", urdfString,
+                                           srdfString);
+      srdf::loadModelFromXML(device, "", srdfString);
+      device->computeForwardKinematics(hpp::pinocchio::JOINT_POSITION);
+      device->updateGeometryPlacements();
+    }));
+    addEnvironment(problemSolver(), robot, object, p);
+  } catch (const std::exception& exc) {
+    throw hpp::Error(exc.what());
+  }
+}
 
-    copy(object->handles, robot->handles, robot, p);
-    copy(object->grippers, robot->grippers, robot, p);
-    problemSolver()->resetProblem();
+void Robot::clearModelCache() {
+  try {
+    modelCache().clear();
   } catch (const std::exception& exc) {
     throw hpp::Error(exc.what());
   }
@@ -480,6 +1059,59 @@ void Robot::setHandlePositionInJoint(const char* handleName,
   }
 }
 
+DeviceInfo* Robot::getDeviceInfo() {
+  try {
+    DevicePtr_t robot = getRobotOrThrow(problemSolver());
+    const pinocchio::Model& model = robot->model();
+    DeviceInfo* info = new DeviceInfo();
+    DeviceInfo_var res(info);
+
+    // Robot names are the prefixes of frame names, in order of insertion.
+    std::vector<std::string> robotNames;
+    for (std::size_t i = 0; i < model.frames.size(); ++i) {
+      const std::string& name = model.frames[i].name;
+      std::size_t pos = name.find('/');
+      if (pos == std::string::npos) continue;
+      std::string prefix(name.substr(0, pos));
+      if (std::find(robotNames.begin(), robotNames.end(), prefix) ==
+          robotNames.end())
+        robotNames.push_back(prefix);
+    }
+    info->robotNames.length((ULong)robotNames.size());
+    for (std::size_t i = 0; i < robotNames.size(); ++i)
+      info->robotNames[(ULong)i] = robotNames[i].c_str();
+
+    info->jointNames.length((ULong)model.njoints);
+    info->parentJoints.length((ULong)model.njoints);
+    for (std::size_t i = 0; i < (std::size_t)model.njoints; ++i) {
+      info->jointNames[(ULong)i] = model.names[i].c_str();
+      info->parentJoints[(ULong)i] =
+          (i == 0 ? -1 : (CORBA::Long)model.parents[i]);
+    }
+
+    toFrameInfos(robot->grippers, info->grippers);
+    ULong i = 0;
+    for (Container<GripperPtr_t>::Map_t::const_iterator it =
+             robot->grippers.map.begin();
+         it != robot->grippers.map.end(); ++it, ++i)
+      Transform3sTohppTransform(it->second->objectPositionInJoint(),
+                                info->grippers[i].position);
+    toFrameInfos(robot->handles, info->handles);
+    i = 0;
+    for (Container<HandlePtr_t>::Map_t::const_iterator it =
+             robot->handles.map.begin();
+         it != robot->handles.map.end(); ++it, ++i)
+      Transform3sTohppTransform(it->second->localPosition(),
+                                info->handles[i].position);
+
+    toContactInfos(robot->jointAndShapes, info->robotContacts);
+    toContactInfos(problemSolver()->jointAndShapes, info->environmentContacts);
+    return res._retn();
+  } catch (const std::exception& exc) {
+    throw Error(exc.what());
+  }
+}
+
 }  // namespace impl
 }  // namespace manipulation
 }  // namespace hpp
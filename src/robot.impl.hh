@@ -38,6 +38,13 @@ namespace hpp {
 namespace manipulation {
 namespace impl {
 using CORBA::Short;
+using hpp::corbaserver::manipulation::ContactInfo;
+using hpp::corbaserver::manipulation::ContactInfos;
+using hpp::corbaserver::manipulation::DeviceInfo;
+using hpp::corbaserver::manipulation::DeviceInfo_var;
+using hpp::corbaserver::manipulation::FrameInfos;
+using hpp::corbaserver::manipulation::RobotModel;
+using hpp::corbaserver::manipulation::RobotModels;
 
 class Robot : public virtual POA_hpp::corbaserver::manipulation::Robot {
  public:
@@ -66,6 +73,12 @@ class Robot : public virtual POA_hpp::corbaserver::manipulation::Robot {
                                                  const char* urdfString,
                                                  const char* srdfString);
 
+  virtual void insertRobotModels(const RobotModels& models,
+                                 CORBA::Boolean fromString);
+
+  virtual void cloneRobotModel(const char* robotName, const Names_t& newNames,
+                               const Names_t& frameNames);
+
   virtual void insertRobotSRDFModel(const char* robotName,
                                     const char* srdfPath);
 
@@ -88,6 +101,8 @@ class Robot : public virtual POA_hpp::corbaserver::manipulation::Robot {
                                               const char* srdfString,
                                               const char* prefix);
 
+  virtual void clearModelCache();
+
   virtual Transform__slice* getRootJointPosition(const char* robotName);
 
   virtual void setRootJointPosition(const char* robotName,
@@ -110,6 +125,8 @@ class Robot : public virtual POA_hpp::corbaserver::manipulation::Robot {
   virtual void setHandlePositionInJoint(const char* handleName,
                                         const ::hpp::Transform_ position);
 
+  virtual DeviceInfo* getDeviceInfo();
+
  private:
   ProblemSolverPtr_t problemSolver();
   Server* server_;
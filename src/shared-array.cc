@@ -0,0 +1,88 @@
+// Copyright (c) 2026 CNRS
+//
+
+// Redistribution and use in source and binary forms, with or without
+// modification, are permitted provided that the following conditions are
+// met:
+//
+// 1. Redistributions of source code must retain the above copyright
+//    notice, this list of conditions and the following disclaimer.
+//
+// 2. Redistributions in binary form must reproduce the above copyright
+// notice, this list of conditions and the following disclaimer in the
+// documentation and/or other materials provided with the distribution.
+//
+// THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+// "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+// LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+// A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+// HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+// SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+// LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+// DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+// THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+// (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+// OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH
+// DAMAGE.
+
+#include "shared-array.hh"
+
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+#include <hpp/util/exception-factory.hh>
+#include <stdexcept>
+#include <string>
+
+namespace hpp {
+namespace manipulation {
+namespace impl {
+SharedArrayMapping::SharedArrayMapping(const hpp::SharedArray& array,
+                                       std::size_t rows, std::size_t cols,
+                                       bool writable)
+    : base_(NULL), size_(0), data_(NULL), rows_(rows), cols_(cols) {
+  // Only POSIX shared memory segments can be mapped, so that a client cannot
+  // make the server read or write another file.
+  std::string name(array.segment);
+  if (name.empty() || name == "." || name == ".." ||
+      name.find('/') != std::string::npos)
+    HPP_THROW(std::invalid_argument,
+              "Invalid shared memory segment name \"" << name << "\".");
+  std::string segment("/dev/shm/" + name);
+  if (array.rows != rows || array.cols != cols)
+    HPP_THROW(std::runtime_error, "Array in " << segment << " has shape ("
+                                              << array.rows << ", "
+                                              << array.cols << "), expected ("
+                                              << rows << ", " << cols << ").");
+  std::size_t offset((std::size_t)array.offset);
+  if (offset % sizeof(value_type) != 0)
+    HPP_THROW(std::runtime_error,
+              "Offset " << offset << " in " << segment << " is not aligned.");
+  if (rows * cols == 0) return;
+
+  int fd = ::open(segment.c_str(), (writable ? O_RDWR : O_RDONLY) | O_NOFOLLOW);
+  if (fd < 0) HPP_THROW(std::runtime_error, "Failed to open " << segment);
+  struct stat st;
+  size_ = offset + rows * cols * sizeof(value_type);
+  if (::fstat(fd, &st) != 0 || (std::size_t)st.st_size < size_) {
+    ::close(fd);
+    HPP_THROW(std::runtime_error, segment << " is smaller than the array.");
+  }
+  base_ = ::mmap(NULL, size_, writable ? PROT_READ | PROT_WRITE : PROT_READ,
+                 MAP_SHARED, fd, 0);
+  ::close(fd);
+  if (base_ == MAP_FAILED) {
+    base_ = NULL;
+    HPP_THROW(std::runtime_error, "Failed to map " << segment);
+  }
+  data_ = reinterpret_cast<value_type*>(static_cast<char*>(base_) + offset);
+}
+
+SharedArrayMapping::~SharedArrayMapping() {
+  if (base_ != NULL) ::munmap(base_, size_);
+}
+}  // namespace impl
+}  // namespace manipulation
+}  // namespace hpp
@@ -0,0 +1,84 @@
+// Copyright (c) 2026 CNRS
+//
+
+// Redistribution and use in source and binary forms, with or without
+// modification, are permitted provided that the following conditions are
+// met:
+//
+// 1. Redistributions of source code must retain the above copyright
+//    notice, this list of conditions and the following disclaimer.
+//
+// 2. Redistributions in binary form must reproduce the above copyright
+// notice, this list of conditions and the following disclaimer in the
+// documentation and/or other materials provided with the distribution.
+//
+// THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+// "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+// LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+// A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+// HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+// SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+// LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+// DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+// THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+// (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+// OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH
+// DAMAGE.
+
+#ifndef HPP_MANIPULATION_CORBA_SHARED_ARRAY_HH
+#define HPP_MANIPULATION_CORBA_SHARED_ARRAY_HH
+
+#include <cstddef>
+#include <hpp/manipulation/fwd.hh>
+
+#include "hpp/corbaserver/manipulation/gcommon-idl.hh"
+
+namespace hpp {
+namespace manipulation {
+namespace impl {
+/// Memory mapping of an array shared with the client
+///
+/// The array is stored in a POSIX shared memory segment, the file
+/// /dev/shm/<name> on Linux, row after row, from a byte offset. Mapping the
+/// segment gives access to the array without copying it.
+///
+/// Configurations are stored one per row, which is the memory layout of a
+/// column major matrix with one configuration per column, see matrix.
+class SharedArrayMapping {
+ public:
+  typedef Eigen::Map<matrix_t> MatrixMap_t;
+
+  /// Map an array of float64
+  /// \param writable whether the array is modified,
+  /// \param rows, cols expected shape of the array.
+  /// \throw std::invalid_argument if the name of the segment contains a
+  ///        path separator,
+  /// \throw std::runtime_error if the shape is not the expected one, if the
+  ///        segment cannot be mapped or if it is too small.
+  SharedArrayMapping(const hpp::SharedArray& array, std::size_t rows,
+                     std::size_t cols, bool writable);
+
+  ~SharedArrayMapping();
+
+  std::size_t rows() const { return rows_; }
+  std::size_t cols() const { return cols_; }
+
+  /// The array as a cols x rows matrix
+  MatrixMap_t matrix() const {
+    return MatrixMap_t(data_, (size_type)cols_, (size_type)rows_);
+  }
+
+ private:
+  SharedArrayMapping(const SharedArrayMapping&);
+  SharedArrayMapping& operator=(const SharedArrayMapping&);
+
+  void* base_;
+  std::size_t size_;
+  value_type* data_;
+  std::size_t rows_, cols_;
+};
+}  // namespace impl
+}  // namespace manipulation
+}  // namespace hpp
+
+#endif  // HPP_MANIPULATION_CORBA_SHARED_ARRAY_HH
@@ -0,0 +1,158 @@
+// Copyright (c) 2026 CNRS
+//
+
+// Redistribution and use in source and binary forms, with or without
+// modification, are permitted provided that the following conditions are
+// met:
+//
+// 1. Redistributions of source code must retain the above copyright
+//    notice, this list of conditions and the following disclaimer.
+//
+// 2. Redistributions in binary form must reproduce the above copyright
+// notice, this list of conditions and the following disclaimer in the
+// documentation and/or other materials provided with the distribution.
+//
+// THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+// "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+// LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+// A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+// HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+// SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+// LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+// DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+// THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+// (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+// OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH
+// DAMAGE.
+
+#include "state-index.hh"
+
+#include <hpp/constraints/differentiable-function.hh>
+#include <hpp/constraints/implicit.hh>
+#include <hpp/core/config-projector.hh>
+#include <hpp/manipulation/constraint-set.hh>
+#include <hpp/manipulation/graph/graph.hh>
+#include <hpp/manipulation/graph/state-selector.hh>
+#include <hpp/manipulation/graph/state.hh>
+#include <hpp/pinocchio/configuration.hh>
+#include <sstream>
+#include <stdexcept>
+
+namespace hpp {
+namespace manipulation {
+namespace impl {
+namespace {
+/// Maximal number of signatures kept in the hash table
+const std::size_t maxNbSignatures = 100000;
+}  // namespace
+
+StateIndex::StateIndex(const graph::GraphPtr_t& graph) : graph_(graph) {}
+
+graph::StatePtr_t StateIndex::getState(ConfigurationIn_t config) {
+  std::lock_guard<std::mutex> lock(mutex_);
+  update();
+  Signature_t signature(tests_.size());
+  for (std::size_t i = 0; i < tests_.size(); ++i) {
+    const Test& test(tests_[i]);
+    error_.resize(test.constraint->function().outputDerivativeSize());
+    bool found;
+    bool satisfied = test.projector->isConstraintSatisfied(
+        test.constraint, config, error_, found);
+    signature[i] = satisfied || !found;
+  }
+  const std::vector<std::size_t>& states(candidates(signature));
+  for (std::size_t i = 0; i < states.size(); ++i) {
+    if (states_[states[i]]->contains(config)) return states_[states[i]];
+  }
+  std::stringstream oss;
+  oss << "A configuration has no node:" << pinocchio::displayConfig(config);
+  throw std::logic_error(oss.str());
+}
+
+void StateIndex::update() {
+  graph::GraphPtr_t graph(graph_.lock());
+  if (!graph) throw std::runtime_error("The graph was destroyed.");
+  if (!graph->stateSelector())
+    throw std::runtime_error("Graph has no state selector.");
+  graph::States_t states(graph->stateSelector()->getStates());
+  std::vector<ConstraintSetPtr_t> configConstraints;
+  std::vector<vector_t> rightHandSides;
+  configConstraints.reserve(states.size());
+  rightHandSides.reserve(states.size());
+  bool upToDate = (states.size() == states_.size());
+  std::size_t i = 0;
+  for (graph::States_t::const_iterator it = states.begin(); it != states.end();
+       ++it, ++i) {
+    configConstraints.push_back((*it)->configConstraint());
+    core::ConfigProjectorPtr_t projector;
+    if (configConstraints.back())
+      projector = configConstraints.back()->configProjector();
+    rightHandSides.push_back(projector ? projector->rightHandSide()
+                                       : vector_t());
+    // Tests are merged according to the right hand sides of the states.
+    if (upToDate && (states_[i] != *it ||
+                     configConstraints_[i] != configConstraints.back() ||
+                     rightHandSides_[i].size() != rightHandSides[i].size() ||
+                     rightHandSides_[i] != rightHandSides[i]))
+      upToDate = false;
+  }
+  if (upToDate) return;
+
+  states_.assign(states.begin(), states.end());
+  configConstraints_.swap(configConstraints);
+  rightHandSides_.swap(rightHandSides);
+  tests_.clear();
+  stateTests_.assign(states_.size(), std::vector<std::size_t>());
+  candidates_.clear();
+  for (std::size_t s = 0; s < states_.size(); ++s) {
+    if (!configConstraints_[s]) continue;
+    core::ConfigProjectorPtr_t projector(
+        configConstraints_[s]->configProjector());
+    if (!projector) continue;
+    const core::NumericalConstraints_t& constraints(
+        projector->numericalConstraints());
+    for (core::NumericalConstraints_t::const_iterator it = constraints.begin();
+         it != constraints.end(); ++it)
+      stateTests_[s].push_back(testIndex(projector, *it));
+  }
+}
+
+std::size_t StateIndex::testIndex(
+    const core::ConfigProjectorPtr_t& projector,
+    const constraints::ImplicitPtr_t& constraint) {
+  vector_t rhs(constraint->rightHandSideSize()),
+      other(constraint->rightHandSideSize());
+  projector->getRightHandSide(constraint, rhs);
+  for (std::size_t i = 0; i < tests_.size(); ++i) {
+    const Test& test(tests_[i]);
+    if (test.constraint != constraint ||
+        test.projector->errorThreshold() != projector->errorThreshold())
+      continue;
+    test.projector->getRightHandSide(constraint, other);
+    if (other == rhs) return i;
+  }
+  Test test;
+  test.projector = projector;
+  test.constraint = constraint;
+  tests_.push_back(test);
+  return tests_.size() - 1;
+}
+
+const std::vector<std::size_t>& StateIndex::candidates(
+    const Signature_t& signature) {
+  std::unordered_map<Signature_t, std::vector<std::size_t> >::const_iterator it(
+      candidates_.find(signature));
+  if (it != candidates_.end()) return it->second;
+  if (candidates_.size() >= maxNbSignatures) candidates_.clear();
+  std::vector<std::size_t>& res(candidates_[signature]);
+  for (std::size_t s = 0; s < states_.size(); ++s) {
+    bool candidate = true;
+    for (std::size_t t = 0; t < stateTests_[s].size() && candidate; ++t)
+      candidate = signature[stateTests_[s][t]];
+    if (candidate) res.push_back(s);
+  }
+  return res;
+}
+}  // namespace impl
+}  // namespace manipulation
+}  // namespace hpp
@@ -0,0 +1,105 @@
+// Copyright (c) 2026 CNRS
+//
+
+// Redistribution and use in source and binary forms, with or without
+// modification, are permitted provided that the following conditions are
+// met:
+//
+// 1. Redistributions of source code must retain the above copyright
+//    notice, this list of conditions and the following disclaimer.
+//
+// 2. Redistributions in binary form must reproduce the above copyright
+// notice, this list of conditions and the following disclaimer in the
+// documentation and/or other materials provided with the distribution.
+//
+// THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+// "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+// LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+// A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+// HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+// SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+// LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+// DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+// THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+// (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+// OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH
+// DAMAGE.
+
+#ifndef HPP_MANIPULATION_CORBA_STATE_INDEX_HH
+#define HPP_MANIPULATION_CORBA_STATE_INDEX_HH
+
+#include <hpp/manipulation/fwd.hh>
+#include <hpp/manipulation/graph/fwd.hh>
+#include <mutex>
+#include <unordered_map>
+#include <vector>
+
+namespace hpp {
+namespace manipulation {
+namespace impl {
+/// Find the state of a configuration without testing every state
+///
+/// graph::Graph::getState tests the constraints of each state in priority
+/// order until one state contains the configuration. Many states share the
+/// same grasp and placement constraints. This index
+/// \li evaluates each distinct numerical constraint of the states once per
+///     configuration,
+/// \li computes the signature of the configuration, the set of numerical
+///     constraints that are satisfied, and looks up in a hash table the
+///     states whose numerical constraints are all in the signature,
+/// \li tests these candidate states in priority order.
+///
+/// A state can contain a configuration only if each of its numerical
+/// constraints is satisfied, so the result is the same as
+/// graph::Graph::getState. The index is rebuilt when the constraints of the
+/// states change, for instance after graph::Graph::initialize, and when the
+/// right hand side of a constraint of a state changes.
+class StateIndex {
+ public:
+  StateIndex(const graph::GraphPtr_t& graph);
+
+  /// Get the state of a configuration
+  /// \throw std::logic_error if no state contains the configuration.
+  graph::StatePtr_t getState(ConfigurationIn_t config);
+
+  /// Graph the index was built for
+  graph::GraphPtr_t graph() const { return graph_.lock(); }
+
+ private:
+  /// A numerical constraint evaluated with the projector of a state
+  struct Test {
+    core::ConfigProjectorPtr_t projector;
+    constraints::ImplicitPtr_t constraint;
+  };
+  typedef std::vector<bool> Signature_t;
+
+  /// Rebuild the index if the constraints of the states changed
+  void update();
+  /// Index in tests_ of a constraint of a state
+  ///
+  /// Constraints with the same right hand side and the same error
+  /// threshold are tested once.
+  std::size_t testIndex(const core::ConfigProjectorPtr_t& projector,
+                        const constraints::ImplicitPtr_t& constraint);
+  const std::vector<std::size_t>& candidates(const Signature_t& signature);
+
+  graph::GraphWkPtr_t graph_;
+  /// States in priority order and their constraints
+  std::vector<graph::StatePtr_t> states_;
+  std::vector<ConstraintSetPtr_t> configConstraints_;
+  /// Right hand sides of the constraints of the states when the index was
+  /// built
+  std::vector<vector_t> rightHandSides_;
+  std::vector<Test> tests_;
+  /// Indices in tests_ of the numerical constraints of each state
+  std::vector<std::vector<std::size_t> > stateTests_;
+  /// Indices in states_ of the candidate states for each signature
+  std::unordered_map<Signature_t, std::vector<std::size_t> > candidates_;
+  vector_t error_;
+  std::mutex mutex_;
+};
+}  // namespace impl
+}  // namespace manipulation
+}  // namespace hpp
+
+#endif  // HPP_MANIPULATION_CORBA_STATE_INDEX_HH
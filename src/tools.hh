@@ -29,9 +29,19 @@
 #ifndef HPP_MANIPULATION_CORBA_TOOLS_HH
 #define HPP_MANIPULATION_CORBA_TOOLS_HH
 
+#include <algorithm>
+#include <atomic>
+#include <cstdint>
+#include <exception>
 #include <hpp/corbaserver/conversions.hh>
 #include <hpp/manipulation/problem-solver.hh>
+#include <iomanip>
+#include <mutex>
 #include <pinocchio/spatial/se3.hpp>
+#include <sstream>
+#include <string>
+#include <thread>
+#include <vector>
 
 namespace hpp {
 using corbaServer::c_str;
@@ -65,6 +75,69 @@ inline void hppTransformToTransform3s(const CORBA::Double* inConfig,
 }
 
 DevicePtr_t getRobotOrThrow(ProblemSolverPtr_t p);
+
+/// Number of threads to use to process n items
+/// \param requested number of threads requested by the user. If 0, the
+///        number of cores is used.
+/// \return a number between 1 and max(n, 1).
+inline std::size_t numberOfThreads(std::size_t requested, std::size_t n) {
+  std::size_t res = requested;
+  if (res == 0) res = std::thread::hardware_concurrency();
+  return std::max(std::min(res, n), (std::size_t)1);
+}
+
+/// Call f(i, worker) for each i in [0, n) on nbThreads threads
+///
+/// Indices are distributed dynamically among the threads. worker is the
+/// index of the calling thread, between 0 and nbThreads - 1, so that f can
+/// use one instance per thread of objects that are not thread safe.
+/// The first exception thrown by f is rethrown when all threads have
+/// finished. Remaining indices are skipped.
+template <typename Function>
+void parallelFor(std::size_t n, std::size_t nbThreads, Function f) {
+  std::atomic<std::size_t> next(0);
+  std::exception_ptr error;
+  std::mutex mutex;
+  auto work = [&](std::size_t worker) {
+    for (std::size_t i = next++; i < n; i = next++) {
+      try {
+        f(i, worker);
+      } catch (...) {
+        std::lock_guard<std::mutex> lock(mutex);
+        if (!error) error = std::current_exception();
+        next = n;
+      }
+    }
+  };
+  std::vector<std::thread> threads;
+  for (std::size_t w = 1; w < nbThreads; ++w) threads.emplace_back(work, w);
+  work(0);
+  for (std::size_t w = 0; w < threads.size(); ++w) threads[w].join();
+  if (error) std::rethrow_exception(error);
+}
+
+/// FNV-1a hash of a sequence of bytes
+/// \param h hash of the bytes that precede, to hash data in several chunks.
+inline uint64_t fnv1a(const char* data, std::size_t size,
+                      uint64_t h = 14695981039346656037ULL) {
+  for (std::size_t i = 0; i < size; ++i) {
+    h ^= (unsigned char)data[i];
+    h *= 1099511628211ULL;
+  }
+  return h;
+}
+
+inline uint64_t fnv1a(const std::string& data,
+                      uint64_t h = 14695981039346656037ULL) {
+  return fnv1a(data.data(), data.size(), h);
+}
+
+/// Hash in hexadecimal, on 16 characters
+inline std::string hashToString(uint64_t h) {
+  std::ostringstream oss;
+  oss << std::hex << std::setw(16) << std::setfill('0') << h;
+  return oss.str();
+}
 }  // namespace hpp
 
 #endif  // HPP_MANIPULATION_CORBA_TOOLS_HH
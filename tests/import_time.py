@@ -0,0 +1,29 @@
+# Measure the time needed to import hpp.corbaserver.manipulation in a new
+# Python process, and check that no CORBA stub is loaded before a client is
+# created.
+#
+# Usage: python import_time.py [number of runs]
+import statistics
+import subprocess
+import sys
+
+code = """
+import sys, time
+t0 = time.perf_counter()
+import hpp.corbaserver.manipulation
+t1 = time.perf_counter()
+print(t1 - t0, "hpp_idl.hpp.manipulation_idl" in sys.modules)
+"""
+
+runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+times = list()
+for i in range(runs):
+    out = subprocess.check_output([sys.executable, "-c", code], text=True)
+    t, stubsLoaded = out.split()
+    times.append(float(t))
+    assert stubsLoaded == "False", "CORBA stubs are loaded at import time"
+
+print(
+    f"import hpp.corbaserver.manipulation: median {1e3 * statistics.median(times):.1f}"
+    f" ms, min {1e3 * min(times):.1f} ms over {runs} runs"
+)
@@ -0,0 +1,39 @@
+# Solve a manipulation problem and check that the roadmap exported by
+# getRoadmapArrays refers to the edges of the constraint graph.
+#
+# Paths of the roadmap are projected by the default path projector, so that
+# they are path vectors without constraints at the top level. As in robot.py,
+# the robot is built joint by joint and does not need any model file.
+from hpp.corbaserver import Client
+from hpp.corbaserver.manipulation import Client as ManipClient
+from hpp.corbaserver.manipulation import ConstraintGraph, ProblemSolver
+from hpp.corbaserver.manipulation.robot import Robot
+
+cl = Client()
+mcl = ManipClient()
+
+mcl.robot.create("test")
+cl.robot.appendJoint("", "A/root_joint", "planar", [0, 0, 0, 0, 0, 0, 1])
+cl.robot.createSphere("A/root_body", 0.001)
+cl.robot.addObjectToJoint("A/root_joint", "A/root_body", [0, 0, 1, 0, 0, 0, 1])
+mcl.robot.finishedRobot("A")
+
+robot = Robot()
+robot.setJointBounds("A/root_joint", [-1, 1, -1, 1])
+ps = ProblemSolver(robot)
+
+graph = ConstraintGraph(robot, "graph")
+graph.createNode(["free"])
+graph.createEdge("free", "free", "move", 1)
+graph.initialize()
+
+ps.setInitialConfig([-0.5, -0.5, 1, 0])
+ps.addGoalConfig([0.5, 0.5, 0, 1])
+ps.solve()
+
+arrays = ps.getRoadmapArrays()
+edgeIds = arrays["edgeIds"]
+assert len(edgeIds) > 0, "the roadmap has no edge"
+assert (edgeIds != -1).any(), "no roadmap edge refers to a constraint graph edge"
+assert set(edgeIds[edgeIds != -1]) <= {graph.edges["move"]}
+print(f"{(edgeIds != -1).sum()} of {len(edgeIds)} roadmap edges along 'move'")
@@ -0,0 +1,55 @@
+# Check that the state index of the constraint graph returns the same states
+# as the linear scan of the states in priority order.
+#
+# As in robot.py, the robots are built joint by joint and do not need any
+# model file.
+from hpp.corbaserver import Client
+from hpp.corbaserver.manipulation import Client as ManipClient
+from hpp.corbaserver.manipulation import ConstraintGraph, Constraints, ProblemSolver
+from hpp.corbaserver.manipulation.robot import Robot
+
+cl = Client()
+mcl = ManipClient()
+
+mcl.robot.create("test")
+for name in ("A", "B"):
+    cl.robot.appendJoint("", name + "/root_joint", "planar", [0, 0, 0, 0, 0, 0, 1])
+    cl.robot.createSphere(name + "/root_body", 0.001)
+    cl.robot.addObjectToJoint(
+        name + "/root_joint", name + "/root_body", [0, 0, 1, 0, 0, 0, 1]
+    )
+    mcl.robot.finishedRobot(name)
+
+robot = Robot()
+robot.setJointBounds("A/root_joint", [-1, 1, -1, 1])
+robot.setJointBounds("B/root_joint", [-1, 1, -1, 1])
+ps = ProblemSolver(robot)
+
+qA, qB = [0.5, 0, 1, 0], [0, 0.5, 0, 1]
+ps.createLockedJoint("lock A", "A/root_joint", qA)
+ps.createLockedJoint("lock B", "B/root_joint", qB)
+
+# "lock A" and "lock B" are shared by several states.
+graph = ConstraintGraph(robot, "graph")
+graph.createNode(["both", "A", "B", "free"])
+graph.addConstraints(
+    node="both", constraints=Constraints(numConstraints=["lock A", "lock B"])
+)
+graph.addConstraints(node="A", constraints=Constraints(numConstraints=["lock A"]))
+graph.addConstraints(node="B", constraints=Constraints(numConstraints=["lock B"]))
+graph.initialize()
+
+configs = [qA + qB]
+for _ in range(100):
+    q = robot.shootRandomConfig()
+    configs += [q, qA + q[4:], q[:4] + qB]
+
+graph.useStateIndex(False)
+expected = [graph.getNode(q) for q in configs]
+graph.useStateIndex(True)
+nodes = [graph.getNode(q) for q in configs]
+graph.useStateIndex(False)
+
+assert nodes == expected, "the state index and the linear scan disagree"
+assert set(expected) == {"both", "A", "B", "free"}
+print(f"{len(configs)} configurations classified in the same states")